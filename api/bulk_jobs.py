@@ -0,0 +1,165 @@
+"""In-process job tracking for admin bulk issuance.
+
+A job owns an ordered list of entries and fills in one result per entry as a
+shared, bounded thread pool works through them. Results are appended in
+completion order (each carries its ``index``), so a client streaming them sees
+progress immediately instead of waiting for the whole cohort.
+
+Jobs live in memory on the instance that accepted them and are dropped
+``ttl`` seconds after they finish. On serverless hosts the caller should keep
+the NDJSON results stream open (or use ``?stream=1`` on submit) so the
+invocation stays alive until the job is done.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class BulkJob:
+    def __init__(self, job_id: str, total: int) -> None:
+        self.id = job_id
+        self.total = total
+        self.status = "queued"
+        self.results: list[dict] = []
+        self.succeeded = 0
+        self.failed = 0
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status == "done"
+
+    def _add(self, results: Sequence[dict]) -> None:
+        with self._cond:
+            if self.status == "queued":
+                self.status = "running"
+            for r in results:
+                self.results.append(r)
+                if r.get("status") == "success":
+                    self.succeeded += 1
+                else:
+                    self.failed += 1
+            if len(self.results) >= self.total:
+                self.status = "done"
+                self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def wait_for(self, count: int, timeout: float | None = None) -> bool:
+        """Block until more than ``count`` results exist or the job is done. True if anything changed."""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.results) > count or self.done, timeout)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.done, timeout)
+
+    def results_since(self, start: int) -> list[dict]:
+        with self._cond:
+            return self.results[start:]
+
+    def summary(self) -> dict:
+        with self._cond:
+            processed = len(self.results)
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "total": self.total,
+                "processed": processed,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "created_at": datetime.fromtimestamp(self.created_at, tz=UTC).isoformat(),
+                "finished_at": (
+                    datetime.fromtimestamp(self.finished_at, tz=UTC).isoformat()
+                    if self.finished_at else None
+                ),
+            }
+
+
+class BulkJobRegistry:
+    """Owns the worker pool and the set of live jobs."""
+
+    def __init__(self, *, workers: int = 8, chunk_size: int = 25, max_jobs: int = 100, ttl: float = 3600.0) -> None:
+        self.workers = max(1, int(workers))
+        self.chunk_size = max(1, int(chunk_size))
+        self.max_jobs = max(1, int(max_jobs))
+        self.ttl = ttl
+        self._jobs: OrderedDict[str, BulkJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-issue")
+        return self._executor
+
+    def _prune_locked(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.done and job.finished_at and now - job.finished_at > self.ttl:
+                del self._jobs[job_id]
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((j for j in self._jobs.values() if j.done), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest.id]
+
+    def submit(
+        self,
+        entries: Sequence[Any],
+        process_chunk: Callable[[int, Sequence[Any]], list[dict]],
+        *,
+        job_id: str | None = None,
+    ) -> BulkJob:
+        """Start a job. ``process_chunk(start_index, entries)`` returns one result per entry."""
+        job = BulkJob(job_id or str(uuid.uuid4()), len(entries))
+        with self._lock:
+            self._prune_locked()
+            self._jobs[job.id] = job
+        if not entries:
+            job._add([])
+            return job
+        pool = self._pool()
+        for start in range(0, len(entries), self.chunk_size):
+            chunk = entries[start:start + self.chunk_size]
+            pool.submit(self._run_chunk, job, start, chunk, process_chunk)
+        return job
+
+    @staticmethod
+    def _run_chunk(job: BulkJob, start: int, chunk: Sequence[Any], process_chunk) -> None:
+        try:
+            results = process_chunk(start, chunk)
+        except Exception as e:  # noqa: BLE001 - a failed chunk must not kill the worker
+            logger.warning(f"Bulk job {job.id}: chunk at {start} failed: {e}")
+            results = [
+                {"index": start + i, "status": "error", "error": str(e)}
+                for i in range(len(chunk))
+            ]
+        job._add(results)
+
+    def get(self, job_id: str) -> BulkJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(1 for j in self._jobs.values() if not j.done)
+            return {"jobs": len(self._jobs), "running": running, "workers": self.workers}
@@ -0,0 +1,653 @@
+"""Direct ReportLab canvas renderer for fixed-layout certificate PDFs.
+
+Participation and internship certificates never reflow, so instead of
+formatting an HTML string and having xhtml2pdf parse and lay it out on every
+request, this module draws the same design straight onto a canvas. Geometry
+and colours mirror CERTIFICATE_PARTICIPATION_HTML and
+CERTIFICATE_INTERNSHIP_VTU_HTML in api/certificate_templates.py; keep the two
+in step when changing either (scripts/compare_cert_engines.py renders both).
+
+Callers pass plain text (not HTML-escaped) plus PNG bytes for the QR code and
+signatures. Appreciation certificates stay on the xhtml2pdf path.
+
+Each page is two layers: a static background (brand block, borders, labels,
+the issuing signatory) rendered once per kind/branding/layout variant and
+cached, and a per-certificate overlay carrying only the variable fields.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html as html_mod
+import threading
+from collections.abc import Callable
+from io import BytesIO
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_JUSTIFY
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as rl_canvas
+from reportlab.platypus import Paragraph
+
+PAGE_WIDTH = 842.0
+PAGE_HEIGHT = 595.0
+
+REGULAR = "Helvetica"
+BOLD = "Helvetica-Bold"
+
+# (name, role, signature PNG bytes)
+Signatory = tuple[str, str, bytes]
+
+
+def _y(top: float) -> float:
+    """Convert a distance from the top of the page to ReportLab's bottom-up y."""
+    return PAGE_HEIGHT - top
+
+
+def _text_width(text: str, font: str, size: float, char_space: float = 0.0) -> float:
+    return stringWidth(text, font, size) + char_space * len(text)
+
+
+def _fit_size(text: str, font: str, size: float, max_width: float, min_size: float = 8.0) -> float:
+    """Largest size <= ``size`` at which ``text`` fits ``max_width`` (long names)."""
+    width = stringWidth(text, font, size)
+    if width <= max_width or width <= 0:
+        return size
+    return max(min_size, size * max_width / width)
+
+
+def _draw_text(
+    c: rl_canvas.Canvas,
+    text: str,
+    x: float,
+    top: float,
+    *,
+    font: str = REGULAR,
+    size: float = 10.0,
+    color: str = "#2d3748",
+    char_space: float = 0.0,
+    align: str = "left",
+) -> float:
+    """Draw one line with its baseline at ``top`` (from page top). Returns its width."""
+    width = _text_width(text, font, size, char_space)
+    if align == "center":
+        x -= width / 2
+    elif align == "right":
+        x -= width
+    # Character spacing (Tc) is graphics state and outlives the text object;
+    # bracket the draw so it cannot leak into later text or paragraphs.
+    c.saveState()
+    t = c.beginText(x, _y(top))
+    t.setFont(font, size)
+    t.setFillColor(HexColor(color))
+    if char_space:
+        t.setCharSpace(char_space)
+    t.textOut(text)
+    c.drawText(t)
+    c.restoreState()
+    return width
+
+
+def _fill_rect(c: rl_canvas.Canvas, x: float, top: float, w: float, h: float, color: str) -> None:
+    c.setFillColor(HexColor(color))
+    c.rect(x, _y(top + h), w, h, stroke=0, fill=1)
+
+
+def _stroke_rect(
+    c: rl_canvas.Canvas, x: float, top: float, w: float, h: float, color: str, width: float
+) -> None:
+    c.setStrokeColor(HexColor(color))
+    c.setLineWidth(width)
+    c.rect(x, _y(top + h), w, h, stroke=1, fill=0)
+
+
+def _hline(c: rl_canvas.Canvas, x1: float, x2: float, top: float, color: str, width: float = 1.0) -> None:
+    c.setStrokeColor(HexColor(color))
+    c.setLineWidth(width)
+    c.line(x1, _y(top), x2, _y(top))
+
+
+def _vline(c: rl_canvas.Canvas, x: float, top: float, bottom: float, color: str, width: float = 1.0) -> None:
+    c.setStrokeColor(HexColor(color))
+    c.setLineWidth(width)
+    c.line(x, _y(top), x, _y(bottom))
+
+
+def _check_mark(c: rl_canvas.Canvas, x: float, top: float, size: float, color: str) -> None:
+    """Tick drawn as a path (Helvetica has no U+2713 glyph)."""
+    c.setStrokeColor(HexColor(color))
+    c.setLineWidth(max(0.8, size / 7))
+    p = c.beginPath()
+    p.moveTo(x, _y(top - size * 0.45))
+    p.lineTo(x + size * 0.35, _y(top - size * 0.1))
+    p.lineTo(x + size, _y(top - size * 0.85))
+    c.drawPath(p, stroke=1, fill=0)
+
+
+def _verified_pill(
+    c: rl_canvas.Canvas, cx: float, top: float, label: str, size: float, pad_x: float, height: float
+) -> None:
+    text_w = _text_width(label, BOLD, size)
+    tick = size
+    w = text_w + tick + 5 + pad_x * 2
+    x = cx - w / 2
+    _fill_rect(c, x, top, w, height, "#f0fff4")
+    _stroke_rect(c, x, top, w, height, "#68d391", 1)
+    baseline = top + height / 2 + size * 0.35
+    _check_mark(c, x + pad_x, baseline, tick * 0.8, "#276749")
+    _draw_text(c, label, x + pad_x + tick + 5, baseline, font=BOLD, size=size, color="#276749")
+
+
+def _image(c: rl_canvas.Canvas, png: bytes, x: float, top: float, w: float, h: float) -> None:
+    if not png:
+        return
+    c.drawImage(ImageReader(BytesIO(png)), x, _y(top + h), width=w, height=h, mask="auto")
+
+
+def _new_canvas(buf: BytesIO, title: str) -> rl_canvas.Canvas:
+    c = rl_canvas.Canvas(buf, pagesize=(PAGE_WIDTH, PAGE_HEIGHT), pageCompression=1)
+    c.setTitle(title)
+    c.setCreator("PDF Cert Generator")
+    return c
+
+
+# ── Signature rows ────────────────────────────────────────────────────
+
+
+class _SigRow:
+    """Fixed geometry of a certificate's signature row."""
+
+    def __init__(
+        self,
+        *,
+        top: float,
+        row_width: float,
+        img_w: float,
+        img_h: float,
+        rule_color: str,
+        name_size: float,
+        role_size: float,
+        role_color: str,
+        role_space: float,
+    ) -> None:
+        self.top = top
+        self.row_width = row_width
+        self.img_w = img_w
+        self.img_h = img_h
+        self.rule_color = rule_color
+        self.name_size = name_size
+        self.role_size = role_size
+        self.role_color = role_color
+        self.role_space = role_space
+
+    @property
+    def bottom(self) -> float:
+        return self.top + self.img_h + 3 + 6 + self.name_size + self.role_size + 4
+
+    def draw_cell(self, c: rl_canvas.Canvas, idx: int, count: int, signatory: Signatory) -> None:
+        name, role, png = signatory
+        cell_w = self.row_width / count
+        x0 = PAGE_WIDTH / 2 - self.row_width / 2 + cell_w * idx
+        mid = x0 + cell_w / 2
+        pad = 12.0
+        _image(c, png, mid - self.img_w / 2, self.top, self.img_w, self.img_h)
+        rule_top = self.top + self.img_h + 3
+        _hline(c, x0 + pad, x0 + cell_w - pad, rule_top, self.rule_color)
+        _draw_text(c, name, mid, rule_top + 4 + self.name_size, font=BOLD,
+                   size=_fit_size(name, BOLD, self.name_size, cell_w - pad * 2, 5),
+                   color="#553c9a", align="center")
+        _draw_text(c, role, mid, rule_top + 7 + self.name_size + self.role_size,
+                   size=self.role_size, color=self.role_color, char_space=self.role_space,
+                   align="center")
+
+
+# ── Static layer / overlay composition ────────────────────────────────
+#
+# Everything identical across recipients (backgrounds, brand block, labels,
+# rules, the issuing signatory's cell) is drawn once per layout variant into a
+# one-page PDF, parsed once and cached as a pypdf page. Each request draws only
+# the variable fields onto a transparent overlay and stamps it on that page as
+# a form XObject, so neither layer's content stream is re-parsed. Without pypdf
+# (or with STATIC_LAYERS off) both layers are drawn onto one canvas instead,
+# which renders identically.
+
+_STATIC_LAYER_LIMIT = 32
+_static_layers: dict[tuple, object] = {}
+_static_lock = threading.Lock()
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import (
+        ArrayObject,
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+    )
+except ImportError:  # pragma: no cover - pypdf ships with xhtml2pdf
+    PdfReader = PdfWriter = None
+
+# scripts/compare_cert_engines.py turns this off to time single-canvas drawing.
+STATIC_LAYERS = PdfReader is not None
+
+_OVERLAY_NAME = NameObject("/CertOverlay") if PdfReader is not None else None
+
+
+def _static_layer(key: tuple, draw_static: Callable[[rl_canvas.Canvas], None]):
+    """Parsed static page for ``key``, drawn on first use."""
+    with _static_lock:
+        cached = _static_layers.get(key)
+    if cached is not None:
+        return cached
+    buf = BytesIO()
+    c = _new_canvas(buf, "")
+    draw_static(c)
+    c.showPage()
+    c.save()
+    page = PdfReader(BytesIO(buf.getvalue())).pages[0]
+    # Cloning resolves every object the page references, so later clones
+    # (possibly from several threads) never seek in the reader's stream.
+    PdfWriter().add_page(page)
+    with _static_lock:
+        if len(_static_layers) >= _STATIC_LAYER_LIMIT:
+            _static_layers.pop(next(iter(_static_layers)))
+        _static_layers[key] = page
+    return page
+
+
+def _stream(writer, data: bytes):
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    return writer._add_object(stream)
+
+
+def _compose(
+    key: tuple,
+    title: str,
+    draw_static: Callable[[rl_canvas.Canvas], None],
+    draw_dynamic: Callable[[rl_canvas.Canvas], None],
+) -> bytes:
+    if not STATIC_LAYERS:
+        buf = BytesIO()
+        c = _new_canvas(buf, title)
+        draw_static(c)
+        draw_dynamic(c)
+        c.showPage()
+        c.save()
+        return buf.getvalue()
+
+    static_page = _static_layer(key, draw_static)
+    overlay_buf = BytesIO()
+    c = _new_canvas(overlay_buf, title)
+    draw_dynamic(c)
+    c.showPage()
+    c.save()
+    overlay = PdfReader(BytesIO(overlay_buf.getvalue())).pages[0]
+
+    writer = PdfWriter()
+    page = writer.add_page(static_page)
+    # ReportLab writes one compressed content stream per page; reuse it as is.
+    form = overlay.raw_get("/Contents").get_object().clone(writer)
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): overlay.mediabox,
+        NameObject("/Resources"): overlay["/Resources"].clone(writer),
+    })
+    resources = page["/Resources"]
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else DictionaryObject()
+    xobjects[_OVERLAY_NAME] = form.indirect_reference
+    resources[NameObject("/XObject")] = xobjects
+
+    contents = page.raw_get("/Contents")
+    static_streams = contents.get_object()
+    if not isinstance(static_streams, ArrayObject):
+        static_streams = [contents]
+    page[NameObject("/Contents")] = ArrayObject([
+        _stream(writer, b"q\n"),
+        *static_streams,
+        _stream(writer, b"\nQ q " + _OVERLAY_NAME.encode() + b" Do Q\n"),
+    ])
+    writer.add_metadata({"/Title": title, "/Creator": "PDF Cert Generator"})
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def static_layer_count() -> int:
+    """Number of cached static layers (exposed for diagnostics)."""
+    with _static_lock:
+        return len(_static_layers)
+
+
+# ── Participation ─────────────────────────────────────────────────────
+
+_P_CARD = (32.0, 24.0, PAGE_WIDTH - 64, PAGE_HEIGHT - 48)
+_P_BODY_W = _P_CARD[2] - 100
+_P_META_TOP, _P_META_H = 302.0, 44.0
+_P_SIGS = _SigRow(
+    top=_P_META_TOP + _P_META_H + 12, row_width=_P_BODY_W * 0.7, img_w=112, img_h=37,
+    rule_color="#c4b5fd", name_size=8, role_size=6, role_color="#a0aec0", role_space=1,
+)
+_P_QR_TOP, _P_QR_SIZE = _P_SIGS.bottom + 12, 70.0
+_P_QR_X = PAGE_WIDTH / 2 - (_P_QR_SIZE + 12 + 150) / 2
+
+
+def _participation_meta_columns(count: int) -> tuple[float, float]:
+    meta_w = _P_BODY_W * 0.85
+    return PAGE_WIDTH / 2 - meta_w / 2, meta_w / max(1, count)
+
+
+def _participation_static(
+    c: rl_canvas.Canvas,
+    brand: dict,
+    meta_labels: list[str],
+    issuer: Signatory,
+    sig_count: int,
+) -> None:
+    card_x, card_top, card_w, card_h = _P_CARD
+    cx = PAGE_WIDTH / 2
+    _fill_rect(c, 0, 0, PAGE_WIDTH, PAGE_HEIGHT, "#0f0f23")
+    _fill_rect(c, card_x, card_top, card_w, card_h, "#ffffff")
+
+    # Header band
+    _fill_rect(c, card_x, card_top, card_w, 118, "#15155e")
+    _draw_text(c, brand["org_tagline"], cx, 62, font=BOLD, size=8, color="#d4af37",
+               char_space=4, align="center")
+    badge = brand["participation_title"].upper()
+    badge_w = _text_width(badge, BOLD, 9, 3) + 60
+    _stroke_rect(c, cx - badge_w / 2, 109, badge_w, 22, "#d4af37", 2)
+    _draw_text(c, badge, cx, 123.5, font=BOLD, size=9, color="#d4af37", char_space=3, align="center")
+
+    # Body furniture
+    _verified_pill(c, cx, 170, "Verified & Authentic", 8, 14, 17)
+    _draw_text(c, "THIS CERTIFICATE IS AWARDED TO", cx, 206, size=8, color="#a0aec0",
+               char_space=3, align="center")
+    _hline(c, cx - _P_BODY_W * 0.3, cx + _P_BODY_W * 0.3, 258, "#d4af37", 2)
+
+    meta_x, col_w = _participation_meta_columns(len(meta_labels))
+    meta_w = col_w * len(meta_labels)
+    _hline(c, meta_x, meta_x + meta_w, _P_META_TOP, "#edf2f7")
+    _hline(c, meta_x, meta_x + meta_w, _P_META_TOP + _P_META_H, "#edf2f7")
+    for idx, label in enumerate(meta_labels):
+        if idx:
+            _vline(c, meta_x + col_w * idx, _P_META_TOP, _P_META_TOP + _P_META_H, "#edf2f7")
+        _draw_text(c, label, meta_x + col_w * idx + col_w / 2, _P_META_TOP + 35, size=6,
+                   color="#a0aec0", char_space=2, align="center")
+
+    _P_SIGS.draw_cell(c, 0, sig_count, issuer)
+
+    tx = _P_QR_X + _P_QR_SIZE + 12
+    _draw_text(c, "Scan to Verify", tx, _P_QR_TOP + 28, font=BOLD, size=9, color="#2d3748")
+    _draw_text(c, "This QR code links to this certificate's", tx, _P_QR_TOP + 41, size=7, color="#a0aec0")
+    _draw_text(c, "permanent verification page.", tx, _P_QR_TOP + 51.5, size=7, color="#a0aec0")
+
+    # Footer band
+    foot_top = card_top + card_h - 25
+    _fill_rect(c, card_x, foot_top, card_w, 25, "#f8fafc")
+    _hline(c, card_x, card_x + card_w, foot_top, "#edf2f7")
+    _draw_text(c, f"Issued by {brand['issued_by']}  ·  {brand['website']}", cx, foot_top + 15.5,
+               size=7, color="#a0aec0", align="center")
+
+
+def _participation_dynamic(
+    c: rl_canvas.Canvas,
+    brand: dict,
+    participant_name: str,
+    course_name: str,
+    meta_values: list[str],
+    signatories: list[Signatory],
+    qr_png: bytes,
+    display_font: str,
+) -> None:
+    cx = PAGE_WIDTH / 2
+    # The brand name is static but set in the display font, which is embedded
+    # per layer; drawing it here keeps a single copy of the font in the PDF.
+    brand_size = _fit_size(brand["brand_name"], display_font, 25, _P_CARD[2] - 80)
+    _draw_text(c, brand["brand_name"], cx, 97, font=display_font, size=brand_size,
+               color="#ffffff", align="center")
+    name_size = _fit_size(participant_name, display_font, 34, _P_BODY_W)
+    _draw_text(c, participant_name, cx, 246, font=display_font, size=name_size,
+               color="#1a202c", align="center")
+    course_size = _fit_size(course_name, display_font, 16, _P_BODY_W)
+    _draw_text(c, course_name, cx, 284, font=display_font, size=course_size,
+               color="#553c9a", align="center")
+    meta_x, col_w = _participation_meta_columns(len(meta_values))
+    for idx, value in enumerate(meta_values):
+        _draw_text(c, value, meta_x + col_w * idx + col_w / 2, _P_META_TOP + 21, font=BOLD,
+                   size=_fit_size(value, BOLD, 11, col_w - 16, 6), color="#2d3748", align="center")
+    for idx, signatory in enumerate(signatories[1:], start=1):
+        _P_SIGS.draw_cell(c, idx, len(signatories), signatory)
+    _image(c, qr_png, _P_QR_X, _P_QR_TOP, _P_QR_SIZE, _P_QR_SIZE)
+
+
+def render_participation_pdf(
+    *,
+    participant_name: str,
+    course_name: str,
+    certificate_id: str,
+    meta: list[tuple[str, str]],
+    signatories: list[Signatory],
+    qr_png: bytes,
+    brand: dict,
+    display_font: str = REGULAR,
+) -> bytes:
+    """Participation certificate, same layout as CERTIFICATE_PARTICIPATION_HTML.
+
+    ``meta`` is the (value, LABEL) row under the course name; ``brand`` is
+    ``certificate_branding()``. ``signatories[0]`` is the issuing signatory,
+    which is part of the cached static layer.
+    """
+    labels = [label for _, label in meta]
+    issuer = signatories[0]
+    key = (
+        "participation",
+        tuple(brand[k] for k in ("org_tagline", "participation_title", "issued_by", "website")),
+        tuple(labels),
+        issuer[0],
+        issuer[1],
+        hashlib.sha256(issuer[2]).hexdigest(),
+        len(signatories),
+    )
+    return _compose(
+        key,
+        f"{brand['participation_title']} – {participant_name}",
+        lambda c: _participation_static(c, brand, labels, issuer, len(signatories)),
+        lambda c: _participation_dynamic(
+            c, brand, participant_name, course_name, [value for value, _ in meta],
+            signatories, qr_png, display_font,
+        ),
+    )
+
+
+# ── Internship ────────────────────────────────────────────────────────
+
+_I_CARD = (28.0, 20.0, PAGE_WIDTH - 56, PAGE_HEIGHT - 40)
+_I_BODY_X, _I_BODY_W = _I_CARD[0] + 44, _I_CARD[2] - 88
+# The certification paragraph gets a fixed box (five lines at 9.5pt) so that
+# everything below it sits at fixed positions; longer text shrinks to fit.
+_I_PARA_TOP, _I_PARA_H = 234.0, 76.0
+_I_TABLE_TOP = _I_PARA_TOP + _I_PARA_H + 12
+_I_TABLE_W = _I_BODY_W * 0.92
+_I_HEAD_ROW, _I_VALUE_ROW = 22.0, 27.0
+_I_COLS = (
+    (0.22, "COMPLETION DATE", 10.0),
+    (0.26, "DURATION", 10.0),
+    (0.18, "HOURS", 10.0),
+    (0.34, "CERTIFICATE ID", 9.0),
+)
+_I_SIGS = _SigRow(
+    top=_I_TABLE_TOP + _I_HEAD_ROW + _I_VALUE_ROW + 12, row_width=_I_BODY_W * 0.88,
+    img_w=98, img_h=33, rule_color="#cbd5e0", name_size=7.5, role_size=6,
+    role_color="#718096", role_space=0.5,
+)
+_I_QR_TOP, _I_QR_SIZE = _I_SIGS.bottom + 10, 64.0
+_I_QR_NOTE = "Permanent verification URL encoded in QR — tamper-evident HMAC token."
+_I_QR_X = PAGE_WIDTH / 2 - (_I_QR_SIZE + 10 + _text_width(_I_QR_NOTE, REGULAR, 6.5)) / 2
+
+
+def _internship_static(c: rl_canvas.Canvas, issuer: Signatory, sig_count: int) -> None:
+    card_x, card_top, card_w, card_h = _I_CARD
+    cx = PAGE_WIDTH / 2
+    _fill_rect(c, 0, 0, PAGE_WIDTH, PAGE_HEIGHT, "#0a0a18")
+    _fill_rect(c, card_x, card_top, card_w, card_h, "#ffffff")
+
+    # Forge letterhead
+    head_h = 92.0
+    _fill_rect(c, card_x, card_top, card_w, head_h, "#15155e")
+    _fill_rect(c, card_x, card_top, 6, head_h, "#d4af37")
+    lx = card_x + 6 + 36
+    _draw_text(c, "INTELLIFORGE DIGITAL SERVICES", lx, 50, font=BOLD, size=7, color="#e8d48b", char_space=2.5)
+    w = _draw_text(c, "IntelliForge ", lx, 76, font=BOLD, size=22, color="#ffffff", char_space=1)
+    _draw_text(c, "Forge", lx + w, 76, font=BOLD, size=22, color="#d4af37", char_space=1)
+    _draw_text(c, "ISSUED UNDER THE VTU INTERNSHIP FRAMEWORK", lx, 89, font=BOLD, size=7,
+               color="#c6d2e3", char_space=1.2)
+    _draw_text(c, "Verifiable credentials · learning.intelliforge.tech · Hyderabad, Telangana, India",
+               lx, 100, size=7, color="#a0aec0", char_space=1.5)
+    badge_w, badge_h = 112.0, 30.0
+    bx = card_x + card_w - 36 - badge_w
+    _stroke_rect(c, bx, 51, badge_w, badge_h, "#d4af37", 1.5)
+    _draw_text(c, "INTERNSHIP", bx + badge_w / 2, 63, font=BOLD, size=7, color="#d4af37",
+               char_space=2, align="center")
+    _draw_text(c, "COMPLETION", bx + badge_w / 2, 73, font=BOLD, size=7, color="#d4af37",
+               char_space=2, align="center")
+
+    # Body furniture
+    _verified_pill(c, cx, card_top + head_h + 20, "VERIFIED DIGITAL RECORD — SCAN QR TO VALIDATE", 7, 12, 14)
+    _draw_text(c, "CERTIFICATE OF INTERNSHIP COMPLETION", cx, 166, size=8, color="#718096",
+               char_space=3, align="center")
+    _draw_text(c, "Intelliforge Digital Services · VTU-aligned industry internship", cx, 178,
+               size=7, color="#a0aec0", char_space=1, align="center")
+
+    tx0 = cx - _I_TABLE_W / 2
+    rows_h = _I_HEAD_ROW + _I_VALUE_ROW
+    _fill_rect(c, tx0, _I_TABLE_TOP, _I_TABLE_W, _I_HEAD_ROW, "#f7fafc")
+    _stroke_rect(c, tx0, _I_TABLE_TOP, _I_TABLE_W, rows_h, "#e2e8f0", 1)
+    _hline(c, tx0, tx0 + _I_TABLE_W, _I_TABLE_TOP + _I_HEAD_ROW, "#e2e8f0")
+    x = tx0
+    for idx, (frac, label, _) in enumerate(_I_COLS):
+        col_w = _I_TABLE_W * frac
+        if idx:
+            _vline(c, x, _I_TABLE_TOP, _I_TABLE_TOP + rows_h, "#e2e8f0")
+        _draw_text(c, label, x + col_w / 2, _I_TABLE_TOP + 13.5, size=6.5, color="#718096",
+                   char_space=1.5, align="center")
+        x += col_w
+
+    _I_SIGS.draw_cell(c, 0, sig_count, issuer)
+
+    tx = _I_QR_X + _I_QR_SIZE + 10
+    _draw_text(c, "Verify this certificate", tx, _I_QR_TOP + 29, font=BOLD, size=8, color="#2d3748")
+    _draw_text(c, _I_QR_NOTE, tx, _I_QR_TOP + 40, size=6.5, color="#718096")
+
+    foot_top = card_top + card_h - 24
+    _fill_rect(c, card_x, foot_top, card_w, 24, "#f8fafc")
+    _hline(c, card_x, card_x + card_w, foot_top, "#e2e8f0")
+    _draw_text(c, "Intelliforge Digital Services · Forge credentialing · learning.intelliforge.tech",
+               cx, foot_top + 15, size=6.5, color="#718096", align="center")
+    _stroke_rect(c, card_x, card_top, card_w, card_h, "#c9a227", 1.5)
+
+
+def _internship_paragraph(markup: str) -> tuple[Paragraph, float]:
+    size = 9.5
+    while True:
+        style = ParagraphStyle(
+            "internship-body", fontName=REGULAR, fontSize=size, leading=size * 1.55,
+            textColor=HexColor("#2d3748"), alignment=TA_JUSTIFY,
+        )
+        para = Paragraph(markup, style)
+        _, height = para.wrap(_I_BODY_W, PAGE_HEIGHT)
+        if height <= _I_PARA_H or size <= 6.5:
+            return para, height
+        size -= 0.5
+
+
+def _internship_dynamic(
+    c: rl_canvas.Canvas,
+    *,
+    participant_name: str,
+    usn: str,
+    course_name: str,
+    completion_date: str,
+    duration_text: str,
+    hours_text: str,
+    certificate_id: str,
+    institution_name: str,
+    signatories: list[Signatory],
+    qr_png: bytes,
+) -> None:
+    cx = PAGE_WIDTH / 2
+    name_size = _fit_size(participant_name, BOLD, 26, _I_BODY_W)
+    _draw_text(c, participant_name, cx, 206, font=BOLD, size=name_size, color="#1a202c", align="center")
+    usn_label = "University Seat Number (USN): "
+    usn_w = _text_width(usn_label, REGULAR, 11) + _text_width(usn, BOLD, 11)
+    ux = cx - usn_w / 2
+    ux += _draw_text(c, usn_label, ux, 224, size=11, color="#4a5568")
+    _draw_text(c, usn, ux, 224, font=BOLD, size=11, color="#2c5282")
+
+    esc = html_mod.escape
+    inst = institution_name.strip()
+    clause = f"who is enrolled at <b>{esc(inst)}</b>, " if inst else ""
+    para, para_h = _internship_paragraph(
+        f"This is to certify that <b>{esc(participant_name)}</b> (USN <b>{esc(usn)}</b>), {clause}"
+        f"has successfully completed the industry internship programme <b>{esc(course_name)}</b> at "
+        f"<b>Intelliforge Digital Services</b>, during the period <b>{esc(duration_text)}</b>, logging "
+        f"<b>{esc(hours_text)}</b> of structured internship activity, in accordance with the "
+        f"Visvesvaraya Technological University (VTU) internship framework and the company’s "
+        f"internship offer on file. This credential may be presented with the internship offer letter "
+        f"and institutional MoU pack for college / VTU records."
+    )
+    para.drawOn(c, _I_BODY_X, _y(_I_PARA_TOP + para_h))
+
+    x = cx - _I_TABLE_W / 2
+    values = (completion_date, duration_text, hours_text, certificate_id)
+    for (frac, _, size), value in zip(_I_COLS, values):
+        col_w = _I_TABLE_W * frac
+        _draw_text(c, value, x + col_w / 2, _I_TABLE_TOP + _I_HEAD_ROW + 16.5, font=BOLD,
+                   size=_fit_size(value, BOLD, size, col_w - 12, 6), color="#1a202c", align="center")
+        x += col_w
+
+    for idx, signatory in enumerate(signatories[1:], start=1):
+        _I_SIGS.draw_cell(c, idx, len(signatories), signatory)
+    _image(c, qr_png, _I_QR_X, _I_QR_TOP, _I_QR_SIZE, _I_QR_SIZE)
+
+
+def render_internship_pdf(
+    *,
+    participant_name: str,
+    usn: str,
+    course_name: str,
+    completion_date: str,
+    duration_text: str,
+    hours_text: str,
+    certificate_id: str,
+    institution_name: str,
+    signatories: list[Signatory],
+    qr_png: bytes,
+) -> bytes:
+    """VTU-style internship certificate, same layout as CERTIFICATE_INTERNSHIP_VTU_HTML.
+
+    ``signatories[0]`` is the issuing signatory, which is part of the cached
+    static layer.
+    """
+    issuer = signatories[0]
+    key = ("internship", issuer[0], issuer[1], hashlib.sha256(issuer[2]).hexdigest(), len(signatories))
+    return _compose(
+        key,
+        f"Certificate of Internship Completion – {participant_name}",
+        lambda c: _internship_static(c, issuer, len(signatories)),
+        lambda c: _internship_dynamic(
+            c,
+            participant_name=participant_name,
+            usn=usn,
+            course_name=course_name,
+            completion_date=completion_date,
+            duration_text=duration_text,
+            hours_text=hours_text,
+            certificate_id=certificate_id,
+            institution_name=institution_name,
+            signatories=signatories,
+            qr_png=qr_png,
+        ),
+    )
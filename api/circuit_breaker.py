@@ -0,0 +1,94 @@
+"""Circuit breaker for calls to a dependency that can go away (the database).
+
+After ``failure_threshold`` consecutive failures the circuit opens and calls
+fail immediately with CircuitOpenError instead of each waiting out a connect
+timeout. Once ``reset_timeout`` seconds have passed the circuit is half-open:
+one caller is let through as a probe while the rest keep failing fast. A
+successful probe closes the circuit; a failed one opens it again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name} circuit open; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int = 3, reset_timeout: float = 10.0) -> None:
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.short_circuited = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless this call may go through."""
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            waited = time.monotonic() - self._opened_at
+            if self._state == OPEN and waited >= self.reset_timeout:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self.short_circuited += 1
+            raise CircuitOpenError(self.name, max(0.0, self.reset_timeout - waited))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"{self.name} circuit closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.trips += 1
+                logger.warning(
+                    f"{self.name} circuit open after {self._failures} consecutive failures; "
+                    f"probing again in {self.reset_timeout:g}s"
+                )
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "trips": self.trips,
+                "short_circuited": self.short_circuited,
+            }
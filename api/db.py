@@ -3,20 +3,66 @@ Database layer for PDF Cert Generator.
 Uses Neon PostgreSQL via psycopg2.
 """
 
-import os
-import logging
+import base64
 import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import UTC, date, datetime
 
 import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
 import psycopg2.extras
 
+from api.circuit_breaker import CircuitBreaker, CircuitOpenError
+
 logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "").strip()
 
-SCHEMA_SQL = """
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"Ignoring non-numeric {name}={raw!r}; using {default}")
+        return default
+
+
+# Connection pool sizing. Each serverless instance handles a handful of
+# concurrent requests, so the maximum stays small; point DATABASE_URL at a
+# transaction pooler (e.g. Neon's -pooler host / pgbouncer) to fan in many
+# instances. Connections carry no session state (no SET, LISTEN, session
+# advisory locks or server-side prepared statements) and are always returned
+# outside a transaction, so transaction-mode pooling is safe.
+DB_POOL_MIN = int(_env_float("DB_POOL_MIN", 0))
+DB_POOL_MAX = max(1, int(_env_float("DB_POOL_MAX", 5)))
+DB_POOL_TIMEOUT = _env_float("DB_POOL_TIMEOUT", 10.0)
+DB_POOL_IDLE_TIMEOUT = _env_float("DB_POOL_IDLE_TIMEOUT", 300.0)
+DB_POOL_MAX_LIFETIME = _env_float("DB_POOL_MAX_LIFETIME", 1800.0)
+DB_POOL_HEALTHCHECK_INTERVAL = _env_float("DB_POOL_HEALTHCHECK_INTERVAL", 30.0)
+
+# Fail fast while the database is down: after DB_BREAKER_THRESHOLD consecutive
+# connection failures, get_db raises DatabaseUnavailable immediately for
+# DB_BREAKER_RESET_SEC, then lets one request probe the database.
+DB_CONNECT_TIMEOUT = max(1, int(_env_float("DB_CONNECT_TIMEOUT", 5)))
+DB_BREAKER_THRESHOLD = int(_env_float("DB_BREAKER_THRESHOLD", 3))
+DB_BREAKER_RESET_SEC = _env_float("DB_BREAKER_RESET_SEC", 10.0)
+
+# ── Schema migrations ─────────────────────────────────────────────────
+# Applied in order, once per database, and recorded in schema_version. Never
+# edit a migration that has shipped; append a new one. Every statement is
+# idempotent so databases created before schema_version existed migrate cleanly.
+
+_MIGRATION_BASE_SQL = """
 CREATE TABLE IF NOT EXISTS courses (
     id SERIAL PRIMARY KEY,
     name VARCHAR(255) UNIQUE NOT NULL,
@@ -40,8 +86,96 @@ CREATE TABLE IF NOT EXISTS certificates (
     client_ip VARCHAR(45)
 );
 
-CREATE INDEX IF NOT EXISTS idx_certificates_issued_at ON certificates(issued_at DESC);
-CREATE INDEX IF NOT EXISTS idx_certificates_course ON certificates(course_name);
+ALTER TABLE certificates ADD COLUMN IF NOT EXISTS participant_email VARCHAR(255) DEFAULT '';
+
+CREATE TABLE IF NOT EXISTS app_state (
+    key VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+_MIGRATION_EMAIL_OUTBOX_SQL = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(32) NOT NULL,
+    to_email VARCHAR(255) NOT NULL,
+    params JSONB NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    last_error TEXT DEFAULT '',
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_until TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    sent_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox(next_attempt_at)
+    WHERE status IN ('pending', 'sending');
+"""
+
+# Keyset pagination walks (issued_at, id); the course variant also serves
+# equality lookups on course_name, so the single-column indexes are gone.
+_MIGRATION_KEYSET_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_certificates_issued_id ON certificates(issued_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_certificates_course_issued ON certificates(course_name, issued_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_certificates_issued_at;
+DROP INDEX IF EXISTS idx_certificates_course;
+"""
+
+# Daily per-course counters behind /api/admin/stats, maintained in the same
+# transaction as each insert/revoke. Days are UTC; revocations count against
+# the day the certificate was issued.
+_MIGRATION_STATS_ROLLUP_SQL = """
+CREATE TABLE IF NOT EXISTS certificate_daily_stats (
+    day DATE NOT NULL,
+    course_name VARCHAR(255) NOT NULL,
+    issued BIGINT NOT NULL DEFAULT 0,
+    revoked BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, course_name)
+);
+"""
+# Shared rate-limit counters (api/rate_limit.py). UNLOGGED: skipping the WAL
+# makes the per-request upsert cheap, and losing counters in a crash is fine.
+_MIGRATION_RATE_LIMIT_SQL = """
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_counters (
+    key VARCHAR(128) NOT NULL,
+    window_idx BIGINT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (key, window_idx)
+);
+"""
+
+# Idempotency keys (api/idempotency.py): a pending claim with a lease, then the
+# stored response until expires_at.
+_MIGRATION_IDEMPOTENCY_SQL = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key VARCHAR(64) PRIMARY KEY,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    response JSONB,
+    locked_until TIMESTAMPTZ,
+    expires_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys(expires_at);
+"""
+
+# revoked_seq is the revocation_epoch value a revoke committed with, so
+# instances refresh their in-memory revocation set incrementally (api/revocation.py).
+_MIGRATION_REVOCATION_SEQ_SQL = """
+ALTER TABLE certificates ADD COLUMN IF NOT EXISTS revoked_seq BIGINT;
+UPDATE certificates SET revoked_seq = 0 WHERE revoked AND revoked_seq IS NULL;
+CREATE INDEX IF NOT EXISTS idx_certificates_revoked_seq ON certificates(revoked_seq) WHERE revoked_seq IS NOT NULL;
+"""
+
+_MIGRATION_SHORT_LINKS_SQL = """
+CREATE TABLE IF NOT EXISTS certificate_links (
+    short_id VARCHAR(32) PRIMARY KEY,
+    token TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
 """
 
 SEED_COURSES = [
@@ -70,51 +204,444 @@ def _get_conn():
     return psycopg2.connect(
         DATABASE_URL,
         cursor_factory=psycopg2.extras.RealDictCursor,
-        connect_timeout=5,
+        connect_timeout=DB_CONNECT_TIMEOUT,
     )
 
 
+class DatabaseUnavailable(RuntimeError):
+    """The database could not be reached, or the circuit breaker is open."""
+
+
+class PoolTimeout(DatabaseUnavailable):
+    """No connection became free within DB_POOL_TIMEOUT."""
+
+
+class CertificateIdTaken(ValueError):
+    """A different certificate (another token) already holds this certificate_id."""
+
+
+class _ConnectionPool:
+    """Thread-safe LIFO pool of psycopg2 connections.
+
+    Idle connections are reused most-recent-first so the warm ones stay warm and
+    the rest age out after ``idle_timeout``, down to ``minconn`` (opened up
+    front by fill() when the process creates its pool). A connection idle for longer than
+    ``healthcheck_interval`` is pinged with ``SELECT 1`` before it is handed out;
+    connections older than ``max_lifetime`` are closed on return.
+    """
+
+    def __init__(
+        self,
+        connect,
+        *,
+        minconn: int = 0,
+        maxconn: int = 5,
+        timeout: float = 10.0,
+        idle_timeout: float = 300.0,
+        max_lifetime: float = 1800.0,
+        healthcheck_interval: float = 30.0,
+    ) -> None:
+        self._connect = connect
+        self.minconn = max(0, min(minconn, maxconn))
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.healthcheck_interval = healthcheck_interval
+        self.pid = os.getpid()
+        self._idle: list[tuple[object, float]] = []
+        self._born: dict[int, float] = {}
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+        self.waits = 0
+
+    def fill(self) -> int:
+        """Open idle connections until ``minconn`` exist; returns how many were opened."""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.minconn:
+                    return opened
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                now = time.monotonic()
+                self._born[id(conn)] = now
+                self.created += 1
+                self._idle.append((conn, now))
+                self._cond.notify()
+            opened += 1
+
+    def _close(self, conn) -> None:
+        self._born.pop(id(conn), None)
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _expired(self, conn, now: float) -> bool:
+        born = self._born.get(id(conn), now)
+        return bool(self.max_lifetime) and now - born > self.max_lifetime
+
+    def _prune_idle_locked(self, now: float) -> None:
+        """Close idle connections past idle_timeout, keeping at least minconn open."""
+        if not self.idle_timeout:
+            return
+        keep: list[tuple[object, float]] = []
+        # Oldest entries sit at the bottom of the stack.
+        for conn, last_used in self._idle:
+            if now - last_used > self.idle_timeout and self._size > self.minconn:
+                self._close(conn)
+                self._size -= 1
+                self.recycled += 1
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    @staticmethod
+    def _healthy(conn) -> bool:
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = None
+            last_used = 0.0
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                while True:
+                    now = time.monotonic()
+                    self._prune_idle_locked(now)
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise PoolTimeout(f"No database connection free within {self.timeout:g}s")
+                    self.waits += 1
+                    self._cond.wait(remaining)
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._born[id(conn)] = time.monotonic()
+                    self.created += 1
+                return conn
+            if conn.closed == 0 and (
+                time.monotonic() - last_used < self.healthcheck_interval or self._healthy(conn)
+            ):
+                return conn
+            logger.info("Discarding stale pooled database connection")
+            self.putconn(conn, discard=True)
+
+    def putconn(self, conn, *, discard: bool = False) -> None:
+        now = time.monotonic()
+        if not discard:
+            try:
+                # Never hand a connection back mid-transaction: a transaction
+                # pooler would keep the server connection pinned to us.
+                status = conn.info.transaction_status
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                discard = bool(conn.closed) or self._expired(conn, now)
+            except psycopg2.Error:
+                discard = True
+        with self._cond:
+            if discard or self._closed:
+                self._close(conn)
+                self._size -= 1
+                self.recycled += 1
+            else:
+                self._idle.append((conn, now))
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._close(conn)
+                self._size -= 1
+            self._idle = []
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max": self.maxconn,
+                "created": self.created,
+                "recycled": self.recycled,
+                "waits": self.waits,
+            }
+
+
+_pool: _ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> _ConnectionPool:
+    """Process-wide pool, created on first use (and again in a forked child)."""
+    global _pool
+    pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    created = False
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            created = True
+            _pool = _ConnectionPool(
+                _get_conn,
+                minconn=DB_POOL_MIN,
+                maxconn=DB_POOL_MAX,
+                timeout=DB_POOL_TIMEOUT,
+                idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                max_lifetime=DB_POOL_MAX_LIFETIME,
+                healthcheck_interval=DB_POOL_HEALTHCHECK_INTERVAL,
+            )
+        pool = _pool
+    if created and pool.minconn:
+        try:
+            pool.fill()
+        except Exception as e:  # noqa: BLE001 - pre-opening is best effort
+            # Not fatal: getconn opens connections on demand and reports the failure.
+            logger.warning(f"Could not pre-open {pool.minconn} database connections: {e}")
+    return pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None and pool.pid == os.getpid():
+        pool.close()
+
+
+def pool_stats() -> dict | None:
+    pool = _pool
+    return pool.stats() if pool is not None else None
+
+
+_breaker = CircuitBreaker("database", failure_threshold=DB_BREAKER_THRESHOLD, reset_timeout=DB_BREAKER_RESET_SEC)
+
+# Errors that mean the server is unreachable or the connection died, as
+# opposed to the server rejecting a statement (IntegrityError etc.).
+_CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+def breaker_stats() -> dict:
+    return _breaker.stats()
+
+
+def breaker_state() -> str:
+    return _breaker.state
+
+
 @contextmanager
 def get_db():
-    conn = _get_conn()
+    try:
+        _breaker.before_call()
+    except CircuitOpenError as e:
+        raise DatabaseUnavailable(str(e)) from e
+    pool = _get_pool()
+    try:
+        conn = pool.getconn()
+    except DatabaseUnavailable:
+        _breaker.record_failure()
+        raise
+    except Exception as e:
+        _breaker.record_failure()
+        raise DatabaseUnavailable(f"Database connection failed: {e}") from e
+    broken = False
     try:
         yield conn
         conn.commit()
-    except Exception:
-        conn.rollback()
+    except BaseException as e:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        if broken or isinstance(e, _CONNECTION_ERRORS):
+            _breaker.record_failure()
+        else:
+            _breaker.record_success()
         raise
+    else:
+        _breaker.record_success()
     finally:
-        conn.close()
+        pool.putconn(conn, discard=broken)
 
 
-def init_schema():
-    """Create tables and seed initial courses if empty."""
-    with get_db() as conn:
-        cur = conn.cursor()
-        cur.execute(SCHEMA_SQL)
+def _seed_courses(cur) -> None:
+    seeded = 0
+    for name, desc in SEED_COURSES:
+        cur.execute(
+            "INSERT INTO courses (name, description) VALUES (%s, %s) ON CONFLICT (name) DO NOTHING",
+            (name, desc),
+        )
+        seeded += cur.rowcount
+    if seeded:
+        _bump_version(cur, "courses")
+    logger.info(f"Seeded {seeded} of {len(SEED_COURSES)} courses")
+
 
-        # Migration: add participant_email column if missing
-        cur.execute("""
-            SELECT column_name FROM information_schema.columns
-            WHERE table_name = 'certificates' AND column_name = 'participant_email'
-        """)
-        if not cur.fetchone():
-            cur.execute("ALTER TABLE certificates ADD COLUMN participant_email VARCHAR(255) DEFAULT ''")
-            logger.info("Migrated: added participant_email column to certificates")
+CERTIFICATE_ID_INDEX = "idx_certificates_certificate_id"
+CERTIFICATE_ID_TAKEN = "certificate_id_taken"
 
-        for name, desc in SEED_COURSES:
+
+def _index_certificate_ids(cur) -> None:
+    # Unique when the existing rows allow it. Older deployments may hold two
+    # payloads with the same display id; those keep a plain index (same name).
+    cur.execute("SAVEPOINT certificate_id_index")
+    try:
+        cur.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_certificates_certificate_id ON certificates(certificate_id)"
+        )
+    except psycopg2.errors.UniqueViolation:
+        cur.execute("ROLLBACK TO SAVEPOINT certificate_id_index")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_certificates_certificate_id ON certificates(certificate_id)")
+        logger.warning(
+            "Duplicate certificate_id values found; created a non-unique index. "
+            "Lookups by id return the earliest issued certificate"
+        )
+    cur.execute("RELEASE SAVEPOINT certificate_id_index")
+
+
+def _init_stats_rollup(cur) -> None:
+    cur.execute(_MIGRATION_STATS_ROLLUP_SQL)
+    if _read_version(cur, STATS_ROLLUP_KEY):
+        return
+    cur.execute("SELECT EXISTS (SELECT 1 FROM certificates) AS any")
+    if cur.fetchone()["any"]:
+        logger.warning(
+            "Stats rollup not built; /api/admin/stats scans certificates until "
+            "scripts/backfill_stats_rollup.py is run"
+        )
+    else:
+        _bump_version(cur, STATS_ROLLUP_KEY)
+
+
+# (version, description, SQL string or callable taking a cursor)
+MIGRATIONS: list[tuple[int, str, str | Callable]] = [
+    (1, "courses, certificates and app_state", _MIGRATION_BASE_SQL),
+    (2, "seed courses", _seed_courses),
+    (3, "email outbox", _MIGRATION_EMAIL_OUTBOX_SQL),
+    (4, "keyset pagination indexes", _MIGRATION_KEYSET_INDEXES_SQL),
+    (5, "daily stats rollup", _init_stats_rollup),
+    (6, "rate limit counters", _MIGRATION_RATE_LIMIT_SQL),
+    (7, "idempotency keys", _MIGRATION_IDEMPOTENCY_SQL),
+    (8, "short certificate links", _MIGRATION_SHORT_LINKS_SQL),
+    (9, "certificate_id index", _index_certificate_ids),
+    (10, "revocation sequence", _MIGRATION_REVOCATION_SEQ_SQL),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Arbitrary constant shared by every instance; serializes migration runs.
+_MIGRATION_LOCK_ID = 0x70646663657274  # "pdfcert"
+
+
+def _applied_schema_version(conn) -> int:
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT MAX(version) AS v FROM schema_version")
+    except psycopg2.errors.UndefinedTable:
+        conn.rollback()
+        return 0
+    return int(cur.fetchone()["v"] or 0)
+
+
+def init_schema() -> int:
+    """Bring the database up to SCHEMA_VERSION; returns the number of migrations applied.
+
+    When the schema is current this is one SELECT. Otherwise the pending
+    migrations run in a single transaction under a Postgres advisory lock, so
+    instances that cold-start together apply them once; the others wait on the
+    lock and then find nothing to do.
+    """
+    with get_db() as conn:
+        if _applied_schema_version(conn) >= SCHEMA_VERSION:
+            return 0
+
+        cur = conn.cursor()
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_MIGRATION_LOCK_ID,))
+        cur.execute(
+            """CREATE TABLE IF NOT EXISTS schema_version (
+                   version INTEGER PRIMARY KEY,
+                   description TEXT NOT NULL,
+                   applied_at TIMESTAMPTZ DEFAULT NOW()
+               )"""
+        )
+        cur.execute("SELECT version FROM schema_version")
+        applied = {r["version"] for r in cur.fetchall()}
+        pending = [m for m in MIGRATIONS if m[0] not in applied]
+        for version, description, step in pending:
+            if callable(step):
+                step(cur)
+            else:
+                cur.execute(step)
             cur.execute(
-                "INSERT INTO courses (name, description) VALUES (%s, %s) ON CONFLICT (name) DO NOTHING",
-                (name, desc),
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (version, description),
             )
-        logger.info(f"Ensured {len(SEED_COURSES)} seed courses exist")
-        logger.info("Database schema initialized")
+            logger.info(f"Applied migration {version}: {description}")
+        if pending:
+            logger.info(f"Database schema at version {SCHEMA_VERSION}")
+        return len(pending)
 
 
 def token_hash(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
 
+# ── Versioned app state ───────────────────────────────────────────────
+# Monotonic counters that let each instance's in-process caches notice writes
+# made by another instance. Bump inside the writing transaction.
+
+def _bump_version(cur, key: str) -> None:
+    cur.execute(
+        """INSERT INTO app_state (key, version, updated_at) VALUES (%s, 1, NOW())
+           ON CONFLICT (key) DO UPDATE SET version = app_state.version + 1, updated_at = NOW()""",
+        (key,),
+    )
+
+
+def _read_version(cur, key: str) -> int:
+    cur.execute("SELECT version FROM app_state WHERE key = %s", (key,))
+    row = cur.fetchone()
+    return int(row["version"]) if row else 0
+
+
+def get_state_version(key: str) -> int:
+    with get_db() as conn:
+        return _read_version(conn.cursor(), key)
+
+
 # ── Courses ───────────────────────────────────────────────────────────
 
 def get_courses(active_only: bool = True) -> list[dict]:
@@ -134,7 +661,9 @@ def add_course(name: str, description: str = "") -> dict:
             "INSERT INTO courses (name, description) VALUES (%s, %s) RETURNING id, name, description, active",
             (name, description),
         )
-        return dict(cur.fetchone())
+        row = dict(cur.fetchone())
+        _bump_version(cur, "courses")
+        return row
 
 
 def toggle_course(course_id: int, active: bool) -> dict | None:
@@ -145,7 +674,10 @@ def toggle_course(course_id: int, active: bool) -> dict | None:
             (active, course_id),
         )
         row = cur.fetchone()
-        return dict(row) if row else None
+        if not row:
+            return None
+        _bump_version(cur, "courses")
+        return dict(row)
 
 
 def get_active_course_names() -> list[str]:
@@ -153,6 +685,16 @@ def get_active_course_names() -> list[str]:
     return [c["name"] for c in courses]
 
 
+def get_active_course_names_versioned() -> tuple[int, list[str]]:
+    """(courses version, active names) on one connection. The version is read first, so a
+    concurrent write can only make the names newer than the version, never older."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        version = _read_version(cur, "courses")
+        cur.execute("SELECT name FROM courses WHERE active = TRUE ORDER BY id")
+        return version, [r["name"] for r in cur.fetchall()]
+
+
 # ── Certificates ──────────────────────────────────────────────────────
 
 def store_certificate(
@@ -165,46 +707,206 @@ def store_certificate(
     client_ip: str = "",
     participant_email: str = "",
 ) -> dict:
+    """Insert one certificate.
+
+    Raises CertificateIdTaken when another token already holds ``certificate_id``
+    (psycopg2's UniqueViolation still signals a re-issued identical token).
+    """
     with get_db() as conn:
         cur = conn.cursor()
-        cur.execute(
+        try:
+            cur.execute(
+                """INSERT INTO certificates
+                   (certificate_id, token_hash, participant_name, participant_email,
+                    course_name, completion_date, instructor_name, client_ip)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                   RETURNING id, certificate_id, participant_name, participant_email,
+                             course_name, completion_date, instructor_name, issued_at, revoked""",
+                (certificate_id, token_hash(token), participant_name, participant_email,
+                 course_name, completion_date, instructor_name, client_ip),
+            )
+        except psycopg2.errors.UniqueViolation as e:
+            if e.diag.constraint_name == CERTIFICATE_ID_INDEX:
+                raise CertificateIdTaken(certificate_id) from e
+            raise
+        row = dict(cur.fetchone())
+        _add_daily_stats(cur, {(_utc_day(row["issued_at"]), course_name): 1}, "issued")
+        return row
+
+
+def store_certificates_bulk(rows: list[dict]) -> list[dict | str | None]:
+    """Store many certificates with multi-row INSERTs in one transaction.
+
+    ``rows`` take the same keys as store_certificate's arguments. Returns one
+    item per input row: the stored row (id, certificate_id, issued_at); None
+    when its token_hash already exists, either in the table (e.g. a re-issued
+    identical payload) or earlier in the same batch; or CERTIFICATE_ID_TAKEN
+    when a different token holds its certificate_id.
+    """
+    if not rows:
+        return []
+    hashes = [token_hash(r["token"]) for r in rows]
+    values = []
+    seen: set[str] = set()
+    seen_ids: set[str] = set()
+    for r, h in zip(rows, hashes):
+        if h in seen or r["certificate_id"] in seen_ids:
+            continue
+        seen.add(h)
+        seen_ids.add(r["certificate_id"])
+        values.append((
+            r["certificate_id"], h, r["participant_name"], r.get("participant_email", ""),
+            r["course_name"], r["completion_date"], r["instructor_name"], r.get("client_ip", ""),
+        ))
+    with get_db() as conn:
+        cur = conn.cursor()
+        inserted = psycopg2.extras.execute_values(
+            cur,
             """INSERT INTO certificates
                (certificate_id, token_hash, participant_name, participant_email,
                 course_name, completion_date, instructor_name, client_ip)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-               RETURNING id, certificate_id, participant_name, participant_email,
-                         course_name, completion_date, instructor_name, issued_at, revoked""",
-            (certificate_id, token_hash(token), participant_name, participant_email,
-             course_name, completion_date, instructor_name, client_ip),
+               VALUES %s
+               ON CONFLICT DO NOTHING
+               RETURNING id, token_hash, certificate_id, course_name, issued_at""",
+            values,
+            page_size=1000,
+            fetch=True,
         )
-        return dict(cur.fetchone())
+        issued: dict[tuple[date, str], int] = {}
+        for row in inserted:
+            key = (_utc_day(row["issued_at"]), row["course_name"])
+            issued[key] = issued.get(key, 0) + 1
+        _add_daily_stats(cur, issued, "issued")
+        # Rows neither inserted nor already stored lost their certificate_id
+        # to a different token.
+        unstored = set(hashes) - {row["token_hash"] for row in inserted}
+        if unstored:
+            cur.execute("SELECT token_hash FROM certificates WHERE token_hash = ANY(%s)", (list(unstored),))
+            unstored -= {r["token_hash"] for r in cur.fetchall()}
+    by_hash = {}
+    for row in inserted:
+        d = dict(row)
+        d.pop("course_name", None)
+        if isinstance(d.get("issued_at"), datetime):
+            d["issued_at"] = d["issued_at"].isoformat()
+        by_hash[d.pop("token_hash")] = d
+    # pop() so an in-batch duplicate after the first occurrence reports None.
+    results = [by_hash.pop(h, None) for h in hashes]
+    return [CERTIFICATE_ID_TAKEN if h in unstored else res for h, res in zip(hashes, results)]
+
 
+# Below this many (estimated) rows an exact COUNT(*) is cheap enough to run anyway.
+COUNT_EXACT_BELOW = int(_env_float("LIST_COUNT_EXACT_BELOW", 10000))
+
+LIST_COUNT_MODES = ("exact", "estimate", "none")
+
+
+def encode_list_cursor(issued_at: datetime | str, cert_db_id: int) -> str:
+    """Opaque cursor for the row after which the next page starts."""
+    if isinstance(issued_at, datetime):
+        issued_at = issued_at.isoformat()
+    raw = json.dumps([issued_at, int(cert_db_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_list_cursor(cursor: str) -> tuple[str, int]:
+    """Inverse of encode_list_cursor. Raises ValueError for anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        issued_at, cert_db_id = json.loads(raw)
+        datetime.fromisoformat(issued_at)
+        return issued_at, int(cert_db_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _estimate_count(cur, course: str | None) -> int:
+    """Row estimate from planner statistics (no table scan)."""
+    if course:
+        cur.execute(
+            "EXPLAIN (FORMAT JSON) SELECT 1 FROM certificates WHERE course_name = %s",
+            (course,),
+        )
+        plan = cur.fetchone()["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    cur.execute("SELECT reltuples::BIGINT AS n FROM pg_class WHERE oid = 'certificates'::regclass")
+    row = cur.fetchone()
+    # reltuples is -1 (PG14+) or 0 before the first VACUUM/ANALYZE.
+    return max(0, int(row["n"])) if row else 0
+
+
+def list_certificates(
+    limit: int = 50,
+    offset: int = 0,
+    course: str | None = None,
+    cursor: str | None = None,
+    count: str = "exact",
+) -> dict:
+    """One page of certificates, newest first.
+
+    Pass the previous page's ``next_cursor`` as ``cursor`` to continue; that
+    seeks on (issued_at, id) instead of skipping ``offset`` rows. ``count``
+    controls ``total``: ``exact`` runs COUNT(*), ``estimate`` reads planner
+    statistics (falling back to an exact count for small tables) and ``none``
+    skips it (``total`` is null).
+    """
+    if count not in LIST_COUNT_MODES:
+        raise ValueError(f"count must be one of {', '.join(LIST_COUNT_MODES)}")
+    after = decode_list_cursor(cursor) if cursor else None
 
-def list_certificates(limit: int = 50, offset: int = 0, course: str | None = None) -> dict:
     with get_db() as conn:
         cur = conn.cursor()
-        where = ""
+        conditions: list[str] = []
         params: list = []
         if course:
-            where = "WHERE course_name = %s"
+            conditions.append("course_name = %s")
             params.append(course)
 
-        cur.execute(f"SELECT COUNT(*) as total FROM certificates {where}", params)
-        total = cur.fetchone()["total"]
+        total: int | None = None
+        estimated = False
+        if count == "estimate":
+            total = _estimate_count(cur, course)
+            estimated = total >= COUNT_EXACT_BELOW
+        if count == "exact" or (count == "estimate" and not estimated):
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            cur.execute(f"SELECT COUNT(*) as total FROM certificates {where}", params)
+            total = cur.fetchone()["total"]
+
+        if after:
+            conditions.append("(issued_at, id) < (%s::timestamptz, %s)")
+            params.extend(after)
+            offset = 0
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
         cur.execute(
             f"""SELECT id, certificate_id, participant_name, participant_email,
                        course_name, completion_date, instructor_name, issued_at, revoked
                 FROM certificates {where}
-                ORDER BY issued_at DESC
+                ORDER BY issued_at DESC, id DESC
                 LIMIT %s OFFSET %s""",
-            params + [limit, offset],
+            params + [limit + 1, offset],
         )
         rows = [dict(r) for r in cur.fetchall()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_list_cursor(rows[-1]["issued_at"], rows[-1]["id"])
         for r in rows:
             if isinstance(r.get("issued_at"), datetime):
                 r["issued_at"] = r["issued_at"].isoformat()
-        return {"certificates": rows, "total": total, "limit": limit, "offset": offset}
+        return {
+            "certificates": rows,
+            "total": total,
+            "total_is_estimate": estimated,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": next_cursor,
+        }
+
+
+REVOCATION_EPOCH_KEY = "revocation_epoch"
 
 
 def revoke_certificate(cert_db_id: int) -> dict | None:
@@ -213,43 +915,420 @@ def revoke_certificate(cert_db_id: int) -> dict | None:
         cur.execute(
             """UPDATE certificates SET revoked = TRUE, revoked_at = NOW()
                WHERE id = %s AND revoked = FALSE
-               RETURNING id, certificate_id, participant_name, revoked""",
+               RETURNING id, certificate_id, participant_name, revoked, course_name, issued_at""",
             (cert_db_id,),
         )
         row = cur.fetchone()
-        return dict(row) if row else None
+        if not row:
+            return None
+        row = dict(row)
+        # The app_state row lock orders concurrent revokes, so revoked_seq follows commit order.
+        _bump_version(cur, REVOCATION_EPOCH_KEY)
+        cur.execute(
+            "UPDATE certificates SET revoked_seq = %s WHERE id = %s",
+            (_read_version(cur, REVOCATION_EPOCH_KEY), cert_db_id),
+        )
+        _add_daily_stats(cur, {(_utc_day(row.pop("issued_at")), row.pop("course_name")): 1}, "revoked")
+        return row
 
 
-def get_stats() -> dict:
+def get_certificate_by_cert_id(certificate_id: str) -> dict | None:
+    """Issued certificate with this display id (the earliest, if legacy rows share one)."""
     with get_db() as conn:
         cur = conn.cursor()
+        cur.execute(
+            """SELECT certificate_id, participant_name, course_name, completion_date,
+                      instructor_name, issued_at, revoked, revoked_at
+               FROM certificates WHERE certificate_id = %s
+               ORDER BY id LIMIT 1""",
+            (certificate_id,),
+        )
+        row = cur.fetchone()
+        if not row:
+            return None
+        out = dict(row)
+        for key in ("issued_at", "revoked_at"):
+            if isinstance(out.get(key), datetime):
+                out[key] = out[key].isoformat()
+        return out
+
+
+def revoked_hashes_since(seq: int) -> list[str]:
+    """Token hashes of certificates revoked after revocation epoch ``seq`` (-1 for all)."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT token_hash FROM certificates WHERE revoked_seq > %s", (seq,))
+        return [r["token_hash"] for r in cur.fetchall()]
+
+
+def revoked_token_hashes(hashes: list[str]) -> set[str]:
+    """Subset of ``hashes`` (see token_hash) that belong to revoked certificates, in one query."""
+    if not hashes:
+        return set()
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT token_hash FROM certificates WHERE token_hash = ANY(%s) AND revoked = TRUE",
+            (list(set(hashes)),),
+        )
+        return {r["token_hash"] for r in cur.fetchall()}
+
+
+# ── Stats rollup ──────────────────────────────────────────────────────
+
+STATS_ROLLUP_KEY = "stats_rollup"
+
+
+def _utc_day(ts: datetime | None) -> date:
+    if ts is None:
+        return datetime.now(UTC).date()
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(UTC)
+    return ts.date()
+
+
+def _add_daily_stats(cur, counts: dict[tuple[date, str], int], column: str) -> None:
+    """Add ``counts`` per (day, course) to the ``issued`` or ``revoked`` rollup column."""
+    if column not in ("issued", "revoked") or not counts:
+        return
+    psycopg2.extras.execute_values(
+        cur,
+        f"""INSERT INTO certificate_daily_stats (day, course_name, {column})
+            VALUES %s
+            ON CONFLICT (day, course_name)
+            DO UPDATE SET {column} = certificate_daily_stats.{column} + EXCLUDED.{column}""",
+        [(day, course, n) for (day, course), n in counts.items()],
+    )
+
+
+def backfill_stats_rollup() -> int:
+    """Rebuild certificate_daily_stats from the certificates table; returns the row count.
+
+    Takes a SHARE lock on certificates for the rebuild, so concurrent issuance
+    waits a moment instead of being double-counted or lost.
+    """
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("LOCK TABLE certificates IN SHARE MODE")
+        cur.execute("DELETE FROM certificate_daily_stats")
+        cur.execute(
+            """INSERT INTO certificate_daily_stats (day, course_name, issued, revoked)
+               SELECT (issued_at AT TIME ZONE 'UTC')::date, course_name,
+                      COUNT(*), COUNT(*) FILTER (WHERE revoked)
+               FROM certificates
+               GROUP BY 1, 2"""
+        )
+        rows = cur.rowcount
+        _bump_version(cur, STATS_ROLLUP_KEY)
+        return rows
+
+
+def _get_stats_scan(cur) -> dict:
+    """Aggregate straight from certificates; only used until the rollup is backfilled."""
+    cur.execute("SELECT COUNT(*) as total FROM certificates")
+    total = cur.fetchone()["total"]
+
+    cur.execute("SELECT COUNT(*) as cnt FROM certificates WHERE issued_at >= NOW() - INTERVAL '7 days'")
+    this_week = cur.fetchone()["cnt"]
+
+    cur.execute("SELECT COUNT(*) as cnt FROM certificates WHERE revoked = TRUE")
+    revoked = cur.fetchone()["cnt"]
+
+    cur.execute(
+        """SELECT course_name, COUNT(*) as cnt
+           FROM certificates GROUP BY course_name ORDER BY cnt DESC LIMIT 10"""
+    )
+    by_course = [dict(r) for r in cur.fetchall()]
+
+    cur.execute(
+        """SELECT DATE(issued_at) as day, COUNT(*) as cnt
+           FROM certificates WHERE issued_at >= NOW() - INTERVAL '30 days'
+           GROUP BY DATE(issued_at) ORDER BY day"""
+    )
+    daily = [{"day": str(r["day"]), "count": r["cnt"]} for r in cur.fetchall()]
+
+    return {
+        "total_certificates": total,
+        "this_week": this_week,
+        "revoked": revoked,
+        "by_course": by_course,
+        "daily_trend": daily,
+    }
 
-        cur.execute("SELECT COUNT(*) as total FROM certificates")
-        total = cur.fetchone()["total"]
 
-        cur.execute("SELECT COUNT(*) as cnt FROM certificates WHERE issued_at >= NOW() - INTERVAL '7 days'")
-        this_week = cur.fetchone()["cnt"]
+def get_stats() -> dict:
+    """Dashboard totals from certificate_daily_stats (O(days x courses) rows).
 
-        cur.execute("SELECT COUNT(*) as cnt FROM certificates WHERE revoked = TRUE")
-        revoked = cur.fetchone()["cnt"]
+    ``this_week`` covers the current UTC day and the six before it.
+    """
+    with get_db() as conn:
+        cur = conn.cursor()
+        if not _read_version(cur, STATS_ROLLUP_KEY):
+            return _get_stats_scan(cur)
 
         cur.execute(
-            """SELECT course_name, COUNT(*) as cnt
-               FROM certificates GROUP BY course_name ORDER BY cnt DESC LIMIT 10"""
+            """SELECT COALESCE(SUM(issued), 0)::BIGINT AS total,
+                      COALESCE(SUM(revoked), 0)::BIGINT AS revoked,
+                      COALESCE(SUM(issued) FILTER (
+                          WHERE day >= (NOW() AT TIME ZONE 'UTC')::date - 6
+                      ), 0)::BIGINT AS this_week
+               FROM certificate_daily_stats"""
+        )
+        totals = cur.fetchone()
+
+        cur.execute(
+            """SELECT course_name, SUM(issued)::BIGINT as cnt
+               FROM certificate_daily_stats GROUP BY course_name
+               HAVING SUM(issued) > 0 ORDER BY cnt DESC LIMIT 10"""
         )
         by_course = [dict(r) for r in cur.fetchall()]
 
         cur.execute(
-            """SELECT DATE(issued_at) as day, COUNT(*) as cnt
-               FROM certificates WHERE issued_at >= NOW() - INTERVAL '30 days'
-               GROUP BY DATE(issued_at) ORDER BY day"""
+            """SELECT day, SUM(issued)::BIGINT as cnt
+               FROM certificate_daily_stats
+               WHERE day >= (NOW() AT TIME ZONE 'UTC')::date - 30
+               GROUP BY day HAVING SUM(issued) > 0 ORDER BY day"""
         )
         daily = [{"day": str(r["day"]), "count": r["cnt"]} for r in cur.fetchall()]
 
         return {
-            "total_certificates": total,
-            "this_week": this_week,
-            "revoked": revoked,
+            "total_certificates": totals["total"],
+            "this_week": totals["this_week"],
+            "revoked": totals["revoked"],
             "by_course": by_course,
             "daily_trend": daily,
         }
+
+
+# ── Rate limit counters ───────────────────────────────────────────────
+
+def rate_limit_hit(key: str, window_idx: int, limit: int, prev_weight: float) -> tuple[int, int, bool]:
+    """Count one hit for ``key`` in ``window_idx`` if the sliding estimate
+    (previous window hits * ``prev_weight`` + current hits) leaves room under
+    ``limit``. Denied hits are not counted, so a client retrying while limited
+    does not extend its own lockout. Returns (previous window hits, current
+    window hits including this one when counted, counted)."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """WITH prev AS (
+                   SELECT COALESCE((SELECT hits FROM rate_limit_counters
+                                    WHERE key = %(key)s AND window_idx = %(idx)s - 1), 0) AS hits
+               ), hit AS (
+                   INSERT INTO rate_limit_counters (key, window_idx, hits)
+                   SELECT %(key)s, %(idx)s, 1 FROM prev WHERE prev.hits * %(weight)s + 1 <= %(limit)s
+                   ON CONFLICT (key, window_idx) DO UPDATE SET hits = rate_limit_counters.hits + 1
+                   WHERE (SELECT hits FROM prev) * %(weight)s + rate_limit_counters.hits + 1 <= %(limit)s
+                   RETURNING hits
+               )
+               SELECT (SELECT hits FROM prev) AS prev,
+                      (SELECT hits FROM hit) AS counted,
+                      COALESCE((SELECT hits FROM rate_limit_counters
+                                WHERE key = %(key)s AND window_idx = %(idx)s), 0) AS curr""",
+            {"key": key, "idx": window_idx, "weight": prev_weight, "limit": limit},
+        )
+        row = cur.fetchone()
+        if row["counted"] is not None:
+            return int(row["prev"]), int(row["counted"]), True
+        return int(row["prev"]), int(row["curr"]), False
+
+
+def rate_limit_prune(before_idx: int) -> int:
+    """Delete counters for windows older than ``before_idx``."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM rate_limit_counters WHERE window_idx < %s", (before_idx,))
+        return cur.rowcount
+
+
+# ── Idempotency keys ──────────────────────────────────────────────────
+
+def idempotency_get(key: str) -> dict | None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """SELECT response FROM idempotency_keys
+               WHERE key = %s AND status = 'done' AND expires_at > NOW()""",
+            (key,),
+        )
+        row = cur.fetchone()
+        return row["response"] if row else None
+
+
+def idempotency_acquire(key: str, lock_sec: float, ttl_sec: float) -> bool:
+    """Claim ``key``; also takes over expired keys and pending claims whose lease ran out."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """INSERT INTO idempotency_keys (key, status, locked_until, expires_at)
+               VALUES (%s, 'pending', NOW() + make_interval(secs => %s), NOW() + make_interval(secs => %s))
+               ON CONFLICT (key) DO UPDATE
+                   SET status = 'pending', response = NULL,
+                       locked_until = EXCLUDED.locked_until, expires_at = EXCLUDED.expires_at
+                   WHERE idempotency_keys.expires_at <= NOW()
+                      OR (idempotency_keys.status = 'pending' AND idempotency_keys.locked_until <= NOW())
+               RETURNING key""",
+            (key, lock_sec, ttl_sec),
+        )
+        return cur.fetchone() is not None
+
+
+def idempotency_complete(key: str, response: dict, ttl_sec: float) -> None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """INSERT INTO idempotency_keys (key, status, response, expires_at)
+               VALUES (%s, 'done', %s, NOW() + make_interval(secs => %s))
+               ON CONFLICT (key) DO UPDATE
+                   SET status = 'done', response = EXCLUDED.response,
+                       locked_until = NULL, expires_at = EXCLUDED.expires_at""",
+            (key, psycopg2.extras.Json(response), ttl_sec),
+        )
+
+
+def idempotency_release(key: str) -> None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM idempotency_keys WHERE key = %s AND status = 'pending'", (key,))
+
+
+def idempotency_prune(batch: int = 1000) -> int:
+    """Delete up to ``batch`` expired keys."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """DELETE FROM idempotency_keys WHERE key IN (
+                   SELECT key FROM idempotency_keys WHERE expires_at < NOW() LIMIT %s
+               )""",
+            (batch,),
+        )
+        return cur.rowcount
+
+
+# ── Short links ───────────────────────────────────────────────────────
+
+def store_short_links(links: list[tuple[str, str]]) -> dict[str, str]:
+    """Insert (short_id, token) pairs, keeping existing links. Returns short_id → stored token."""
+    if not links:
+        return {}
+    with get_db() as conn:
+        cur = conn.cursor()
+        psycopg2.extras.execute_values(
+            cur,
+            "INSERT INTO certificate_links (short_id, token) VALUES %s ON CONFLICT (short_id) DO NOTHING",
+            links,
+        )
+        cur.execute(
+            "SELECT short_id, token FROM certificate_links WHERE short_id = ANY(%s)",
+            (list({short_id for short_id, _ in links}),),
+        )
+        return {row["short_id"]: row["token"] for row in cur.fetchall()}
+
+
+def get_short_link(short_id: str) -> str | None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT token FROM certificate_links WHERE short_id = %s", (short_id,))
+        row = cur.fetchone()
+        return row["token"] if row else None
+
+
+# ── Email outbox ──────────────────────────────────────────────────────
+
+def outbox_add(msg_id: str, kind: str, to_email: str, params: dict, max_attempts: int) -> None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """INSERT INTO email_outbox (id, kind, to_email, params, max_attempts)
+               VALUES (%s, %s, %s, %s, %s)""",
+            (msg_id, kind, to_email, psycopg2.extras.Json(params), max_attempts),
+        )
+
+
+def outbox_add_many(rows: list[tuple[str, str, str, dict]], max_attempts: int) -> None:
+    """Insert (id, kind, to_email, params) rows in one statement."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        psycopg2.extras.execute_values(
+            cur,
+            "INSERT INTO email_outbox (id, kind, to_email, params, max_attempts) VALUES %s",
+            [(msg_id, kind, to_email, psycopg2.extras.Json(params), max_attempts)
+             for msg_id, kind, to_email, params in rows],
+            page_size=1000,
+        )
+
+
+def outbox_claim(lease_sec: float) -> dict | None:
+    """Lease the oldest due message. SKIP LOCKED lets workers on every instance drain in parallel;
+    a 'sending' row whose lease ran out (worker died mid-send) is claimable again."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """UPDATE email_outbox
+               SET status = 'sending', attempts = attempts + 1,
+                   locked_until = NOW() + make_interval(secs => %s)
+               WHERE id = (
+                   SELECT id FROM email_outbox
+                   WHERE status IN ('pending', 'sending')
+                     AND next_attempt_at <= NOW()
+                     AND (locked_until IS NULL OR locked_until < NOW())
+                   ORDER BY next_attempt_at
+                   LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+               )
+               RETURNING id, kind, to_email, params, attempts, max_attempts""",
+            (lease_sec,),
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+
+def outbox_mark_sent(msg_id: str) -> None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """UPDATE email_outbox SET status = 'sent', sent_at = NOW(), last_error = '', locked_until = NULL
+               WHERE id = %s""",
+            (msg_id,),
+        )
+
+
+def outbox_mark_retry(msg_id: str, delay_sec: float, error: str) -> None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """UPDATE email_outbox
+               SET status = 'pending', last_error = %s, locked_until = NULL,
+                   next_attempt_at = NOW() + make_interval(secs => %s)
+               WHERE id = %s""",
+            (error, delay_sec, msg_id),
+        )
+
+
+def outbox_mark_dead(msg_id: str, error: str) -> None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "UPDATE email_outbox SET status = 'dead', last_error = %s, locked_until = NULL WHERE id = %s",
+            (error, msg_id),
+        )
+
+
+def outbox_get(msg_id: str) -> dict | None:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """SELECT id, status, attempts, max_attempts, last_error, created_at, sent_at, next_attempt_at
+               FROM email_outbox WHERE id = %s""",
+            (msg_id,),
+        )
+        row = cur.fetchone()
+        if not row:
+            return None
+        out = dict(row)
+        for key in ("created_at", "sent_at", "next_attempt_at"):
+            if isinstance(out.get(key), datetime):
+                out[key] = out[key].isoformat()
+        if out["status"] != "pending":
+            out["next_attempt_at"] = None
+        return out
@@ -0,0 +1,350 @@
+"""Durable outbox for certificate emails.
+
+Issuance enqueues a message and returns straight away; a small set of worker
+threads drains the outbox with bounded concurrency. Failed sends are retried
+with exponential backoff (with jitter) and dead-lettered after
+``max_attempts``. Messages live in Postgres when a database is configured, so
+work left behind by a frozen or recycled serverless instance is picked up by
+the next one; otherwise (or if the insert fails) they live in memory.
+
+Statuses: ``pending`` (queued or waiting for a retry), ``sending`` (claimed by
+a worker), ``sent`` and ``dead`` (gave up; ``last_error`` says why).
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str, dict], tuple[bool, str]]
+
+
+class OutboxStore(Protocol):
+    def add(self, msg_id: str, kind: str, to_email: str, params: dict, max_attempts: int) -> None: ...
+    def add_many(self, rows: list[tuple[str, str, str, dict]], max_attempts: int) -> None: ...
+    def claim(self, lease_sec: float) -> dict | None: ...
+    def mark_sent(self, msg_id: str) -> None: ...
+    def mark_retry(self, msg_id: str, delay_sec: float, error: str) -> None: ...
+    def mark_dead(self, msg_id: str, error: str) -> None: ...
+    def get(self, msg_id: str) -> dict | None: ...
+
+
+def _iso(ts: float | None) -> str | None:
+    return datetime.fromtimestamp(ts, tz=UTC).isoformat() if ts else None
+
+
+class MemoryOutboxStore:
+    """Process-local store; used without a database or when the DB insert fails."""
+
+    MAX_FINISHED = 10000
+
+    def __init__(self) -> None:
+        self._rows: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, msg_id: str, kind: str, to_email: str, params: dict, max_attempts: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._rows[msg_id] = {
+                "id": msg_id,
+                "kind": kind,
+                "to_email": to_email,
+                "params": params,
+                "status": "pending",
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "last_error": "",
+                "next_attempt_at": now,
+                "locked_until": 0.0,
+                "created_at": now,
+                "sent_at": None,
+            }
+            self._prune_locked()
+
+    def add_many(self, rows: list[tuple[str, str, str, dict]], max_attempts: int) -> None:
+        for msg_id, kind, to_email, params in rows:
+            self.add(msg_id, kind, to_email, params, max_attempts)
+
+    def _prune_locked(self) -> None:
+        finished = [r for r in self._rows.values() if r["status"] in ("sent", "dead")]
+        if len(finished) <= self.MAX_FINISHED:
+            return
+        finished.sort(key=lambda r: r["created_at"])
+        for r in finished[: len(finished) - self.MAX_FINISHED]:
+            self._rows.pop(r["id"], None)
+
+    def claim(self, lease_sec: float) -> dict | None:
+        now = time.time()
+        with self._lock:
+            due = [
+                r for r in self._rows.values()
+                if r["status"] in ("pending", "sending")
+                and r["next_attempt_at"] <= now
+                and r["locked_until"] < now
+            ]
+            if not due:
+                return None
+            row = min(due, key=lambda r: r["next_attempt_at"])
+            row["status"] = "sending"
+            row["attempts"] += 1
+            row["locked_until"] = now + lease_sec
+            return dict(row)
+
+    def next_due_in(self) -> float | None:
+        """Seconds until the earliest pending message is due (None if nothing is queued)."""
+        now = time.time()
+        with self._lock:
+            times = [
+                max(r["next_attempt_at"], r["locked_until"])
+                for r in self._rows.values()
+                if r["status"] in ("pending", "sending")
+            ]
+        return max(0.0, min(times) - now) if times else None
+
+    def mark_sent(self, msg_id: str) -> None:
+        with self._lock:
+            row = self._rows.get(msg_id)
+            if row:
+                row.update(status="sent", sent_at=time.time(), last_error="", locked_until=0.0)
+
+    def mark_retry(self, msg_id: str, delay_sec: float, error: str) -> None:
+        with self._lock:
+            row = self._rows.get(msg_id)
+            if row:
+                row.update(
+                    status="pending",
+                    last_error=error,
+                    next_attempt_at=time.time() + delay_sec,
+                    locked_until=0.0,
+                )
+
+    def mark_dead(self, msg_id: str, error: str) -> None:
+        with self._lock:
+            row = self._rows.get(msg_id)
+            if row:
+                row.update(status="dead", last_error=error, locked_until=0.0)
+
+    def get(self, msg_id: str) -> dict | None:
+        with self._lock:
+            row = self._rows.get(msg_id)
+            if row is None:
+                return None
+            return {
+                "id": row["id"],
+                "status": row["status"],
+                "attempts": row["attempts"],
+                "max_attempts": row["max_attempts"],
+                "last_error": row["last_error"],
+                "created_at": _iso(row["created_at"]),
+                "sent_at": _iso(row["sent_at"]),
+                "next_attempt_at": _iso(row["next_attempt_at"]) if row["status"] == "pending" else None,
+            }
+
+
+class PostgresOutboxStore:
+    """Outbox rows in the ``email_outbox`` table (SQL lives in api/db.py)."""
+
+    def __init__(self, db_module) -> None:
+        self._db = db_module
+
+    def add(self, msg_id: str, kind: str, to_email: str, params: dict, max_attempts: int) -> None:
+        self._db.outbox_add(msg_id, kind, to_email, params, max_attempts)
+
+    def add_many(self, rows: list[tuple[str, str, str, dict]], max_attempts: int) -> None:
+        self._db.outbox_add_many(rows, max_attempts)
+
+    def claim(self, lease_sec: float) -> dict | None:
+        return self._db.outbox_claim(lease_sec)
+
+    def mark_sent(self, msg_id: str) -> None:
+        self._db.outbox_mark_sent(msg_id)
+
+    def mark_retry(self, msg_id: str, delay_sec: float, error: str) -> None:
+        self._db.outbox_mark_retry(msg_id, delay_sec, error)
+
+    def mark_dead(self, msg_id: str, error: str) -> None:
+        self._db.outbox_mark_dead(msg_id, error)
+
+    def get(self, msg_id: str) -> dict | None:
+        return self._db.outbox_get(msg_id)
+
+
+class EmailOutbox:
+    """Queue of outgoing emails drained by ``workers`` background threads.
+
+    ``deliver(kind, to_email, params)`` performs one send and returns
+    ``(ok, error)``; raising counts as a failed attempt.
+    """
+
+    def __init__(
+        self,
+        deliver: Deliver,
+        *,
+        store: OutboxStore | None = None,
+        workers: int = 4,
+        max_attempts: int = 5,
+        base_delay: float = 10.0,
+        max_delay: float = 900.0,
+        lease_sec: float = 120.0,
+        poll_interval: float = 15.0,
+    ) -> None:
+        self.deliver = deliver
+        self.store = store
+        self.memory = MemoryOutboxStore()
+        self.workers = max(1, int(workers))
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_sec = lease_sec
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stop = False
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+
+    # ── producer side ─────────────────────────────────────────────────
+
+    def enqueue(self, kind: str, to_email: str, params: dict) -> str:
+        msg_id = str(uuid.uuid4())
+        stored = False
+        if self.store is not None:
+            try:
+                self.store.add(msg_id, kind, to_email, params, self.max_attempts)
+                stored = True
+            except Exception as e:  # noqa: BLE001 - any store failure falls back to memory
+                logger.warning(f"Email outbox insert failed, queueing in memory: {e}")
+        if not stored:
+            self.memory.add(msg_id, kind, to_email, params, self.max_attempts)
+        self.start()
+        self._wake.set()
+        return msg_id
+
+    def enqueue_many(self, messages: list[tuple[str, str, dict]]) -> list[str]:
+        """Queue (kind, to_email, params) messages with a single store write; returns their ids."""
+        rows = [(str(uuid.uuid4()), kind, to_email, params) for kind, to_email, params in messages]
+        if not rows:
+            return []
+        stored = False
+        if self.store is not None:
+            try:
+                self.store.add_many(rows, self.max_attempts)
+                stored = True
+            except Exception as e:  # noqa: BLE001 - any store failure falls back to memory
+                logger.warning(f"Email outbox batch insert failed, queueing {len(rows)} in memory: {e}")
+        if not stored:
+            self.memory.add_many(rows, self.max_attempts)
+        self.start()
+        self._wake.set()
+        return [row[0] for row in rows]
+
+    def status(self, msg_id: str) -> dict | None:
+        row = self.memory.get(msg_id)
+        if row is None and self.store is not None:
+            try:
+                row = self.store.get(msg_id)
+            except Exception as e:  # noqa: BLE001 - a failed lookup reads as not found
+                logger.warning(f"Email outbox lookup failed: {e}")
+        if row is not None and row["status"] in ("pending", "sending"):
+            # A poll on a fresh instance is a good moment to drain leftovers.
+            self.start()
+            self._wake.set()
+        return row
+
+    # ── workers ───────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if len(self._threads) >= self.workers:
+            return
+        with self._lock:
+            while len(self._threads) < self.workers and not self._stop:
+                t = threading.Thread(
+                    target=self._run,
+                    daemon=True,
+                    name=f"email-outbox-{len(self._threads)}",
+                )
+                t.start()
+                self._threads.append(t)
+
+    def stop(self) -> None:
+        self._stop = True
+        self._wake.set()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry ``attempts + 1``: exponential, capped, with full jitter on the upper half."""
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _claim(self) -> tuple[OutboxStore, dict] | None:
+        msg = self.memory.claim(self.lease_sec)
+        if msg is not None:
+            return self.memory, msg
+        if self.store is not None:
+            try:
+                msg = self.store.claim(self.lease_sec)
+            except Exception as e:  # noqa: BLE001 - a failed claim is retried on the next poll
+                logger.warning(f"Email outbox claim failed: {e}")
+                return None
+            if msg is not None:
+                return self.store, msg
+        return None
+
+    def process_one(self) -> bool:
+        """Claim and attempt one due message. Returns False when nothing was due."""
+        claimed = self._claim()
+        if claimed is None:
+            return False
+        store, msg = claimed
+        try:
+            ok, err = self.deliver(msg["kind"], msg["to_email"], msg["params"])
+        except Exception as e:  # noqa: BLE001 - any delivery error is a retryable failure
+            ok, err = False, str(e) or e.__class__.__name__
+        try:
+            if ok:
+                store.mark_sent(msg["id"])
+                self.sent += 1
+            elif msg["attempts"] >= msg["max_attempts"]:
+                store.mark_dead(msg["id"], err)
+                self.dead += 1
+                logger.warning(f"Email {msg['id']} dead-lettered after {msg['attempts']} attempts: {err}")
+            else:
+                store.mark_retry(msg["id"], self.backoff(msg["attempts"]), err)
+                self.retried += 1
+        except Exception as e:  # noqa: BLE001 - the lease expiring is the recovery path
+            # The lease expires and another worker retries; nothing else to do.
+            logger.warning(f"Email outbox update failed for {msg['id']}: {e}")
+        return True
+
+    def _idle_wait(self) -> float:
+        wait = self.poll_interval if self.store is not None else 3600.0
+        due = self.memory.next_due_in()
+        return min(wait, due) if due is not None else wait
+
+    def _run(self) -> None:
+        while not self._stop:
+            try:
+                if self.process_one():
+                    continue
+            except Exception as e:  # pragma: no cover - keep the worker alive  # noqa: BLE001
+                logger.warning(f"Email outbox worker error: {e}")
+            self._wake.wait(self._idle_wait())
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "postgres" if self.store is not None else "memory",
+            "workers": len(self._threads),
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
@@ -0,0 +1,127 @@
+"""Idempotency keys for create endpoints.
+
+A request that carries an idempotency key first *acquires* it. The winner does
+the work and *completes* the key with its response; a concurrent duplicate
+fails to acquire and waits for that response instead of issuing a second
+certificate. On failure the winner *releases* the key so a retry can run.
+
+Completed responses sit in a bounded in-memory LRU in front of an
+``idempotency_keys`` table (SQL in api/db.py), so a retry that lands on
+another instance or after a cold start still gets the original response.
+Pending claims carry a lease, so a crashed request does not hold its key for
+longer than ``lock_ttl`` seconds. Without a database (or while it is
+unreachable) keys are only deduplicated within the instance.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def idempotency_hash(scope: str, key: str) -> str:
+    """Fixed-length storage key; scoped so a key reused on another endpoint does not collide."""
+    return hashlib.sha256(f"{scope}:{key}".encode()).hexdigest()
+
+
+class IdempotencyStore:
+    PRUNE_PROBABILITY = 0.01
+
+    def __init__(
+        self,
+        db_module=None,
+        *,
+        ttl: float = 3600.0,
+        lock_ttl: float = 60.0,
+        max_entries: int = 10000,
+    ) -> None:
+        self.db = db_module
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.max_entries = max(1, int(max_entries))
+        self._done: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, response: dict) -> None:
+        with self._lock:
+            self._done[key] = (time.monotonic() + self.ttl, response)
+            self._done.move_to_end(key)
+            while len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+
+    def get(self, key: str) -> dict | None:
+        """The completed response for ``key``, if any."""
+        with self._lock:
+            entry = self._done.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._done.move_to_end(key)
+                    return entry[1]
+                del self._done[key]
+        if self.db is None:
+            return None
+        try:
+            response = self.db.idempotency_get(key)
+        except Exception as e:  # noqa: BLE001 - degrade to no replay
+            logger.warning(f"Idempotency lookup failed: {e}")
+            return None
+        if response is not None:
+            self._remember(key, response)
+        return response
+
+    def acquire(self, key: str) -> bool:
+        """Claim ``key`` for this request. False if another request holds it or already completed it."""
+        with self._lock:
+            entry = self._done.get(key)
+            if key in self._inflight or (entry is not None and entry[0] > time.monotonic()):
+                return False
+            self._inflight.add(key)
+        if self.db is None:
+            return True
+        try:
+            if self.db.idempotency_acquire(key, self.lock_ttl, self.ttl):
+                return True
+        except Exception as e:  # noqa: BLE001 - degrade to local deduplication
+            logger.warning(f"Idempotency claim failed, deduplicating locally only: {e}")
+            return True
+        with self._lock:
+            self._inflight.discard(key)
+        return False
+
+    def complete(self, key: str, response: dict) -> None:
+        self._remember(key, response)
+        try:
+            if self.db is not None:
+                self.db.idempotency_complete(key, response, self.ttl)
+                if random.random() < self.PRUNE_PROBABILITY:
+                    self.db.idempotency_prune()
+        except Exception as e:  # noqa: BLE001 - degrade to the in-memory copy
+            logger.warning(f"Idempotency store failed (kept in memory): {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def release(self, key: str) -> None:
+        try:
+            if self.db is not None:
+                self.db.idempotency_release(key)
+        except Exception as e:  # noqa: BLE001 - the lease expires on its own
+            logger.warning(f"Idempotency release failed (lease expires on its own): {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "postgres" if self.db is not None else "memory",
+                "cached": len(self._done),
+                "in_flight": len(self._inflight),
+            }
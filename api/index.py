@@ -8,9 +8,8 @@ so no database is needed and certificates are permanent and tamper-proof.
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import Response, HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel, model_validator
-from xhtml2pdf import pisa
 from io import BytesIO
 import logging
 import hashlib
@@ -20,7 +19,6 @@ import os
 import base64
 import time
 import math
-from collections import defaultdict
 from urllib.parse import urlencode
 from typing import Literal
 import html as html_mod
@@ -51,6 +49,16 @@ from api.certificate_templates import (
     VIEWER_INTERNSHIP_HTML,
 )
 from api.invoice_brand import invoice_brand_colors
+from api.pdf_cache import PdfCache, pdf_cache_key
+from api.render_pool import RenderPool
+from api.email_outbox import EmailOutbox, PostgresOutboxStore
+from api.bulk_jobs import BulkJob, BulkJobRegistry
+from api.rate_limit import MemoryRateLimiter, PostgresRateLimiter
+from api.idempotency import IdempotencyStore, idempotency_hash
+from api.webhooks import WebhookDispatcher
+from api.tokens import TokenCodec, parse_keys as parse_token_keys
+from api.short_links import ShortLinkStore, normalize_certificate_id, short_url
+from api.revocation import RevocationSet
 from api.invoice_utils import (
     amount_in_words_inr,
     build_invoice_pdf,
@@ -63,12 +71,12 @@ from api.invoice_utils import (
 )
 
 import uuid as uuid_mod
+import asyncio
+import functools
 import threading
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-import qrcode
-from qrcode.image.pil import PilImage
-import httpx
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -76,24 +84,36 @@ logger = logging.getLogger(__name__)
 DB_AVAILABLE = bool(os.environ.get("DATABASE_URL", ""))
 db = None
 _db_ready = False
+_db_init_lock = threading.Lock()
 if DB_AVAILABLE:
     from api import db as _db_mod
     db = _db_mod
 
 
 def _ensure_db_ready() -> bool:
-    """Lazy DB init so cold starts and requests are not blocked at import time."""
+    """Lazy DB init so cold starts and requests are not blocked at import time.
+
+    Concurrent first requests share one migration check (usually a single
+    SELECT on schema_version); db.init_schema serializes across instances.
+    """
     global DB_AVAILABLE, db, _db_ready
     if not DB_AVAILABLE or _db_ready:
         return DB_AVAILABLE
-    try:
-        db.init_schema()
-        _db_ready = True
-        logger.info("Database connected and schema initialized")
-    except Exception as e:
-        logger.warning(f"Database initialization failed, running without DB: {e}")
-        DB_AVAILABLE = False
-        db = None
+    with _db_init_lock:
+        if not DB_AVAILABLE or _db_ready:
+            return DB_AVAILABLE
+        try:
+            applied = db.init_schema()
+            _db_ready = True
+            logger.info(f"Database connected ({applied} migrations applied)")
+        except db.DatabaseUnavailable as e:
+            # Transient outage: stay configured and retry once the breaker lets a probe through.
+            logger.warning(f"Database unreachable, serving degraded: {e}")
+            return False
+        except Exception as e:
+            logger.warning(f"Database initialization failed, running without DB: {e}")
+            DB_AVAILABLE = False
+            db = None
     return DB_AVAILABLE
 
 # ---------------------------------------------------------------------------
@@ -110,9 +130,27 @@ def _sanitize_env(value: str) -> str:
     return v
 
 
+def _env_int(name: str, default: int) -> int:
+    """Integer env var with a safe fallback for blank or malformed values."""
+    raw = _sanitize_env(os.environ.get(name, ""))
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"Ignoring non-integer {name}={raw!r}; using {default}")
+        return default
+
+
 IS_PROD = os.environ.get("VERCEL_ENV") == "production" or os.environ.get("ENV") == "production"
 CERT_SECRET = _sanitize_env(os.environ.get("CERT_SECRET_KEY", ""))
-if not CERT_SECRET:
+# Key rotation: "kid:secret,kid:secret". The first key signs new tokens (which
+# then carry its id); CERT_SECRET_KEY keeps verifying tokens issued without one.
+try:
+    CERT_SECRET_KEYS = parse_token_keys(_sanitize_env(os.environ.get("CERT_SECRET_KEYS", "")))
+except ValueError as e:
+    raise RuntimeError(f"CERT_SECRET_KEYS: {e}") from e
+if not CERT_SECRET and not CERT_SECRET_KEYS:
     if IS_PROD:
         raise RuntimeError("CERT_SECRET_KEY environment variable is required in production")
     CERT_SECRET = "pdfcert-dev-secret-local-only"
@@ -132,86 +170,139 @@ AGENTMAIL_INBOX_ID = _sanitize_env(
     os.environ.get("AGENTMAIL_INBOX_ID", "support@intelliforge.tech")
 ) or "support@intelliforge.tech"
 _agentmail_client = None
+_agentmail_init_failed = False
+_agentmail_client_lock = threading.Lock()
 _agentmail_ready = False
 _agentmail_inbox_cached: str = ""
 _agentmail_inbox_lock = threading.Lock()
-EMAIL_SEND_TIMEOUT_SEC = 20.0
 AGENTMAIL_HTTP_TIMEOUT_SEC = 10.0
-_email_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cert-email")
-if AGENTMAIL_API_KEY:
-    try:
-        from agentmail import AgentMail as AgentMailClient
 
-        _agentmail_client = AgentMailClient(
-            api_key=AGENTMAIL_API_KEY,
-            timeout=AGENTMAIL_HTTP_TIMEOUT_SEC,
-        )
-        logger.info("AgentMail client configured (inbox warm-up in background)")
-    except Exception as e:
-        logger.warning(f"AgentMail initialization failed: {e}")
 
 
+# ---------------------------------------------------------------------------
+# Database offload. api/db.py is synchronous psycopg2, so async handlers await
+# DB work on a dedicated thread pool instead of blocking the event loop for a
+# full Neon round trip. The pool is no larger than the connection pool (extra
+# threads would only queue on checkout), which also bounds DB concurrency.
+# ---------------------------------------------------------------------------
+
+DB_EXECUTOR_WORKERS = _env_int("DB_EXECUTOR_WORKERS", 0)  # 0 = match DB_POOL_MAX
+_db_executor: ThreadPoolExecutor | None = None
+_db_executor_lock = threading.Lock()
+
+
+def _get_db_executor() -> ThreadPoolExecutor:
+    global _db_executor
+    if _db_executor is None:
+        with _db_executor_lock:
+            if _db_executor is None:
+                workers = DB_EXECUTOR_WORKERS or (db.DB_POOL_MAX if db else 4)
+                _db_executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="db")
+    return _db_executor
+
+
+async def _run_db(fn, *args, **kwargs):
+    """Await ``fn(*args, **kwargs)`` on the DB thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_db_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def _ensure_db_ready_async() -> bool:
+    """_ensure_db_ready for async handlers; the one-off schema init runs off the loop."""
+    if not DB_AVAILABLE or _db_ready:
+        return DB_AVAILABLE
+    return await _run_db(_ensure_db_ready)
+
 
 # ---------------------------------------------------------------------------
-# Rate limiter (in-memory, per-IP, resets on cold start)
+# Rate limiter (sliding window). Requests with a valid X-API-Key are limited
+# per key at RATE_LIMIT_API_KEY; everything else per client IP at RATE_LIMIT.
+# RATE_LIMIT_BACKEND=postgres shares the counters across instances.
 # ---------------------------------------------------------------------------
-_rate_buckets: dict[str, list[float]] = defaultdict(list)
-RATE_LIMIT = 10
-RATE_WINDOW = 60
-
-
-def _check_rate_limit(client_ip: str) -> tuple[bool, dict[str, str]]:
-    """Return (allowed, rate-limit headers) for the client IP."""
-    now = time.time()
-    bucket = _rate_buckets[client_ip]
-    _rate_buckets[client_ip] = [t for t in bucket if now - t < RATE_WINDOW]
-    bucket = _rate_buckets[client_ip]
-
-    def _reset_seconds(ts_list: list[float]) -> int:
-        if not ts_list:
-            return int(RATE_WINDOW)
-        oldest = min(ts_list)
-        return max(1, int(math.ceil(RATE_WINDOW - (now - oldest))))
-
-    if len(bucket) >= RATE_LIMIT:
-        return False, {
-            "X-RateLimit-Limit": str(RATE_LIMIT),
-            "X-RateLimit-Remaining": "0",
-            "X-RateLimit-Reset": str(_reset_seconds(bucket)),
-        }
+RATE_LIMIT = _env_int("RATE_LIMIT", 10)
+RATE_LIMIT_API_KEY = _env_int("RATE_LIMIT_API_KEY", 60)
+RATE_WINDOW = _env_int("RATE_WINDOW", 60)
+RATE_LIMIT_MAX_KEYS = _env_int("RATE_LIMIT_MAX_KEYS", 10000)
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory").strip().lower()
+
+_local_rate_limiter = MemoryRateLimiter(RATE_WINDOW, max_keys=RATE_LIMIT_MAX_KEYS)
+_rate_limiter: MemoryRateLimiter | PostgresRateLimiter = _local_rate_limiter
+if RATE_LIMIT_BACKEND == "postgres":
+    if db is not None:
+        _rate_limiter = PostgresRateLimiter(db, RATE_WINDOW, fallback=_local_rate_limiter)
+    else:
+        logger.warning("RATE_LIMIT_BACKEND=postgres needs DATABASE_URL; using in-memory rate limits")
+
 
-    _rate_buckets[client_ip].append(now)
-    nb = _rate_buckets[client_ip]
-    remaining = RATE_LIMIT - len(nb)
-    return True, {
-        "X-RateLimit-Limit": str(RATE_LIMIT),
-        "X-RateLimit-Remaining": str(max(0, remaining)),
-        "X-RateLimit-Reset": str(_reset_seconds(nb)),
+def _rate_limit_key(client_ip: str, api_key: str = "") -> tuple[str, int]:
+    if api_key and api_key in CERT_API_KEYS:
+        # Never store the key itself.
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:32], RATE_LIMIT_API_KEY
+    return "ip:" + client_ip, RATE_LIMIT
+
+
+async def _check_rate_limit(client_ip: str, api_key: str = "") -> tuple[bool, dict[str, str]]:
+    """Return (allowed, rate-limit headers) for the API key if valid, else the client IP."""
+    key, limit = _rate_limit_key(client_ip, api_key)
+    if isinstance(_rate_limiter, PostgresRateLimiter) and await _ensure_db_ready_async():
+        allowed, limit, remaining, reset = await _run_db(_rate_limiter.hit, key, limit)
+    else:
+        allowed, limit, remaining, reset = _local_rate_limiter.hit(key, limit)
+    headers = {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
     }
+    if not allowed:
+        headers["Retry-After"] = str(reset)
+    return allowed, headers
 
 
 # ---------------------------------------------------------------------------
-# Idempotency cache (in-memory, TTL 1 hour, resets on cold start)
+# Idempotency keys (TTL 1 hour). Shared through Postgres when configured, with
+# an in-memory LRU in front; concurrent duplicates wait for the first response.
 # ---------------------------------------------------------------------------
-_idempotency_cache: dict[str, dict] = {}
-_IDEMPOTENCY_TTL = 3600
+IDEMPOTENCY_TTL = _env_int("IDEMPOTENCY_TTL", 3600)
+IDEMPOTENCY_WAIT_SEC = _env_int("IDEMPOTENCY_WAIT_SEC", 10)
+_idempotency = IdempotencyStore(db, ttl=IDEMPOTENCY_TTL)
+
+
+async def _idempotency_call(fn, *args):
+    if _idempotency.db is None:
+        return fn(*args)
+    await _ensure_db_ready_async()
+    return await _run_db(fn, *args)
+
+
+async def _check_idempotency(scope: str, key: str) -> dict | None:
+    """Return the stored response for a repeated key, or None once this request owns the key.
+
+    The owner must call _store_idempotency or _release_idempotency. A duplicate
+    that arrives while the owner is still working waits up to
+    IDEMPOTENCY_WAIT_SEC for its response, then gets 409.
+    """
+    hashed = idempotency_hash(scope, key)
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SEC
+    while True:
+        cached = await _idempotency_call(_idempotency.get, hashed)
+        if cached is not None:
+            return cached
+        if await _idempotency_call(_idempotency.acquire, hashed):
+            return None
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this idempotency_key is still in progress",
+            )
+        await asyncio.sleep(0.2)
 
 
-def _check_idempotency(key: str) -> dict | None:
-    """Return cached response if key exists and hasn't expired."""
-    entry = _idempotency_cache.get(key)
-    if entry and time.time() - entry["ts"] < _IDEMPOTENCY_TTL:
-        return entry["response"]
-    return None
+async def _store_idempotency(scope: str, key: str, response: dict):
+    await _idempotency_call(_idempotency.complete, idempotency_hash(scope, key), response)
 
 
-def _store_idempotency(key: str, response: dict):
-    _idempotency_cache[key] = {"response": response, "ts": time.time()}
-    if len(_idempotency_cache) > 10000:
-        cutoff = time.time() - _IDEMPOTENCY_TTL
-        expired = [k for k, v in _idempotency_cache.items() if v["ts"] < cutoff]
-        for k in expired:
-            _idempotency_cache.pop(k, None)
+async def _release_idempotency(scope: str, key: str):
+    await _idempotency_call(_idempotency.release, idempotency_hash(scope, key))
 
 
 # ---------------------------------------------------------------------------
@@ -229,16 +320,24 @@ def _is_browser_same_origin(req: Request) -> bool:
     return False
 
 
-def _fire_webhook(callback_url: str, payload: dict):
-    """POST payload to callback_url in a background thread. Best-effort."""
-    def _do():
-        try:
-            with httpx.Client(timeout=10) as client:
-                client.post(callback_url, json=payload)
-            logger.info(f"Webhook delivered to {callback_url}")
-        except Exception as e:
-            logger.warning(f"Webhook delivery failed to {callback_url}: {e}")
-    threading.Thread(target=_do, daemon=True).start()
+# Callbacks go through a shared dispatcher (pooled connections, per-host
+# concurrency cap, retries with backoff). Set WEBHOOK_SIGNING_SECRET to sign
+# payloads; receivers verify X-Webhook-Signature (see examples/webhook_receiver.py).
+WEBHOOK_SIGNING_SECRET = _sanitize_env(os.environ.get("WEBHOOK_SIGNING_SECRET", ""))
+WEBHOOK_WORKERS = _env_int("WEBHOOK_WORKERS", 4)
+WEBHOOK_PER_HOST = _env_int("WEBHOOK_PER_HOST", 2)
+WEBHOOK_MAX_ATTEMPTS = _env_int("WEBHOOK_MAX_ATTEMPTS", 5)
+_webhooks = WebhookDispatcher(
+    secret=WEBHOOK_SIGNING_SECRET,
+    workers=WEBHOOK_WORKERS,
+    per_host=WEBHOOK_PER_HOST,
+    max_attempts=WEBHOOK_MAX_ATTEMPTS,
+)
+
+
+def _fire_webhook(callback_url: str, event: str, data) -> None:
+    """Queue a callback; delivery (and any retries) happens in the background."""
+    _webhooks.send(callback_url, event, data)
 
 
 API_TAGS = [
@@ -323,44 +422,115 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(**kwargs)
 
 
+async def database_unavailable_handler(request: Request, exc: Exception):
+    """503 with Retry-After when the DB is down (including while its circuit breaker is open)."""
+    retry_after = getattr(exc.__cause__, "retry_after", None) or db.DB_BREAKER_RESET_SEC
+    return await http_exception_handler(
+        request,
+        HTTPException(
+            status_code=503,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        ),
+    )
+
+
+if db is not None:
+    app.add_exception_handler(db.DatabaseUnavailable, database_unavailable_handler)
+
+
 # ---------------------------------------------------------------------------
 # Stateless certificate tokens (HMAC-SHA256 signed, no database required)
 # ---------------------------------------------------------------------------
 
 
+# CERT_TOKEN_FORMAT=json keeps issuing the original base64-JSON tokens; both
+# formats are always accepted.
+CERT_TOKEN_FORMAT = os.environ.get("CERT_TOKEN_FORMAT", "binary").strip().lower()
+
+_token_codec = TokenCodec(
+    legacy_secret=CERT_SECRET,
+    keys=CERT_SECRET_KEYS,
+    cache_size=_env_int("TOKEN_CACHE_SIZE", 4096),
+    binary=CERT_TOKEN_FORMAT != "json",
+)
+
+
 def _encode_cert(data: dict) -> str:
     """Encode certificate data into a URL-safe token with full HMAC-SHA256 signature."""
-    compact = json.dumps(data, separators=(",", ":"), sort_keys=True)
-    payload = base64.urlsafe_b64encode(compact.encode()).decode().rstrip("=")
-    sig = hmac_mod.new(CERT_SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
-    return f"{payload}.{sig}"
+    return _token_codec.encode(data)
 
 
 def _decode_cert(token: str) -> dict | None:
     """Decode and verify a certificate token. Returns None if invalid/tampered."""
-    if "." not in token:
-        return None
-    payload, sig = token.rsplit(".", 1)
-    expected = hmac_mod.new(CERT_SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
-    if not hmac_mod.compare_digest(sig, expected):
-        return None
-    try:
-        padded = payload + "=" * (-len(payload) % 4)
-        raw = base64.urlsafe_b64decode(padded).decode()
-        return json.loads(raw)
-    except Exception:
-        return None
+    return _token_codec.decode(token)
 
 
 def _cert_id(data: dict) -> str:
-    """Generate a short deterministic certificate ID for display."""
-    if data.get("k") in ("i", "a"):
+    """Generate a short deterministic certificate ID for display.
+
+    Participation IDs hash only name, course and date; payloads marked with
+    ``x`` (see _with_unique_cert_id) hash the whole payload like the other kinds.
+    """
+    if data.get("k") in ("i", "a") or "x" in data:
         raw = json.dumps(data, separators=(",", ":"), sort_keys=True)
     else:
         raw = f"{data['n']}-{data['c']}-{data['d']}"
     return "CERT-" + hashlib.sha256(raw.encode()).hexdigest()[:12].upper()
 
 
+def _with_unique_cert_id(data: dict) -> tuple[dict, str, str]:
+    """(data, token, certificate ID) re-signed so the ID covers the whole payload.
+
+    Used when a participation certificate's name/course/date ID is already held
+    by a different certificate (e.g. the same person under another instructor).
+    """
+    data = {**data, "x": "1"}
+    return data, _encode_cert(data), _cert_id(data)
+
+
+# ---------------------------------------------------------------------------
+# Short links (SHORT_LINKS=1, needs DATABASE_URL). /c/<certificate_id> redirects
+# to the full token URL, and QR codes encode the short, upper-case form.
+# ---------------------------------------------------------------------------
+SHORT_LINKS = os.environ.get("SHORT_LINKS", "").strip().lower() in ("1", "true", "yes")
+_short_links = (
+    ShortLinkStore(db, cache_size=_env_int("SHORT_LINK_CACHE_SIZE", 10000))
+    if SHORT_LINKS and db is not None
+    else None
+)
+
+
+def _create_short_links(links: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """Store (certificate_id, token) links; returns the pairs that are linked. Never raises."""
+    if _short_links is None or not links or not _ensure_db_ready():
+        return set()
+    try:
+        return _short_links.create_many(links)
+    except Exception as e:  # noqa: BLE001 - short links are optional
+        logger.warning(f"Short link store failed (long URLs still work): {e}")
+        return set()
+
+
+def _short_url_for(base_url: str, data: dict, token: str) -> str | None:
+    """Short URL for this token if one was issued, else None."""
+    if _short_links is None or not _ensure_db_ready():
+        return None
+    cert_id = _cert_id(data)
+    try:
+        linked = _short_links.resolve(cert_id) == token
+    except Exception as e:  # noqa: BLE001 - short links are optional
+        logger.warning(f"Short link lookup failed: {e}")
+        return None
+    return short_url(base_url, cert_id) if linked else None
+
+
+def _short_links_variant() -> str:
+    """ETag component for the QR target. A token's short link is fixed at issuance,
+    so the flag (not the looked-up URL) is enough and 304s need no DB lookup."""
+    return "short" if _short_links is not None else ""
+
+
 def _is_internship_payload(data: dict) -> bool:
     return data.get("k") == "i"
 
@@ -384,35 +554,70 @@ def _institution_clause_for_pdf(inst: str) -> str:
     return f"who is enrolled at <strong>{html_mod.escape(t)}</strong>, "
 
 
-def _certificate_is_revoked(token: str) -> bool:
-    """True if the token exists in the DB and is revoked. False if not revoked or not in DB."""
-    if not _ensure_db_ready() or not db:
-        return False
+# ---------------------------------------------------------------------------
+# Revocation checks against an in-memory set of revoked token-hash prefixes.
+# The common "not revoked" answer needs no DB call; the set picks up new
+# revocations within REVOCATION_REFRESH_SEC (immediately after a local revoke).
+# ---------------------------------------------------------------------------
+REVOCATION_REFRESH_SEC = _env_int("REVOCATION_REFRESH_SEC", 30)
+_revocations = RevocationSet(db, refresh_interval=REVOCATION_REFRESH_SEC) if db is not None else None
+
+
+async def _sync_revocations() -> None:
+    """Refresh the revocation set when its interval has passed (one point read if nothing changed)."""
+    if _revocations is not None and _revocations.refresh_due() and await _ensure_db_ready_async():
+        await _run_db(_revocations.refresh)
+
+
+def _revocation_epoch() -> int:
+    return _revocations.epoch if _revocations is not None else 0
+
+
+def _bump_revocation_epoch() -> None:
+    """Called after a revoke on this instance so the next request sees it."""
+    if _revocations is not None:
+        _revocations.mark_stale()
+
+
+async def _revoked_tokens(tokens: list[str]) -> set[str]:
+    """Tokens among ``tokens`` that are revoked. Only prefix hits are confirmed in the DB."""
+    if not tokens or _revocations is None or not DB_AVAILABLE:
+        return set()
+    await _sync_revocations()
+    by_hash = {db.token_hash(t): t for t in tokens}
+    candidates = _revocations.candidates(by_hash)
+    if not candidates:
+        return set()
     try:
-        with db.get_db() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT revoked FROM certificates WHERE token_hash = %s",
-                (db.token_hash(token),),
-            )
-            row = cur.fetchone()
-            if row is None:
-                return False
-            return bool(row["revoked"])
+        revoked = await _run_db(db.revoked_token_hashes, candidates)
     except Exception as e:
         logger.warning(f"Revocation check failed: {e}")
-        return False
+        return set()
+    return {by_hash[h] for h in revoked}
 
 
-def _generate_qr_data_uri(url: str) -> str:
-    """Generate a QR code as a base64-encoded PNG data URI."""
+async def _certificate_is_revoked(token: str) -> bool:
+    """True if the token is stored and revoked. False if not revoked, not stored, or on DB errors."""
+    return bool(await _revoked_tokens([token]))
+
+
+def _generate_qr_png(url: str) -> bytes:
+    """Generate a QR code as PNG bytes."""
+    import qrcode
+    from qrcode.image.pil import PilImage
+
     qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=4, border=2)
     qr.add_data(url)
     qr.make(fit=True)
     img = qr.make_image(fill_color="black", back_color="white", image_factory=PilImage)
     buf = BytesIO()
     img.save(buf, format="PNG")
-    b64 = base64.b64encode(buf.getvalue()).decode()
+    return buf.getvalue()
+
+
+def _generate_qr_data_uri(url: str) -> str:
+    """Generate a QR code as a base64-encoded PNG data URI."""
+    b64 = base64.b64encode(_generate_qr_png(url)).decode()
     return f"data:image/png;base64,{b64}"
 
 
@@ -530,6 +735,11 @@ def _generate_signature_data_uri(name: str | None = None) -> str:
     return data_uri
 
 
+def _signature_png(name: str | None = None) -> bytes:
+    """Signature PNG bytes for renderers that take raw images (canvas engine)."""
+    return base64.b64decode(_generate_signature_data_uri(name).split(",", 1)[1])
+
+
 def certificate_branding() -> dict:
     """Branding shown on certificates, viewer pages, and the UI (via /api/info)."""
     return {
@@ -1097,6 +1307,17 @@ async def root():
     }
 
 
+def _database_health() -> str:
+    if not DB_AVAILABLE or not db:
+        return "not_configured"
+    state = db.breaker_state()
+    if state == "open":
+        return "unavailable"
+    if state == "half_open":
+        return "recovering"
+    return "connected"
+
+
 @app.get("/api/health", tags=["System"])
 async def health_check():
     """Health check. Returns 200 if the service is running."""
@@ -1105,9 +1326,19 @@ async def health_check():
         "service": "pdf-cert-generator-api",
         "version": "2.0.0",
         "dependencies": {
-            "database": "connected" if DB_AVAILABLE else "not_configured",
-            "email": "ready" if _agentmail_ready else ("configured" if _agentmail_client else "not_configured"),
+            "database": _database_health(),
+            "email": "ready" if _agentmail_ready else ("configured" if AGENTMAIL_API_KEY else "not_configured"),
         },
+        "pdf_render": _render_pool.stats(),
+        "db_pool": db.pool_stats() if db else None,
+        "db_circuit": db.breaker_stats() if db else None,
+        "email_outbox": _email_outbox.stats() if _email_outbox is not None else None,
+        "bulk_jobs": _bulk_jobs.stats(),
+        "rate_limit": _rate_limiter.stats(),
+        "idempotency": _idempotency.stats(),
+        "webhooks": _webhooks.stats(),
+        "short_links": _short_links.stats() if _short_links is not None else None,
+        "revocations": _revocations.stats() if _revocations is not None else None,
     }
 
 
@@ -1160,18 +1391,78 @@ COURSES_FALLBACK = [
 ]
 
 
-def _get_course_names() -> list[str]:
-    if _ensure_db_ready() and db:
+# Active course cache. Course validation runs on every issuance, so names are
+# held in-process and trusted for COURSE_CACHE_TTL seconds. After that a single
+# version read (app_state 'courses', bumped in the same transaction as every
+# course write) decides whether to reload, so other instances pick up admin
+# changes within one TTL. Local admin writes invalidate immediately.
+COURSE_CACHE_TTL = _env_int("COURSE_CACHE_TTL", 60)
+_course_cache_names: tuple[str, ...] = ()
+_course_cache_set: frozenset[str] = frozenset()
+_course_cache_version: int | None = None
+_course_cache_checked_at = 0.0
+_course_cache_lock = threading.Lock()
+
+
+def _set_course_cache(names, version: int | None) -> None:
+    global _course_cache_names, _course_cache_set, _course_cache_version, _course_cache_checked_at
+    _course_cache_names = tuple(names)
+    _course_cache_set = frozenset(_course_cache_names)
+    _course_cache_version = version
+    _course_cache_checked_at = time.monotonic()
+
+
+def _refresh_course_cache() -> None:
+    global _course_cache_checked_at
+    if time.monotonic() - _course_cache_checked_at < COURSE_CACHE_TTL and _course_cache_names:
+        return
+    with _course_cache_lock:
+        if time.monotonic() - _course_cache_checked_at < COURSE_CACHE_TTL and _course_cache_names:
+            return
+        if not (_ensure_db_ready() and db):
+            _set_course_cache(COURSES_FALLBACK, None)
+            return
         try:
-            return db.get_active_course_names()
+            if _course_cache_version is not None and db.get_state_version("courses") == _course_cache_version:
+                _course_cache_checked_at = time.monotonic()
+                return
+            version, names = db.get_active_course_names_versioned()
+            _set_course_cache(names, version)
         except Exception as e:
-            logger.warning(f"DB course fetch failed, using fallback: {e}")
-    return COURSES_FALLBACK
+            logger.warning(f"DB course fetch failed, using {'cached' if _course_cache_names else 'fallback'} list: {e}")
+            _set_course_cache(_course_cache_names or COURSES_FALLBACK, None)
+
+
+def _invalidate_course_cache() -> None:
+    global _course_cache_checked_at, _course_cache_version
+    with _course_cache_lock:
+        _course_cache_checked_at = 0.0
+        _course_cache_version = None
+
+
+async def _refresh_course_cache_async() -> None:
+    """Refresh the course cache off the event loop when it is due for a check."""
+    if time.monotonic() - _course_cache_checked_at < COURSE_CACHE_TTL and _course_cache_names:
+        return
+    await _run_db(_refresh_course_cache)
+
+
+def _get_course_names() -> list[str]:
+    """Active course names in display order (cached)."""
+    _refresh_course_cache()
+    return list(_course_cache_names)
+
+
+def _active_course_set() -> frozenset[str]:
+    """Active course names for membership checks (cached)."""
+    _refresh_course_cache()
+    return _course_cache_set
 
 
 @app.get("/api/courses", tags=["Courses"])
 async def get_courses():
     """List all active courses available for certificate generation."""
+    await _refresh_course_cache_async()
     return {"courses": _get_course_names()}
 
 
@@ -1186,23 +1477,40 @@ async def get_courses():
 _CERT_FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "EBGaramond-SemiBold.ttf")
 _CERT_DISPLAY_FONT_FAMILY = "GaramondPDF"
 _CERT_FONT_AVAILABLE = os.path.exists(_CERT_FONT_PATH)
+_cert_font_registered = False
+_cert_font_lock = threading.Lock()
+
+
+def _ensure_cert_font() -> bool:
+    """Register the display font with ReportLab on first render (parsing the TTF
+    at import would cost every cold start, including routes that never render).
+    Returns whether the font is usable."""
+    global _CERT_FONT_AVAILABLE, _cert_font_registered
+    if _cert_font_registered or not _CERT_FONT_AVAILABLE:
+        return _CERT_FONT_AVAILABLE
+    with _cert_font_lock:
+        if not _cert_font_registered:
+            try:
+                from reportlab.pdfbase import pdfmetrics as _pdfmetrics
+                from reportlab.pdfbase.ttfonts import TTFont as _RLTTFont
+
+                _pdfmetrics.registerFont(_RLTTFont(_CERT_DISPLAY_FONT_FAMILY, _CERT_FONT_PATH))
+            except Exception as e:  # pragma: no cover - non-fatal, degrades to Helvetica
+                logger.warning("Certificate display font registration failed: %s", e)
+                _CERT_FONT_AVAILABLE = False
+            _cert_font_registered = True
+    return _CERT_FONT_AVAILABLE
 
-if _CERT_FONT_AVAILABLE:
-    try:
-        from reportlab.pdfbase import pdfmetrics as _pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont as _RLTTFont
 
-        _pdfmetrics.registerFont(_RLTTFont(_CERT_DISPLAY_FONT_FAMILY, _CERT_FONT_PATH))
-    except Exception as e:  # pragma: no cover - non-fatal, degrades to Helvetica
-        logger.warning("Certificate display font registration failed: %s", e)
-        _CERT_FONT_AVAILABLE = False
+def _cert_display_font() -> str:
+    return _CERT_DISPLAY_FONT_FAMILY if _ensure_cert_font() else "Helvetica"
 
 
 def _participation_font_face() -> str:
     """@font-face CSS registering the serif under both weights (name/brand/course
     tds carry font-weight:bold, so a normal-only face would fall back to bold
     Helvetica). Empty string when the font is unavailable."""
-    if not _CERT_FONT_AVAILABLE:
+    if not _ensure_cert_font():
         return ""
     url = _CERT_FONT_PATH.replace("\\", "/")
     return (
@@ -1218,12 +1526,77 @@ def _pdf_link_callback(uri: str, rel: str) -> str:
     base64 data: URIs used for QR codes and signatures unchanged."""
     if uri.startswith("data:"):
         return uri
-    path = uri[7:] if uri.startswith("file://") else uri
+    path = uri.removeprefix("file://")
     return path if os.path.isfile(path) else uri
 
 
-def _build_cert_pdf(data: dict, verify_url: str = "") -> bytes:
-    """Render certificate compact data into PDF bytes."""
+# ---------------------------------------------------------------------------
+# PDF engine for fixed-layout kinds. "pisa" formats the HTML templates through
+# xhtml2pdf; "canvas" draws participation/internship certificates straight onto
+# a ReportLab canvas (api/cert_canvas.py), roughly an order of magnitude faster.
+# Appreciation certificates always use pisa. Compare the two with
+# scripts/compare_cert_engines.py before switching.
+# ---------------------------------------------------------------------------
+CERT_PDF_ENGINES = ("pisa", "canvas")
+CERT_PDF_ENGINE = (_sanitize_env(os.environ.get("CERT_PDF_ENGINE", "pisa")) or "pisa").lower()
+if CERT_PDF_ENGINE not in CERT_PDF_ENGINES:
+    logger.warning(f"Unknown CERT_PDF_ENGINE={CERT_PDF_ENGINE!r}; using pisa")
+    CERT_PDF_ENGINE = "pisa"
+
+
+def _canvas_signatories(entries: list[tuple[str, str]]) -> list[tuple[str, str, bytes]]:
+    return [(name, role, _signature_png(name)) for name, role in _unique_signatory_roles(entries)]
+
+
+def _build_cert_pdf_canvas(data: dict, verify_url: str = "") -> bytes:
+    """Render a participation or internship certificate with the canvas engine."""
+    from api import cert_canvas
+
+    qr_png = _generate_qr_png(verify_url) if verify_url else b""
+    cert_id = _cert_id(data)
+    if _is_internship_payload(data):
+        return cert_canvas.render_internship_pdf(
+            participant_name=data["n"],
+            usn=data["u"],
+            course_name=data["c"],
+            completion_date=data["d"],
+            duration_text=data["w"],
+            hours_text=data["h"],
+            certificate_id=cert_id,
+            institution_name=data.get("s") or "",
+            signatories=_canvas_signatories([
+                (FOUNDER_NAME, "Authorised Signatory"),
+                (data["m"], "Industry Mentor"),
+                (data["i"], "Program Lead"),
+            ]),
+            qr_png=qr_png,
+        )
+    meta = [(data["d"], "DATE")]
+    if not _same_signatory(data["i"], FOUNDER_NAME):
+        meta.append((data["i"], "INSTRUCTOR"))
+    meta.append((cert_id, "CERTIFICATE ID"))
+    return cert_canvas.render_participation_pdf(
+        participant_name=data["n"],
+        course_name=data["c"],
+        certificate_id=cert_id,
+        meta=meta,
+        signatories=_canvas_signatories([
+            (FOUNDER_NAME, FOUNDER_TITLE),
+            (data["i"], "COURSE INSTRUCTOR"),
+        ]),
+        qr_png=qr_png,
+        brand=certificate_branding(),
+        display_font=_cert_display_font(),
+    )
+
+
+def _build_cert_pdf(data: dict, verify_url: str = "", engine: str | None = None) -> bytes:
+    """Render certificate compact data into PDF bytes.
+
+    ``engine`` overrides CERT_PDF_ENGINE (used by the comparison harness).
+    """
+    if (engine or CERT_PDF_ENGINE) == "canvas" and not _is_appreciation_payload(data):
+        return _build_cert_pdf_canvas(data, verify_url)
     qr_data_uri = _generate_qr_data_uri(verify_url) if verify_url else ""
     cert_id = _cert_id(data)
     if _is_internship_payload(data):
@@ -1309,9 +1682,11 @@ def _build_cert_pdf(data: dict, verify_url: str = "") -> bytes:
                 _generate_signature_data_uri(data["i"]),
             ),
             font_face=_participation_font_face(),
-            display_font=_CERT_DISPLAY_FONT_FAMILY if _CERT_FONT_AVAILABLE else "Helvetica",
+            display_font=_cert_display_font(),
             **_participation_branding_html(),
         )
+    from xhtml2pdf import pisa
+
     pdf_buffer = BytesIO()
     pisa_status = pisa.CreatePDF(
         src=full_html, dest=pdf_buffer, encoding="UTF-8", link_callback=_pdf_link_callback
@@ -1325,6 +1700,213 @@ def _build_cert_pdf(data: dict, verify_url: str = "") -> bytes:
     return pdf_buffer.getvalue()
 
 
+# ---------------------------------------------------------------------------
+# Rendered PDF cache. Token content never changes, so a PDF is keyed by the
+# decoded payload, the verify URL in its QR code and a render version that
+# covers templates, HTML helpers and branding. Memory LRU bounded by bytes,
+# plus an optional disk tier (PDF_CACHE_DIR, e.g. /tmp/pdf-cache on Vercel).
+# ---------------------------------------------------------------------------
+PDF_CACHE_MAX_BYTES = _env_int("PDF_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+PDF_CACHE_DIR = _sanitize_env(os.environ.get("PDF_CACHE_DIR", ""))
+PDF_CACHE_DISK_MAX_BYTES = _env_int("PDF_CACHE_DISK_MAX_BYTES", 256 * 1024 * 1024)
+_pdf_cache = PdfCache(
+    PDF_CACHE_MAX_BYTES,
+    PDF_CACHE_DIR,
+    disk_max_bytes=PDF_CACHE_DISK_MAX_BYTES,
+)
+_RENDER_SOURCE_FILES = (
+    "index.py",
+    "certificate_templates.py",
+    "appreciation_assets.py",
+    "invoice_templates.py",
+    "invoice_utils.py",
+    "invoice_brand.py",
+    "cert_canvas.py",
+)
+_pdf_render_version_value = ""
+
+
+def _pdf_render_version() -> str:
+    """Hash of everything besides the payload that affects rendered PDF bytes.
+
+    Covers the rendering sources (so a deploy invalidates the disk tier) and the
+    env-driven branding, which can differ between deployments of the same code.
+    """
+    global _pdf_render_version_value
+    if _pdf_render_version_value:
+        return _pdf_render_version_value
+    h = hashlib.sha256()
+    api_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in _RENDER_SOURCE_FILES:
+        try:
+            with open(os.path.join(api_dir, name), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(name.encode())
+    h.update(json.dumps(certificate_branding(), sort_keys=True).encode())
+    h.update(json.dumps(invoice_brand_colors(), sort_keys=True).encode())
+    h.update(b"font" if _CERT_FONT_AVAILABLE else b"nofont")
+    h.update(CERT_PDF_ENGINE.encode())
+    _pdf_render_version_value = h.hexdigest()[:16]
+    return _pdf_render_version_value
+
+
+# ---------------------------------------------------------------------------
+# Off-loop rendering. Cache misses are rendered in a process pool sized to the
+# cores (PDF_RENDER_WORKERS; 0 = thread offload, the default on Vercel where
+# multiprocessing has no /dev/shm). Concurrent misses for the same document
+# share one render.
+# ---------------------------------------------------------------------------
+PDF_RENDER_WORKERS = _env_int(
+    "PDF_RENDER_WORKERS",
+    0 if os.environ.get("VERCEL") else (os.cpu_count() or 1),
+)
+
+
+def _warm_render_worker() -> None:
+    """Process-pool initializer: load templates, fonts and signatures once per worker."""
+    try:
+        from xhtml2pdf import pisa  # noqa: F401
+
+        if CERT_PDF_ENGINE == "canvas":
+            from api import cert_canvas  # noqa: F401
+        _ensure_cert_font()
+        _generate_signature_data_uri()
+        _pdf_render_version()
+    except Exception as e:  # pragma: no cover - warm-up is best effort  # noqa: BLE001
+        logger.warning(f"PDF render worker warm-up failed: {e}")
+
+
+_render_pool = RenderPool(PDF_RENDER_WORKERS, initializer=_warm_render_worker)
+_inflight_renders: dict[str, asyncio.Future] = {}
+
+
+async def _render_cached(key: str, fn, *args) -> tuple[bytes, str]:
+    """Return (pdf_bytes, cache state), rendering ``fn(*args)`` off the loop on a miss.
+
+    The state is the X-Cache value: ``HIT``, ``MISS`` (rendered by this request)
+    or ``COALESCED`` (waited for a concurrent request's render of the same document).
+    """
+    pdf_bytes = _pdf_cache.get(key)
+    if pdf_bytes is not None:
+        return pdf_bytes, "HIT"
+    pending = _inflight_renders.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending), "COALESCED"
+        except asyncio.CancelledError:
+            # The leader's request was cancelled; render here unless we were too.
+            if not pending.cancelled():
+                raise
+    future = asyncio.get_running_loop().create_future()
+    _inflight_renders[key] = future
+    try:
+        pdf_bytes = await _render_pool.run(fn, *args)
+        _pdf_cache.put(key, pdf_bytes)
+        future.set_result(pdf_bytes)
+        return pdf_bytes, "MISS"
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters re-raise it; mark retrieved so a future nobody awaited does not warn.
+        future.exception()
+        raise
+    finally:
+        _inflight_renders.pop(key, None)
+
+
+async def _cert_pdf_cached(data: dict, verify_url: str) -> tuple[bytes, str]:
+    """Return (pdf_bytes, cache state) for a certificate payload."""
+    key = pdf_cache_key("certificate", data, verify_url, _pdf_render_version())
+    return await _render_cached(key, _build_cert_pdf, data, verify_url)
+
+
+async def _invoice_pdf_cached(data: dict, invoice_data: dict) -> tuple[bytes, str]:
+    """Return (pdf_bytes, cache state) for a compact invoice token payload.
+
+    ``invoice_data`` is ``expand_invoice_token_payload(data)``, which the caller
+    already needs; the cache key stays on the compact payload.
+    """
+    key = pdf_cache_key("invoice", data, _pdf_render_version())
+    return await _render_cached(key, build_invoice_pdf, invoice_data)
+
+
+@app.on_event("startup")
+def _start_render_pool() -> None:
+    # Spawn the worker processes (and run their warm-up) before the first render.
+    if _render_pool.workers:
+        _render_pool.warm()
+
+
+@app.on_event("shutdown")
+def _shutdown_render_pool() -> None:
+    _render_pool.shutdown()
+
+
+@app.on_event("shutdown")
+def _shutdown_db_executor() -> None:
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=False, cancel_futures=True)
+
+
+@app.on_event("shutdown")
+def _close_db_pool() -> None:
+    if db:
+        db.close_pool()
+
+
+# ---------------------------------------------------------------------------
+# HTTP caching for token-addressed resources. Tokens are signed and never
+# change, so responses get strong ETags over the token, a revocation epoch and
+# a variant (render version, host, print mode). A matching If-None-Match is
+# answered with 304 before any rendering or DB lookup. PDFs are immutable;
+# the viewer and verify JSON get short lifetimes so revocations propagate.
+# ---------------------------------------------------------------------------
+CACHE_PDF_MAX_AGE = _env_int("CACHE_PDF_MAX_AGE", 31536000)
+CACHE_VIEW_MAX_AGE = _env_int("CACHE_VIEW_MAX_AGE", 3600)
+CACHE_VERIFY_MAX_AGE = _env_int("CACHE_VERIFY_MAX_AGE", 60)
+CACHE_CONTROL_PDF = f"public, max-age={CACHE_PDF_MAX_AGE}, immutable"
+CACHE_CONTROL_VIEW = f"public, max-age={CACHE_VIEW_MAX_AGE}, s-maxage={CACHE_VIEW_MAX_AGE * 24}"
+CACHE_CONTROL_VERIFY = f"public, max-age={CACHE_VERIFY_MAX_AGE}, s-maxage={CACHE_VERIFY_MAX_AGE * 5}"
+
+
+def _token_etag(token: str, *variant: str) -> str:
+    """Strong ETag for a token-addressed response. Includes the shared revocation
+    epoch, so cached verify/view responses stop validating after any revoke."""
+    h = hashlib.sha256()
+    h.update(token.encode())
+    h.update(f"\x00{_revocation_epoch()}".encode())
+    for part in variant:
+        h.update(b"\x00")
+        h.update(part.encode())
+    return f'"{h.hexdigest()[:32]}"'
+
+
+def _etag_matches(req: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers ``etag`` (weak comparison, RFC 9110 13.1.2)."""
+    header = req.headers.get("if-none-match", "")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        candidate = candidate.removeprefix("W/")
+        if candidate == etag:
+            return True
+    return False
+
+
+def _cache_headers(etag: str, cache_control: str) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers=_cache_headers(etag, cache_control))
+
+
 CERT_EMAIL_HTML = """
 <div style="font-family:'Inter',-apple-system,BlinkMacSystemFont,sans-serif;max-width:600px;margin:0 auto;background:#0f0f23;padding:24px;border-radius:16px;">
   <div style="background:linear-gradient(135deg,#12124a 0%,#1e1e6e 50%,#2a1a5e 100%);padding:28px 32px 24px;text-align:center;border-radius:12px 12px 0 0;">
@@ -1393,17 +1975,49 @@ def _agentmail_error_message(exc: Exception) -> str:
     return text[:240] if text else "Could not deliver email."
 
 
+def _get_agentmail_client():
+    """Create the AgentMail client on first use and start the inbox warm-up.
+
+    Importing the SDK pulls in httpx and its generated models, so this is kept
+    off the import path of routes that never send email.
+    """
+    global _agentmail_client, _agentmail_init_failed
+    if _agentmail_client is not None or _agentmail_init_failed or not AGENTMAIL_API_KEY:
+        return _agentmail_client
+    with _agentmail_client_lock:
+        if _agentmail_client is None and not _agentmail_init_failed:
+            try:
+                from agentmail import AgentMail as AgentMailClient
+
+                _agentmail_client = AgentMailClient(
+                    api_key=AGENTMAIL_API_KEY,
+                    timeout=AGENTMAIL_HTTP_TIMEOUT_SEC,
+                )
+                logger.info("AgentMail client configured (inbox warm-up in background)")
+            except Exception as e:
+                logger.warning(f"AgentMail initialization failed: {e}")
+                _agentmail_init_failed = True
+                return None
+            threading.Thread(
+                target=_warm_agentmail_inbox,
+                daemon=True,
+                name="agentmail-warm",
+            ).start()
+    return _agentmail_client
+
+
 def _get_agentmail_inbox_id() -> str:
     """Return cached inbox id, or the configured default without an API round-trip."""
     if _agentmail_inbox_cached:
         return _agentmail_inbox_cached
-    return AGENTMAIL_INBOX_ID if _agentmail_client else ""
+    return AGENTMAIL_INBOX_ID if _get_agentmail_client() else ""
 
 
 def _refresh_agentmail_inbox_from_api(*, force: bool = False) -> str:
     """Resolve inbox id via AgentMail list API and cache the result."""
     global _agentmail_inbox_cached, _agentmail_ready
-    if not _agentmail_client:
+    client = _get_agentmail_client()
+    if not client:
         return ""
     configured = AGENTMAIL_INBOX_ID
     with _agentmail_inbox_lock:
@@ -1414,7 +2028,7 @@ def _refresh_agentmail_inbox_from_api(*, force: bool = False) -> str:
         try:
             from agentmail.core.api_error import ApiError as AgentMailApiError
 
-            page = _agentmail_client.inboxes.list(limit=50)
+            page = client.inboxes.list(limit=50)
             inboxes = page.inboxes or []
             if not inboxes:
                 _agentmail_inbox_cached = configured
@@ -1463,27 +2077,10 @@ def _is_agentmail_inbox_not_found(exc: Exception) -> bool:
     return False
 
 
-if _agentmail_client:
-    threading.Thread(
-        target=_warm_agentmail_inbox,
-        daemon=True,
-        name="agentmail-warm",
-    ).start()
-
-
-def _run_with_timeout(fn, timeout_sec: float, timeout_message: str):
-    future = _email_executor.submit(fn)
-    try:
-        return future.result(timeout=timeout_sec)
-    except FuturesTimeoutError:
-        logger.warning(timeout_message)
-        return None
-
-
 def _agentmail_send_message(
     inbox_id: str, *, recipient: str, subject: str, text: str, html: str
 ) -> None:
-    _agentmail_client.inboxes.messages.send(
+    _get_agentmail_client().inboxes.messages.send(
         inbox_id,
         to=recipient,
         subject=subject,
@@ -1495,7 +2092,7 @@ def _agentmail_send_message(
 def _agentmail_deliver(
     *, to_email: str, subject: str, text: str, html: str, link_hint: str = "certificate"
 ) -> tuple[bool, str]:
-    if not _agentmail_client:
+    if not _get_agentmail_client():
         return False, "Email service is not configured on this server."
     recipient = to_email.strip()
     if not recipient:
@@ -1622,6 +2219,132 @@ def _send_internship_certificate_email(
     )
 
 
+# ---------------------------------------------------------------------------
+# Email outbox. Issuance queues the certificate email and returns at once with
+# email_status "pending"; background workers send it with retries and
+# exponential backoff, dead-lettering after EMAIL_MAX_ATTEMPTS. Clients poll
+# GET /api/emails/{email_id}. Stored in Postgres when configured, else memory.
+# ---------------------------------------------------------------------------
+EMAIL_OUTBOX_WORKERS = _env_int("EMAIL_OUTBOX_WORKERS", 4)
+EMAIL_MAX_ATTEMPTS = _env_int("EMAIL_MAX_ATTEMPTS", 5)
+EMAIL_RETRY_BASE_SEC = _env_int("EMAIL_RETRY_BASE_SEC", 10)
+_email_outbox: EmailOutbox | None = None
+_email_outbox_lock = threading.Lock()
+
+
+def _deliver_outbox_email(kind: str, to_email: str, params: dict) -> tuple[bool, str]:
+    if kind == "internship":
+        return _send_internship_certificate_email(to_email=to_email, **params)
+    return _send_certificate_email(to_email=to_email, **params)
+
+
+def _get_email_outbox() -> EmailOutbox:
+    global _email_outbox
+    if _email_outbox is None:
+        with _email_outbox_lock:
+            if _email_outbox is None:
+                store = PostgresOutboxStore(db) if _ensure_db_ready() and db else None
+                _email_outbox = EmailOutbox(
+                    _deliver_outbox_email,
+                    store=store,
+                    workers=EMAIL_OUTBOX_WORKERS,
+                    max_attempts=EMAIL_MAX_ATTEMPTS,
+                    base_delay=EMAIL_RETRY_BASE_SEC,
+                )
+    return _email_outbox
+
+
+def _certificate_email_params(
+    src,
+    *,
+    name: str,
+    course_name: str,
+    lead: str,
+    recognition: str,
+    cert_id: str,
+    view_url: str,
+    download_url: str,
+) -> tuple[str, dict]:
+    """(kind, params) for the outbox from a CertificateRequest or bulk entry."""
+    if src.certificate_kind == "internship":
+        return "internship", {
+            "participant_name": name,
+            "course_name": course_name,
+            "completion_date": src.completion_date,
+            "instructor_name": lead,
+            "mentor_name": src.mentor_name.strip(),
+            "usn": src.usn.strip(),
+            "duration_text": src.internship_duration.strip(),
+            "hours_text": src.internship_hours.strip(),
+            "certificate_id": cert_id,
+            "view_url": view_url,
+            "download_url": download_url,
+        }
+    email_label = (
+        recognition[:80] + "…"
+        if src.certificate_kind == "appreciation" and len(recognition) > 80
+        else course_name
+    )
+    return "participation", {
+        "participant_name": name,
+        "course_name": email_label,
+        "completion_date": src.completion_date,
+        "instructor_name": lead,
+        "certificate_id": cert_id,
+        "view_url": view_url,
+        "download_url": download_url,
+    }
+
+
+def _queue_certificate_email(to_email: str, kind: str, params: dict) -> dict:
+    """Queue a certificate email; returns the email_* response fields."""
+    if not AGENTMAIL_API_KEY:
+        return {
+            "email_sent": False,
+            "email_error": "Email service is not configured on this server.",
+            "email_status": "not_configured",
+            "email_id": None,
+        }
+    email_id = _get_email_outbox().enqueue(kind, to_email, params)
+    return {"email_sent": False, "email_error": "", "email_status": "pending", "email_id": email_id}
+
+
+def _queue_certificate_emails(jobs: list[tuple[str, str, dict]]) -> list[dict]:
+    """Batch form of _queue_certificate_email for (to_email, kind, params) jobs (one outbox insert)."""
+    if not jobs:
+        return []
+    if not AGENTMAIL_API_KEY:
+        return [_queue_certificate_email(to_email, kind, params) for to_email, kind, params in jobs]
+    ids = _get_email_outbox().enqueue_many([(kind, to_email, params) for to_email, kind, params in jobs])
+    return [
+        {"email_sent": False, "email_error": "", "email_status": "pending", "email_id": email_id}
+        for email_id in ids
+    ]
+
+
+_NO_EMAIL = {"email_sent": False, "email_error": "", "email_status": None, "email_id": None}
+
+
+@app.get("/api/emails/{email_id}", tags=["Certificates"])
+async def get_email_status(email_id: str):
+    """Delivery status of a queued certificate email: pending, sending, sent or dead (gave up)."""
+    row = await _run_db(lambda: _get_email_outbox().status(email_id)) if AGENTMAIL_API_KEY else None
+    if row is None:
+        raise HTTPException(status_code=404, detail="Email not found")
+    return {**row, "email_sent": row["status"] == "sent"}
+
+
+@app.on_event("shutdown")
+def _stop_webhooks() -> None:
+    _webhooks.stop()
+
+
+@app.on_event("shutdown")
+def _stop_email_outbox() -> None:
+    if _email_outbox is not None:
+        _email_outbox.stop()
+
+
 @app.post("/api/certificate", tags=["Certificates"])
 async def generate_certificate(request: CertificateRequest, req: Request):
     """
@@ -1645,11 +2368,13 @@ async def generate_certificate(request: CertificateRequest, req: Request):
 
     **Email:** Pass `participant_email` to automatically email the certificate to the participant.
     """
+    idempotency_key = None
     try:
         if request.idempotency_key:
-            cached = _check_idempotency(request.idempotency_key)
+            cached = await _check_idempotency("certificate", request.idempotency_key)
             if cached:
                 return JSONResponse(cached)
+            idempotency_key = request.idempotency_key
 
         if CERT_API_KEYS:
             api_key = req.headers.get("X-API-Key", "")
@@ -1657,7 +2382,7 @@ async def generate_certificate(request: CertificateRequest, req: Request):
                 raise HTTPException(status_code=401, detail="Invalid or missing API key")
 
         client_ip = req.client.host if req.client else "unknown"
-        allowed, rate_headers = _check_rate_limit(client_ip)
+        allowed, rate_headers = await _check_rate_limit(client_ip, req.headers.get("X-API-Key", ""))
         if not allowed:
             raise HTTPException(
                 status_code=429,
@@ -1665,7 +2390,11 @@ async def generate_certificate(request: CertificateRequest, req: Request):
                 headers=rate_headers,
             )
 
-        valid_courses = _get_course_names() if request.certificate_kind != "appreciation" else []
+        if request.certificate_kind != "appreciation":
+            await _refresh_course_cache_async()
+            valid_courses = _active_course_set()
+        else:
+            valid_courses = frozenset()
         name = request.participant_name.strip()
         if not name:
             raise HTTPException(status_code=400, detail="Participant name is required")
@@ -1724,70 +2453,43 @@ async def generate_certificate(request: CertificateRequest, req: Request):
 
         participant_email = request.participant_email.strip() if request.participant_email else ""
 
-        if _ensure_db_ready() and db:
+        if await _ensure_db_ready_async() and db:
+            store = functools.partial(
+                db.store_certificate,
+                participant_name=name,
+                course_name=course_for_db,
+                completion_date=request.completion_date,
+                instructor_name=lead,
+                client_ip=client_ip,
+                participant_email=participant_email,
+            )
             try:
-                db.store_certificate(
-                    certificate_id=cert_id,
-                    token=token,
-                    participant_name=name,
-                    course_name=course_for_db,
-                    completion_date=request.completion_date,
-                    instructor_name=lead,
-                    client_ip=client_ip,
-                    participant_email=participant_email,
-                )
+                try:
+                    await _run_db(store, certificate_id=cert_id, token=token)
+                except db.CertificateIdTaken:
+                    cert_data, token, cert_id = _with_unique_cert_id(cert_data)
+                    await _run_db(store, certificate_id=cert_id, token=token)
             except Exception as e:
                 logger.warning(f"Failed to store certificate in DB (cert still valid): {e}")
 
         base_url = str(req.base_url).rstrip("/")
         shareable_url = f"{base_url}/certificate/{token}"
         download_url = f"{shareable_url}/download"
+        linked = await _run_db(_create_short_links, [(cert_id, token)]) if _short_links else set()
 
-        email_sent = False
-        email_error = ""
+        email_fields = _NO_EMAIL
         if participant_email:
-            def _send_email():
-                if request.certificate_kind == "internship":
-                    return _send_internship_certificate_email(
-                        to_email=participant_email,
-                        participant_name=name,
-                        course_name=course_for_db,
-                        completion_date=request.completion_date,
-                        instructor_name=lead,
-                        mentor_name=request.mentor_name.strip(),
-                        usn=request.usn.strip(),
-                        duration_text=request.internship_duration.strip(),
-                        hours_text=request.internship_hours.strip(),
-                        certificate_id=cert_id,
-                        view_url=shareable_url,
-                        download_url=download_url,
-                    )
-                email_label = (
-                    recognition[:80] + "…"
-                    if request.certificate_kind == "appreciation" and len(recognition) > 80
-                    else course_for_db
-                )
-                return _send_certificate_email(
-                    to_email=participant_email,
-                    participant_name=name,
-                    course_name=email_label,
-                    completion_date=request.completion_date,
-                    instructor_name=lead,
-                    certificate_id=cert_id,
-                    view_url=shareable_url,
-                    download_url=download_url,
-                )
-
-            email_result = _run_with_timeout(
-                _send_email,
-                EMAIL_SEND_TIMEOUT_SEC,
-                f"Email delivery timed out for {participant_email}",
+            email_kind, email_params = _certificate_email_params(
+                request,
+                name=name,
+                course_name=course_for_db,
+                lead=lead,
+                recognition=recognition if request.certificate_kind == "appreciation" else "",
+                cert_id=cert_id,
+                view_url=shareable_url,
+                download_url=download_url,
             )
-            if email_result is None:
-                email_sent = False
-                email_error = "Email delivery timed out. Share the certificate link instead."
-            else:
-                email_sent, email_error = email_result
+            email_fields = await _run_db(_queue_certificate_email, participant_email, email_kind, email_params)
 
         logger.info(f"Certificate issued for {name} – {course_for_db}")
 
@@ -1799,10 +2501,11 @@ async def generate_certificate(request: CertificateRequest, req: Request):
             "participant_name": name,
             "course_name": course_for_db,
             "certificate_kind": request.certificate_kind,
-            "email_sent": email_sent,
-            "email_error": email_error,
+            **email_fields,
             "request_id": str(uuid_mod.uuid4()),
         }
+        if linked:
+            response_data["short_url"] = short_url(base_url, cert_id)
         if request.certificate_kind == "internship":
             response_data["usn"] = request.usn.strip()
             response_data["internship_duration"] = request.internship_duration.strip()
@@ -1819,14 +2522,12 @@ async def generate_certificate(request: CertificateRequest, req: Request):
             if request.sponsor_label.strip():
                 response_data["sponsor_label"] = request.sponsor_label.strip()
 
-        if request.idempotency_key:
-            _store_idempotency(request.idempotency_key, response_data)
+        if idempotency_key:
+            await _store_idempotency("certificate", idempotency_key, response_data)
+            idempotency_key = None
 
         if request.callback_url:
-            _fire_webhook(request.callback_url, {
-                "event": "certificate.created",
-                "data": response_data,
-            })
+            _fire_webhook(request.callback_url, "certificate.created", response_data)
 
         return JSONResponse(response_data, headers=rate_headers)
 
@@ -1835,6 +2536,9 @@ async def generate_certificate(request: CertificateRequest, req: Request):
     except Exception as e:
         logger.error(f"Error generating certificate: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate certificate: {e}")
+    finally:
+        if idempotency_key:
+            await _release_idempotency("certificate", idempotency_key)
 
 
 @app.post("/api/invoice", tags=["Invoices"])
@@ -1845,11 +2549,13 @@ async def generate_invoice(request: InvoiceRequest, req: Request):
     Line items are priced in USD; INR total uses `exchange_rate` (default 90).
     Pass `idempotency_key` to safely retry without creating duplicate tokens.
     """
+    idempotency_key = None
     try:
         if request.idempotency_key:
-            cached = _check_idempotency(request.idempotency_key)
+            cached = await _check_idempotency("invoice", request.idempotency_key)
             if cached:
                 return JSONResponse(cached)
+            idempotency_key = request.idempotency_key
 
         if CERT_API_KEYS:
             api_key = req.headers.get("X-API-Key", "")
@@ -1857,7 +2563,7 @@ async def generate_invoice(request: InvoiceRequest, req: Request):
                 raise HTTPException(status_code=401, detail="Invalid or missing API key")
 
         client_ip = req.client.host if req.client else "unknown"
-        allowed, rate_headers = _check_rate_limit(client_ip)
+        allowed, rate_headers = await _check_rate_limit(client_ip, req.headers.get("X-API-Key", ""))
         if not allowed:
             raise HTTPException(
                 status_code=429,
@@ -1888,8 +2594,9 @@ async def generate_invoice(request: InvoiceRequest, req: Request):
             "request_id": str(uuid_mod.uuid4()),
         }
 
-        if request.idempotency_key:
-            _store_idempotency(request.idempotency_key, response_data)
+        if idempotency_key:
+            await _store_idempotency("invoice", idempotency_key, response_data)
+            idempotency_key = None
 
         logger.info(
             f"Invoice issued {invoice_data['invoice_number']} — "
@@ -1902,17 +2609,23 @@ async def generate_invoice(request: InvoiceRequest, req: Request):
     except Exception as e:
         logger.error(f"Error generating invoice: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate invoice: {e}")
+    finally:
+        if idempotency_key:
+            await _release_idempotency("invoice", idempotency_key)
 
 
 @app.get("/invoice/{token}/download", tags=["Invoices"])
-async def download_invoice(token: str):
+async def download_invoice(token: str, req: Request):
     """Download a tax invoice PDF from a signed token."""
     data = _decode_cert(token)
     if not data or not _is_invoice_payload(data):
         raise HTTPException(status_code=404, detail="Invoice not found or invalid token")
+    etag = _token_etag(token, "invoice", _pdf_render_version())
+    if _etag_matches(req, etag):
+        return _not_modified(etag, CACHE_CONTROL_PDF)
 
     invoice_data = expand_invoice_token_payload(data)
-    pdf_bytes = build_invoice_pdf(invoice_data)
+    pdf_bytes, cache_state = await _invoice_pdf_cached(data, invoice_data)
     safe_number = invoice_data["invoice_number"].replace(" ", "_").replace("/", "-")
     filename = f"Invoice_{safe_number}.pdf"
 
@@ -1922,6 +2635,8 @@ async def download_invoice(token: str):
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"',
             "Content-Length": str(len(pdf_bytes)),
+            "X-Cache": cache_state,
+            **_cache_headers(etag, CACHE_CONTROL_PDF),
         },
     )
 
@@ -2082,6 +2797,13 @@ async def view_certificate(token: str, req: Request):
     page_url = f"{base_url}/certificate/{token}"
     download_url = f"{page_url}/download"
     auto_print = req.query_params.get("print") == "1"
+    await _sync_revocations()
+    etag = _token_etag(
+        token, "view", base_url, _short_links_variant(), "print" if auto_print else "", _pdf_render_version()
+    )
+    if _etag_matches(req, etag):
+        return _not_modified(etag, CACHE_CONTROL_VIEW)
+    qr_url = (await _run_db(_short_url_for, base_url, data, token) if _short_links else None) or page_url
 
     linkedin_params = urlencode({"url": page_url})
     linkedin_url = f"https://www.linkedin.com/sharing/share-offsite/?{linkedin_params}"
@@ -2117,7 +2839,7 @@ async def view_certificate(token: str, req: Request):
             download_url=download_url,
             linkedin_url=linkedin_url,
             twitter_url=twitter_url,
-            qr_data_uri=_generate_qr_data_uri(page_url),
+            qr_data_uri=_generate_qr_data_uri(qr_url),
             meta_description=meta_description,
             json_ld=_internship_json_ld(
                 participant_name=data["n"],
@@ -2163,7 +2885,7 @@ async def view_certificate(token: str, req: Request):
             download_url=download_url,
             linkedin_url=linkedin_url,
             twitter_url=twitter_url,
-            qr_data_uri=_generate_qr_data_uri(page_url),
+            qr_data_uri=_generate_qr_data_uri(qr_url),
             meta_description=meta_description,
             json_ld=_json_ld_script({
                 "@context": "https://schema.org",
@@ -2200,7 +2922,7 @@ async def view_certificate(token: str, req: Request):
             download_url=download_url,
             linkedin_url=linkedin_url,
             twitter_url=twitter_url,
-            qr_data_uri=_generate_qr_data_uri(page_url),
+            qr_data_uri=_generate_qr_data_uri(qr_url),
             meta_description=meta_description,
             json_ld=_participation_json_ld(
                 participant_name=data["n"],
@@ -2217,7 +2939,7 @@ async def view_certificate(token: str, req: Request):
             ]),
             **brand_html,
         )
-    return HTMLResponse(content=html)
+    return HTMLResponse(content=html, headers=_cache_headers(etag, CACHE_CONTROL_VIEW))
 
 
 @app.get("/certificate/{token}/download", tags=["Certificates"])
@@ -2232,8 +2954,14 @@ async def download_certificate(token: str, req: Request):
             status_code=302,
         )
 
-    verify_url = f"{base_url}/certificate/{token}"
-    pdf_bytes = _build_cert_pdf(data, verify_url=verify_url)
+    await _sync_revocations()
+    etag = _token_etag(token, "pdf", base_url, _short_links_variant(), _pdf_render_version())
+    if _etag_matches(req, etag):
+        return _not_modified(etag, CACHE_CONTROL_PDF)
+    verify_url = (
+        await _run_db(_short_url_for, base_url, data, token) if _short_links else None
+    ) or f"{base_url}/certificate/{token}"
+    pdf_bytes, cache_state = await _cert_pdf_cached(data, verify_url)
     safe_name = data["n"].replace(" ", "_")
     if _is_internship_payload(data):
         filename = f"Internship_Certificate_{safe_name}.pdf"
@@ -2248,10 +2976,28 @@ async def download_certificate(token: str, req: Request):
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"',
             "Content-Length": str(len(pdf_bytes)),
+            "X-Cache": cache_state,
+            **_cache_headers(etag, CACHE_CONTROL_PDF),
         },
     )
 
 
+@app.get("/c/{short_id}", tags=["Certificates"], include_in_schema=False)
+@app.get("/C/{short_id}", tags=["Certificates"], include_in_schema=False)
+async def resolve_short_link(short_id: str, req: Request):
+    """Short certificate link (SHORT_LINKS=1): redirects to the signed-token viewer."""
+    cert_id = normalize_certificate_id(short_id)
+    if _short_links is None or cert_id is None:
+        raise HTTPException(status_code=404, detail="Certificate link not found")
+    if not await _ensure_db_ready_async():
+        raise HTTPException(status_code=503, detail="Database temporarily unavailable")
+    token = await _run_db(_short_links.resolve, cert_id)
+    if token is None:
+        raise HTTPException(status_code=404, detail="Certificate link not found")
+    base_url = str(req.base_url).rstrip("/")
+    query = f"?{req.url.query}" if req.url.query else ""
+    return RedirectResponse(url=f"{base_url}/certificate/{token}{query}", status_code=302)
+
 
 def _certificate_verify_public(data: dict) -> dict:
     """Public fields returned by GET /certificate/{token}/verify (and batch verify)."""
@@ -2284,16 +3030,22 @@ def _certificate_verify_public(data: dict) -> dict:
 
 
 @app.get("/certificate/{token}/verify", tags=["Verification"])
-async def verify_certificate(token: str):
+async def verify_certificate(token: str, req: Request):
     """Verify a single certificate's authenticity by its token. Returns the decoded certificate data if valid."""
     data = _decode_cert(token)
     if data is None:
         return JSONResponse({"valid": False, "message": "Invalid or tampered certificate"}, status_code=400)
-    if _certificate_is_revoked(token):
+    await _sync_revocations()
+    etag = _token_etag(token, "verify")
+    if _etag_matches(req, etag):
+        return _not_modified(etag, CACHE_CONTROL_VERIFY)
+    headers = _cache_headers(etag, CACHE_CONTROL_VERIFY)
+    if await _certificate_is_revoked(token):
         return JSONResponse(
             {"valid": False, "revoked": True, "message": "Certificate has been revoked"},
+            headers=headers,
         )
-    return _certificate_verify_public(data)
+    return JSONResponse(_certificate_verify_public(data), headers=headers)
 
 
 class BatchVerifyRequest(BaseModel):
@@ -2309,12 +3061,14 @@ async def batch_verify_certificates(request: BatchVerifyRequest):
     if len(request.tokens) > 100:
         raise HTTPException(status_code=400, detail="Maximum 100 tokens per batch")
 
+    decoded = [(token, _decode_cert(token)) for token in request.tokens]
+    valid_tokens = [token for token, data in decoded if data is not None]
+    revoked = await _revoked_tokens(valid_tokens)
     results = []
-    for token in request.tokens:
-        data = _decode_cert(token)
+    for token, data in decoded:
         if data is None:
             results.append({"token": token[:20] + "...", "valid": False})
-        elif _certificate_is_revoked(token):
+        elif token in revoked:
             results.append(
                 {
                     "token": token[:20] + "...",
@@ -2329,6 +3083,65 @@ async def batch_verify_certificates(request: BatchVerifyRequest):
     return {"total": len(request.tokens), "valid": valid_count, "invalid": len(request.tokens) - valid_count, "results": results}
 
 
+# Read-through cache for lookups by printed certificate ID. Entries (including
+# "not found") are trusted for CERT_LOOKUP_CACHE_TTL seconds; a revoke on this
+# instance drops its entry immediately.
+CERT_LOOKUP_CACHE_TTL = _env_int("CERT_LOOKUP_CACHE_TTL", 60)
+CERT_LOOKUP_CACHE_SIZE = 10000
+_cert_lookup_cache: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+_cert_lookup_lock = threading.Lock()
+
+
+def _lookup_certificate_by_id(cert_id: str) -> dict | None:
+    now = time.monotonic()
+    with _cert_lookup_lock:
+        entry = _cert_lookup_cache.get(cert_id)
+        if entry is not None and entry[0] > now:
+            _cert_lookup_cache.move_to_end(cert_id)
+            return entry[1]
+    row = db.get_certificate_by_cert_id(cert_id)
+    with _cert_lookup_lock:
+        _cert_lookup_cache[cert_id] = (now + CERT_LOOKUP_CACHE_TTL, row)
+        _cert_lookup_cache.move_to_end(cert_id)
+        while len(_cert_lookup_cache) > CERT_LOOKUP_CACHE_SIZE:
+            _cert_lookup_cache.popitem(last=False)
+    return row
+
+
+def _forget_certificate_lookup(cert_id: str) -> None:
+    with _cert_lookup_lock:
+        _cert_lookup_cache.pop(cert_id, None)
+
+
+@app.get("/api/certificates/by-id/{certificate_id}", tags=["Verification"])
+async def verify_certificate_by_id(certificate_id: str):
+    """Verify a certificate by the ID printed on it (``CERT-XXXXXXXXXXXX``). Requires the database."""
+    cert_id = normalize_certificate_id(certificate_id)
+    if cert_id is None:
+        raise HTTPException(status_code=400, detail="Invalid certificate ID (expected CERT- followed by 12 hex digits)")
+    await _require_db()
+    row = await _run_db(_lookup_certificate_by_id, cert_id)
+    if row is None:
+        return JSONResponse({"valid": False, "message": "Certificate not found"}, status_code=404)
+    if row["revoked"]:
+        return JSONResponse({
+            "valid": False,
+            "revoked": True,
+            "certificate_id": cert_id,
+            "revoked_at": row["revoked_at"],
+            "message": "Certificate has been revoked",
+        })
+    return JSONResponse({
+        "valid": True,
+        "certificate_id": cert_id,
+        "participant_name": row["participant_name"],
+        "course_name": row["course_name"],
+        "completion_date": row["completion_date"],
+        "instructor_name": row["instructor_name"],
+        "issued_at": row["issued_at"],
+    })
+
+
 # ---------------------------------------------------------------------------
 # Agent / LLM discovery & SEO
 # ---------------------------------------------------------------------------
@@ -2390,7 +3203,7 @@ Appreciation body adds: `certificate_kind` `"appreciation"`, `recognition_text`
 - Webhooks: pass `callback_url` on create to receive `certificate.created` events.
 - Idempotency: pass `idempotency_key` to prevent duplicate issuance.
 - Bulk admin: `POST /api/admin/certificates/bulk` with `X-Admin-Key`.
-- Email delivery: optional `participant_email` via AgentMail.
+- Email delivery: optional `participant_email` via AgentMail. Sent in the background; poll `GET /api/emails/{{email_id}}` with the returned `email_id`.
 
 ## Branding (env-configurable)
 
@@ -2489,8 +3302,8 @@ def _require_admin(req: Request):
         raise HTTPException(status_code=401, detail="Invalid admin key")
 
 
-def _require_db():
-    if not _ensure_db_ready() or not db:
+async def _require_db():
+    if not await _ensure_db_ready_async() or not db:
         raise HTTPException(status_code=503, detail="Database not available")
 
 
@@ -2498,26 +3311,45 @@ def _require_db():
 async def admin_stats(req: Request):
     """Get certificate analytics: total, weekly, revoked counts and per-course breakdown."""
     _require_admin(req)
-    _require_db()
-    return db.get_stats()
+    await _require_db()
+    return await _run_db(db.get_stats)
 
 
 @app.get("/api/admin/certificates", tags=["Admin"])
 async def admin_list_certificates(
-    req: Request, limit: int = 50, offset: int = 0, course: str | None = None
+    req: Request,
+    limit: int = 50,
+    offset: int = 0,
+    course: str | None = None,
+    cursor: str | None = None,
+    count: Literal["exact", "estimate", "none"] = "estimate",
 ):
+    """Newest first. Follow ``next_cursor`` to page; ``count`` picks how ``total`` is computed."""
     _require_admin(req)
-    _require_db()
-    return db.list_certificates(limit=limit, offset=offset, course=course)
+    await _require_db()
+    limit = max(1, min(limit, 500))
+    try:
+        return await _run_db(
+            db.list_certificates,
+            limit=limit,
+            offset=max(0, offset),
+            course=course,
+            cursor=cursor,
+            count=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/api/admin/certificates/{cert_db_id}/revoke", tags=["Admin"])
 async def admin_revoke_certificate(cert_db_id: int, req: Request):
     _require_admin(req)
-    _require_db()
-    result = db.revoke_certificate(cert_db_id)
+    await _require_db()
+    result = await _run_db(db.revoke_certificate, cert_db_id)
     if not result:
         raise HTTPException(status_code=404, detail="Certificate not found or already revoked")
+    _bump_revocation_epoch()
+    _forget_certificate_lookup(result["certificate_id"])
     return result
 
 
@@ -2541,202 +3373,368 @@ class BulkCertificateEntry(BaseModel):
 
 class BulkCertificateRequest(BaseModel):
     entries: list[BulkCertificateEntry]
+    callback_url: str | None = None
+    # "batch": one certificates.created event per processed chunk; "each": certificate.created per certificate.
+    callback_mode: Literal["batch", "each"] = "batch"
 
 
-@app.post("/api/admin/certificates/bulk", tags=["Admin"])
-async def admin_bulk_generate(request: BulkCertificateRequest, req: Request):
-    """Generate up to 500 certificates in a single request. Each entry is validated independently."""
-    _require_admin(req)
-    _require_db()
+def _bulk_prepare_entry(
+    i: int,
+    entry: BulkCertificateEntry,
+    *,
+    valid_courses: frozenset[str],
+    base_url: str,
+    client_ip: str,
+    unique_id: bool = False,
+) -> tuple[dict, dict | None, tuple[str, str, dict] | None]:
+    """Validate and sign one bulk entry.
+
+    Returns (result row, DB record, email job). Record and email job are None for
+    entries that failed validation; the email job is None when no address was given.
+    ``unique_id`` signs it via _with_unique_cert_id.
+    """
+    recognition = ""
+    name = entry.participant_name.strip()
+    if not name:
+        return {"index": i, "status": "error", "error": "Participant name is required"}, None, None
+
+    if entry.certificate_kind == "appreciation":
+        recognition = entry.recognition_text.strip()
+        if not recognition:
+            recognition = _default_appreciation_recognition(entry.venue_name)
+        if not recognition:
+            return {
+                "index": i,
+                "status": "error",
+                "error": "Appreciation entry requires recognition_text or venue_name",
+            }, None, None
+        course_for_db = (
+            entry.event_name.strip()
+            or entry.course_name.strip()
+            or "Sports Event"
+        )
+    elif entry.course_name not in valid_courses:
+        return {"index": i, "status": "error", "error": f"Unknown course: {entry.course_name}"}, None, None
+    else:
+        course_for_db = entry.course_name
+
+    if entry.certificate_kind == "internship":
+        miss = []
+        if not entry.usn.strip():
+            miss.append("usn")
+        if not entry.internship_duration.strip():
+            miss.append("internship_duration")
+        if not entry.internship_hours.strip():
+            miss.append("internship_hours")
+        if not entry.mentor_name.strip():
+            miss.append("mentor_name")
+        if miss:
+            return {
+                "index": i,
+                "status": "error",
+                "error": "Internship entry requires: " + ", ".join(miss),
+            }, None, None
 
+    try:
+        lead = entry.instructor_name.strip() or "IntelliForge AI Team"
+        if entry.certificate_kind == "appreciation":
+            cert_data = {
+                "k": "a",
+                "n": name,
+                "c": course_for_db,
+                "d": entry.completion_date,
+                "r": recognition,
+                "i": lead,
+            }
+            if entry.event_name.strip():
+                cert_data["e"] = entry.event_name.strip()
+            if entry.venue_name.strip():
+                cert_data["v"] = entry.venue_name.strip()
+            if entry.sponsor_label.strip():
+                cert_data["p"] = entry.sponsor_label.strip()
+        else:
+            cert_data = {
+                "n": name,
+                "c": course_for_db,
+                "d": entry.completion_date,
+                "i": lead,
+            }
+            if entry.certificate_kind == "internship":
+                cert_data["k"] = "i"
+                cert_data["u"] = entry.usn.strip()
+                cert_data["w"] = entry.internship_duration.strip()
+                cert_data["h"] = entry.internship_hours.strip()
+                cert_data["m"] = entry.mentor_name.strip()
+                if entry.institution_name.strip():
+                    cert_data["s"] = entry.institution_name.strip()
+        if unique_id:
+            cert_data, token, cert_id = _with_unique_cert_id(cert_data)
+        else:
+            token = _encode_cert(cert_data)
+            cert_id = _cert_id(cert_data)
+        p_email = entry.participant_email.strip() if entry.participant_email else ""
+        record = {
+            "certificate_id": cert_id,
+            "token": token,
+            "participant_name": name,
+            "course_name": course_for_db,
+            "completion_date": entry.completion_date,
+            "instructor_name": lead,
+            "client_ip": client_ip,
+            "participant_email": p_email,
+        }
+
+        shareable_url = f"{base_url}/certificate/{token}"
+        download_url = f"{shareable_url}/download"
+
+        email_job = None
+        if p_email:
+            email_kind, email_params = _certificate_email_params(
+                entry,
+                name=name,
+                course_name=course_for_db,
+                lead=lead,
+                recognition=recognition,
+                cert_id=cert_id,
+                view_url=shareable_url,
+                download_url=download_url,
+            )
+            email_job = (p_email, email_kind, email_params)
+
+        row = {
+            "index": i,
+            "status": "success",
+            "certificate_id": cert_id,
+            "participant_name": name,
+            "course_name": course_for_db,
+            "certificate_kind": entry.certificate_kind,
+            "url": shareable_url,
+            "download_url": download_url,
+        }
+        if entry.certificate_kind == "internship":
+            row["usn"] = entry.usn.strip()
+        elif entry.certificate_kind == "appreciation":
+            row["recognition_text"] = recognition
+        return row, record, email_job
+    except Exception as e:
+        return {"index": i, "status": "error", "error": str(e)}, None, None
+
+
+def _bulk_issue_chunk(
+    start: int,
+    entries,
+    *,
+    valid_courses: frozenset[str],
+    base_url: str,
+    client_ip: str,
+) -> list[dict]:
+    """Issue a chunk of bulk entries (run on a bulk worker; chunks of one job run in
+    parallel): one multi-row INSERT for the certificates and one for their queued emails. Each successful row reports ``db_status``:
+    ``stored``, ``duplicate`` (token already stored, e.g. an identical re-issue)
+    or ``failed`` (DB error; the certificate itself is still valid). Entries whose
+    certificate ID is held by a different certificate are re-signed with a
+    whole-payload ID and stored in a second INSERT."""
+    entries = list(entries)
+    prepare = functools.partial(
+        _bulk_prepare_entry, valid_courses=valid_courses, base_url=base_url, client_ip=client_ip
+    )
+    prepared = [prepare(start + offset, entry) for offset, entry in enumerate(entries)]
+    positions = [p for p, (_, record, _) in enumerate(prepared) if record is not None]
+    stored: list[dict | str | None] | None = None
+    if positions:
+        try:
+            stored = db.store_certificates_bulk([prepared[p][1] for p in positions])
+        except Exception as e:
+            logger.warning(f"Bulk: DB store failed for {len(positions)} entries (certs still valid): {e}")
+    taken = [k for k, outcome in enumerate(stored or []) if outcome == db.CERTIFICATE_ID_TAKEN]
+    if taken:
+        for k in taken:
+            p = positions[k]
+            prepared[p] = prepare(start + p, entries[p], unique_id=True)
+        try:
+            retried = db.store_certificates_bulk([prepared[positions[k]][1] for k in taken])
+        except Exception as e:  # noqa: BLE001 - the certificates are valid without a DB row
+            logger.warning(f"Bulk: DB store failed for {len(taken)} re-signed entries (certs still valid): {e}")
+        else:
+            for k, outcome in zip(taken, retried):
+                stored[k] = outcome
+    records = [prepared[p][1] for p in positions]
+    linked = _create_short_links([(r["certificate_id"], r["token"]) for r in records])
+    outcomes = iter(stored or [])
+
+    email_rows: list[dict] = []
+    email_jobs: list[tuple[str, str, dict]] = []
+    for row, record, email_job in prepared:
+        if record is None:
+            continue
+        if stored is None:
+            row["db_status"] = "failed"
+        else:
+            saved = next(outcomes)
+            if isinstance(saved, dict):
+                row["db_status"] = "stored"
+                row["id"] = saved["id"]
+            else:
+                row["db_status"] = "failed" if saved == db.CERTIFICATE_ID_TAKEN else "duplicate"
+        if (record["certificate_id"], record["token"]) in linked:
+            row["short_url"] = short_url(base_url, record["certificate_id"])
+        if email_job is None:
+            row.update(_NO_EMAIL)
+        else:
+            email_rows.append(row)
+            email_jobs.append(email_job)
+    for row, fields in zip(email_rows, _queue_certificate_emails(email_jobs)):
+        row.update(fields)
+    return [row for row, _, _ in prepared]
+
+
+BULK_SYNC_MAX_ENTRIES = 500
+BULK_JOB_MAX_ENTRIES = _env_int("BULK_JOB_MAX_ENTRIES", 10000)
+BULK_WORKERS = _env_int("BULK_WORKERS", 8)
+# Entries per worker task. Chunks stay small so a cohort spreads across all
+# BULK_WORKERS; each chunk still stores its rows with one multi-row INSERT.
+BULK_CHUNK_SIZE = _env_int("BULK_CHUNK_SIZE", 25)
+_bulk_jobs = BulkJobRegistry(workers=BULK_WORKERS, chunk_size=BULK_CHUNK_SIZE)
+
+
+async def _start_bulk_job(request: BulkCertificateRequest, req: Request, max_entries: int) -> BulkJob:
     if not request.entries:
         raise HTTPException(status_code=400, detail="No entries provided")
-    if len(request.entries) > 500:
-        raise HTTPException(status_code=400, detail="Maximum 500 certificates per batch")
+    if len(request.entries) > max_entries:
+        raise HTTPException(status_code=400, detail=f"Maximum {max_entries} certificates per batch")
 
-    valid_courses = set(_get_course_names())
+    await _refresh_course_cache_async()
+    valid_courses = _active_course_set()
     base_url = str(req.base_url).rstrip("/")
     client_ip = req.client.host if req.client else "admin-bulk"
-    results = []
 
-    for i, entry in enumerate(request.entries):
-        recognition = ""
-        name = entry.participant_name.strip()
-        if not name:
-            results.append({"index": i, "status": "error", "error": "Participant name is required"})
-            continue
+    job_id = str(uuid_mod.uuid4())
 
-        if entry.certificate_kind == "appreciation":
-            recognition = entry.recognition_text.strip()
-            if not recognition:
-                recognition = _default_appreciation_recognition(entry.venue_name)
-            if not recognition:
-                results.append({
-                    "index": i,
-                    "status": "error",
-                    "error": "Appreciation entry requires recognition_text or venue_name",
-                })
-                continue
-            course_for_db = (
-                entry.event_name.strip()
-                or entry.course_name.strip()
-                or "Sports Event"
-            )
-        elif entry.course_name not in valid_courses:
-            results.append({"index": i, "status": "error", "error": f"Unknown course: {entry.course_name}"})
-            continue
-        else:
-            course_for_db = entry.course_name
+    def _process_chunk(start: int, entries) -> list[dict]:
+        results = _bulk_issue_chunk(
+            start,
+            entries,
+            valid_courses=valid_courses,
+            base_url=base_url,
+            client_ip=client_ip,
+        )
+        if request.callback_url:
+            _notify_bulk_chunk(request.callback_url, request.callback_mode, job_id, results)
+        return results
+
+    return _bulk_jobs.submit(request.entries, _process_chunk, job_id=job_id)
+
+
+def _notify_bulk_chunk(callback_url: str, mode: str, job_id: str, results: list[dict]) -> None:
+    created = [r for r in results if r.get("status") == "success"]
+    if not created:
+        return
+    if mode == "each":
+        for row in created:
+            _fire_webhook(callback_url, "certificate.created", {**row, "job_id": job_id})
+        return
+    _fire_webhook(callback_url, "certificates.created", {
+        "job_id": job_id,
+        "count": len(created),
+        "certificates": created,
+    })
 
-        if entry.certificate_kind == "internship":
-            miss = []
-            if not entry.usn.strip():
-                miss.append("usn")
-            if not entry.internship_duration.strip():
-                miss.append("internship_duration")
-            if not entry.internship_hours.strip():
-                miss.append("internship_hours")
-            if not entry.mentor_name.strip():
-                miss.append("mentor_name")
-            if miss:
-                results.append({
-                    "index": i,
-                    "status": "error",
-                    "error": "Internship entry requires: " + ", ".join(miss),
-                })
-                continue
 
-        try:
-            lead = entry.instructor_name.strip() or "IntelliForge AI Team"
-            if entry.certificate_kind == "appreciation":
-                cert_data = {
-                    "k": "a",
-                    "n": name,
-                    "c": course_for_db,
-                    "d": entry.completion_date,
-                    "r": recognition,
-                    "i": lead,
-                }
-                if entry.event_name.strip():
-                    cert_data["e"] = entry.event_name.strip()
-                if entry.venue_name.strip():
-                    cert_data["v"] = entry.venue_name.strip()
-                if entry.sponsor_label.strip():
-                    cert_data["p"] = entry.sponsor_label.strip()
-            else:
-                cert_data = {
-                    "n": name,
-                    "c": course_for_db,
-                    "d": entry.completion_date,
-                    "i": lead,
-                }
-                if entry.certificate_kind == "internship":
-                    cert_data["k"] = "i"
-                    cert_data["u"] = entry.usn.strip()
-                    cert_data["w"] = entry.internship_duration.strip()
-                    cert_data["h"] = entry.internship_hours.strip()
-                    cert_data["m"] = entry.mentor_name.strip()
-                    if entry.institution_name.strip():
-                        cert_data["s"] = entry.institution_name.strip()
-            token = _encode_cert(cert_data)
-            cert_id = _cert_id(cert_data)
-            p_email = entry.participant_email.strip() if entry.participant_email else ""
+def _log_bulk_job(job: BulkJob) -> None:
+    logger.info(f"Bulk generation: {job.succeeded} succeeded, {job.failed} failed out of {job.total} entries")
 
-            try:
-                db.store_certificate(
-                    certificate_id=cert_id,
-                    token=token,
-                    participant_name=name,
-                    course_name=course_for_db,
-                    completion_date=entry.completion_date,
-                    instructor_name=lead,
-                    client_ip=client_ip,
-                    participant_email=p_email,
-                )
-            except Exception as e:
-                logger.warning(f"Bulk: DB store failed for {name} (cert still valid): {e}")
-
-            shareable_url = f"{base_url}/certificate/{token}"
-            download_url = f"{shareable_url}/download"
-
-            email_sent = False
-            email_error = ""
-            if p_email:
-                def _send_bulk_email():
-                    if entry.certificate_kind == "internship":
-                        return _send_internship_certificate_email(
-                            to_email=p_email,
-                            participant_name=name,
-                            course_name=course_for_db,
-                            completion_date=entry.completion_date,
-                            instructor_name=lead,
-                            mentor_name=entry.mentor_name.strip(),
-                            usn=entry.usn.strip(),
-                            duration_text=entry.internship_duration.strip(),
-                            hours_text=entry.internship_hours.strip(),
-                            certificate_id=cert_id,
-                            view_url=shareable_url,
-                            download_url=download_url,
-                        )
-                    email_label = (
-                        recognition[:80] + "…"
-                        if entry.certificate_kind == "appreciation" and len(recognition) > 80
-                        else course_for_db
-                    )
-                    return _send_certificate_email(
-                        to_email=p_email,
-                        participant_name=name,
-                        course_name=email_label,
-                        completion_date=entry.completion_date,
-                        instructor_name=lead,
-                        certificate_id=cert_id,
-                        view_url=shareable_url,
-                        download_url=download_url,
-                    )
 
-                email_result = _run_with_timeout(
-                    _send_bulk_email,
-                    EMAIL_SEND_TIMEOUT_SEC,
-                    f"Email delivery timed out for {p_email}",
-                )
-                if email_result is None:
-                    email_sent = False
-                    email_error = "Email delivery timed out. Share the certificate link instead."
-                else:
-                    email_sent, email_error = email_result
+async def _stream_job_results(job: BulkJob, after: int = 0):
+    """NDJSON lines of per-entry results as they complete; a blank line every
+    few seconds keeps proxies from timing out an idle stream."""
+    sent = max(0, after)
+    while True:
+        for row in job.results_since(sent):
+            sent += 1
+            yield json.dumps(row, default=str) + "\n"
+        if job.done and sent >= len(job.results):
+            break
+        if not await asyncio.to_thread(job.wait_for, sent, 10.0):
+            yield "\n"
+    _log_bulk_job(job)
 
-            row = {
-                "index": i,
-                "status": "success",
-                "certificate_id": cert_id,
-                "participant_name": name,
-                "course_name": course_for_db,
-                "certificate_kind": entry.certificate_kind,
-                "url": shareable_url,
-                "download_url": download_url,
-                "email_sent": email_sent,
-                "email_error": email_error,
-            }
-            if entry.certificate_kind == "internship":
-                row["usn"] = entry.usn.strip()
-            elif entry.certificate_kind == "appreciation":
-                row["recognition_text"] = recognition
-            results.append(row)
-        except Exception as e:
-            results.append({"index": i, "status": "error", "error": str(e)})
 
-    succeeded = sum(1 for r in results if r["status"] == "success")
-    failed = sum(1 for r in results if r["status"] == "error")
-    logger.info(f"Bulk generation: {succeeded} succeeded, {failed} failed out of {len(request.entries)} entries")
+@app.post("/api/admin/certificates/bulk", tags=["Admin"])
+async def admin_bulk_generate(request: BulkCertificateRequest, req: Request):
+    """Generate up to 500 certificates in a single request. Each entry is validated independently.
+
+    Entries are signed and stored in chunks of BULK_CHUNK_SIZE across BULK_WORKERS threads;
+    for larger cohorts or streamed progress use POST /api/admin/jobs/bulk.
+    """
+    _require_admin(req)
+    await _require_db()
+    job = await _start_bulk_job(request, req, BULK_SYNC_MAX_ENTRIES)
+    await asyncio.to_thread(job.wait)
+    _log_bulk_job(job)
+    results = sorted(job.results_since(0), key=lambda r: r["index"])
+    return {"total": job.total, "succeeded": job.succeeded, "failed": job.failed, "results": results}
+
+
+@app.post("/api/admin/jobs/bulk", tags=["Admin"], status_code=202)
+async def admin_start_bulk_job(request: BulkCertificateRequest, req: Request, stream: bool = False):
+    """Start a bulk issuance job (up to BULK_JOB_MAX_ENTRIES entries) processed on a bounded worker pool.
+
+    Returns 202 with the job id. Poll GET /api/admin/jobs/{job_id} for progress and read per-entry
+    results as NDJSON from GET /api/admin/jobs/{job_id}/results. With ``?stream=1`` the results
+    stream is returned directly from this request (recommended on serverless hosts).
+    """
+    _require_admin(req)
+    await _require_db()
+    job = await _start_bulk_job(request, req, BULK_JOB_MAX_ENTRIES)
+    if stream:
+        return StreamingResponse(
+            _stream_job_results(job),
+            media_type="application/x-ndjson",
+            headers={"X-Job-Id": job.id},
+        )
+    base_url = str(req.base_url).rstrip("/")
+    return JSONResponse(
+        {
+            **job.summary(),
+            "status_url": f"{base_url}/api/admin/jobs/{job.id}",
+            "results_url": f"{base_url}/api/admin/jobs/{job.id}/results",
+        },
+        status_code=202,
+    )
+
+
+def _get_bulk_job(job_id: str) -> BulkJob:
+    job = _bulk_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (jobs are kept for an hour on the instance that ran them)")
+    return job
+
+
+@app.get("/api/admin/jobs/{job_id}", tags=["Admin"])
+async def admin_bulk_job_status(job_id: str, req: Request):
+    """Progress of a bulk issuance job."""
+    _require_admin(req)
+    return _get_bulk_job(job_id).summary()
+
+
+@app.get("/api/admin/jobs/{job_id}/results", tags=["Admin"])
+async def admin_bulk_job_results(job_id: str, req: Request, after: int = 0):
+    """Per-entry results as NDJSON, streamed until the job finishes. ``after`` skips results already read."""
+    _require_admin(req)
+    job = _get_bulk_job(job_id)
+    return StreamingResponse(_stream_job_results(job, after), media_type="application/x-ndjson")
+
 
-    return {"total": len(request.entries), "succeeded": succeeded, "failed": failed, "results": results}
+@app.on_event("shutdown")
+def _shutdown_bulk_jobs() -> None:
+    _bulk_jobs.shutdown()
 
 
 @app.get("/api/admin/courses", tags=["Admin"])
 async def admin_list_courses(req: Request):
     _require_admin(req)
-    _require_db()
-    return {"courses": db.get_courses(active_only=False)}
+    await _require_db()
+    return {"courses": await _run_db(db.get_courses, active_only=False)}
 
 
 class CourseCreateRequest(BaseModel):
@@ -2747,12 +3745,14 @@ class CourseCreateRequest(BaseModel):
 @app.post("/api/admin/courses", tags=["Admin"])
 async def admin_add_course(request: CourseCreateRequest, req: Request):
     _require_admin(req)
-    _require_db()
+    await _require_db()
     name = request.name.strip()
     if not name:
         raise HTTPException(status_code=400, detail="Course name is required")
     try:
-        return db.add_course(name, request.description)
+        course = await _run_db(db.add_course, name, request.description)
+        _invalidate_course_cache()
+        return course
     except Exception as e:
         if "duplicate" in str(e).lower() or "unique" in str(e).lower():
             raise HTTPException(status_code=409, detail=f"Course '{name}' already exists")
@@ -2766,10 +3766,11 @@ class CourseToggleRequest(BaseModel):
 @app.patch("/api/admin/courses/{course_id}", tags=["Admin"])
 async def admin_toggle_course(course_id: int, request: CourseToggleRequest, req: Request):
     _require_admin(req)
-    _require_db()
-    result = db.toggle_course(course_id, request.active)
+    await _require_db()
+    result = await _run_db(db.toggle_course, course_id, request.active)
     if not result:
         raise HTTPException(status_code=404, detail="Course not found")
+    _invalidate_course_cache()
     return result
 
 
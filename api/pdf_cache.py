@@ -0,0 +1,196 @@
+"""Content-addressed cache for rendered certificate and invoice PDFs.
+
+Tokens are immutable, so a rendered PDF only changes when the payload, the
+verify URL baked into its QR code, or the template/branding version changes.
+Entries are keyed by a SHA-256 over exactly those inputs.
+
+Two tiers:
+- an in-process LRU bounded by total bytes (always on), and
+- an optional local-disk tier (``PDF_CACHE_DIR``) that survives worker
+  recycling on the same host. Disk hits are promoted back into memory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_cache_key(kind: str, payload: dict, *parts: str) -> str:
+    """Stable cache key for a rendered document.
+
+    ``payload`` is the decoded token payload; ``parts`` carries anything else
+    that changes the rendered bytes (verify URL, template/branding version).
+    """
+    h = hashlib.sha256()
+    h.update(kind.encode())
+    h.update(b"\x00")
+    h.update(json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode())
+    for part in parts:
+        h.update(b"\x00")
+        h.update((part or "").encode())
+    return h.hexdigest()
+
+
+class PdfCache:
+    """Thread-safe two-tier (memory LRU + optional disk) cache of PDF bytes."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        disk_dir: str = "",
+        *,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        # A single entry may take at most a quarter of the budget so one huge
+        # document cannot flush every other entry.
+        self.max_entry_bytes = self.max_bytes // 4
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = max(0, int(disk_max_bytes))
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._disk_size = -1
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning("PDF cache disk tier disabled (%s): %s", self.disk_dir, e)
+                self.disk_dir = ""
+
+    # ── memory tier ───────────────────────────────────────────────────
+
+    def _mem_get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def _mem_put(self, key: str, data: bytes) -> None:
+        size = len(data)
+        if not self.max_bytes or size > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    # ── disk tier ─────────────────────────────────────────────────────
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pdf")
+
+    def _disk_get(self, key: str) -> bytes | None:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("PDF cache disk read failed: %s", e)
+            return None
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("PDF cache disk write failed: %s", e)
+            return
+        if self.disk_max_bytes:
+            with self._lock:
+                if self._disk_size >= 0:
+                    self._disk_size += len(data)
+                over = self._disk_size < 0 or self._disk_size > self.disk_max_bytes
+            if over:
+                self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Drop the least recently written files until the tier is at 90% of its budget."""
+        files: list[tuple[float, int, str]] = []
+        total = 0
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith(".pdf"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        if total > self.disk_max_bytes:
+            target = int(self.disk_max_bytes * 0.9)
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_size = total
+
+    # ── public API ────────────────────────────────────────────────────
+
+    def get(self, key: str) -> bytes | None:
+        data = self._mem_get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        data = self._disk_get(key)
+        if data is not None:
+            self.disk_hits += 1
+            self._mem_put(key, data)
+            return data
+        self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        self._mem_put(key, data)
+        self._disk_put(key, data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = len(self._entries), self._size
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "disk": bool(self.disk_dir),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
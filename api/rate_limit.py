@@ -0,0 +1,123 @@
+"""Sliding-window rate limiting with bounded memory.
+
+Each key keeps two counters: requests in the current fixed window and in the
+previous one. The sliding estimate weights the previous window by how much of
+it still overlaps the last ``window`` seconds, which approximates a true
+sliding log in O(1) time and constant space per key.
+
+``MemoryRateLimiter`` holds at most ``max_keys`` keys in LRU order and drops
+keys whose windows have fully expired, so a stream of one-off client IPs can
+not grow it without bound. ``PostgresRateLimiter`` keeps the counters in an
+UNLOGGED table (SQL in api/db.py) so every instance shares one budget; it falls
+back to a local limiter while the database is unreachable.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# (allowed, limit, remaining, seconds until the current window ends)
+Decision = tuple[bool, int, int, int]
+
+
+def _prev_weight(window: float, now: float) -> float:
+    """Share of the previous window still inside the last ``window`` seconds."""
+    return 1.0 - (now % window) / window
+
+
+def _decide(prev: int, curr: int, limit: int, window: float, now: float) -> tuple[bool, float]:
+    estimate = prev * _prev_weight(window, now) + curr
+    return estimate + 1 <= limit, estimate
+
+
+def _reset_in(window: float, now: float) -> int:
+    return max(1, math.ceil(window - (now % window)))
+
+
+class MemoryRateLimiter:
+    """Process-local limiter; O(1) per hit, at most ``max_keys`` keys."""
+
+    backend = "memory"
+
+    def __init__(self, window: float = 60.0, *, max_keys: int = 10000) -> None:
+        self.window = float(window)
+        self.max_keys = max(1, int(max_keys))
+        # key -> [window index, previous window count, current window count]
+        self._entries: OrderedDict[str, list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, now: float | None = None) -> Decision:
+        now = time.time() if now is None else now
+        idx = int(now // self.window)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = [idx, 0, 0]
+                self._entries[key] = entry
+            else:
+                self._entries.move_to_end(key)
+                if entry[0] != idx:
+                    entry[1] = entry[2] if entry[0] == idx - 1 else 0
+                    entry[2] = 0
+                    entry[0] = idx
+            allowed, estimate = _decide(entry[1], entry[2], limit, self.window, now)
+            if allowed:
+                entry[2] += 1
+                estimate += 1
+            self._evict_locked(idx)
+        return allowed, limit, max(0, int(limit - estimate)), _reset_in(self.window, now)
+
+    def _evict_locked(self, idx: int) -> None:
+        # Least recently used first: drop keys idle for two full windows, then enforce the cap.
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest[0] >= idx - 1 and len(self._entries) <= self.max_keys:
+                break
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": self.backend, "keys": len(self._entries), "max_keys": self.max_keys}
+
+
+class PostgresRateLimiter:
+    """Shared counters in the ``rate_limit_counters`` UNLOGGED table.
+
+    Every hit is one conditional upsert round trip, so call it off the event
+    loop. Like the memory limiter, denied requests are not counted.
+    """
+
+    backend = "postgres"
+    PRUNE_PROBABILITY = 0.01
+
+    def __init__(self, db_module, window: float = 60.0, *, fallback: MemoryRateLimiter | None = None) -> None:
+        self._db = db_module
+        self.window = float(window)
+        self.fallback = fallback or MemoryRateLimiter(window)
+        self.fallbacks = 0
+
+    def hit(self, key: str, limit: int, now: float | None = None) -> Decision:
+        now = time.time() if now is None else now
+        idx = int(now // self.window)
+        weight = _prev_weight(self.window, now)
+        try:
+            prev, curr, allowed = self._db.rate_limit_hit(key, idx, limit, weight)
+            if random.random() < self.PRUNE_PROBABILITY:
+                self._db.rate_limit_prune(idx - 1)
+        except Exception as e:  # noqa: BLE001 - any backend failure falls back to the local limiter
+            self.fallbacks += 1
+            logger.warning(f"Shared rate limiter unavailable, limiting locally: {e}")
+            return self.fallback.hit(key, limit, now)
+        # The upsert made the decision and, only when allowed, counted this request.
+        estimate = prev * weight + curr
+        return allowed, limit, max(0, int(limit - estimate)), _reset_in(self.window, now)
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "fallbacks": self.fallbacks, "local": self.fallback.stats()}
@@ -0,0 +1,106 @@
+"""Off-loop execution for CPU-bound PDF rendering.
+
+xhtml2pdf and ReportLab hold the GIL for the whole render, so calling them from
+an ``async def`` handler stalls every other request on the worker. Renders go
+through a ``ProcessPoolExecutor`` sized to the cores instead; workers run an
+initializer once (templates, fonts, signature images) so the first real render
+in each process is not a cold one.
+
+Where process pools are unavailable (AWS Lambda / Vercel have no /dev/shm for
+multiprocessing semaphores) or ``workers`` is 0, renders fall back to a small
+thread pool, which still keeps the event loop free.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class RenderPool:
+    """Lazily created executor for render callables (must be picklable top-level functions)."""
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        initializer: Callable[[], None] | None = None,
+        start_method: str = "spawn",
+        thread_workers: int = 4,
+    ) -> None:
+        self.workers = max(0, int(workers))
+        self.initializer = initializer
+        self.start_method = start_method
+        self.thread_workers = max(1, int(thread_workers))
+        self.mode = "process" if self.workers else "thread"
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _create(self) -> Executor:
+        if self.mode == "process":
+            try:
+                ctx = multiprocessing.get_context(self.start_method)
+                return ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=ctx,
+                    initializer=self.initializer,
+                )
+            except (OSError, ValueError, NotImplementedError, ImportError) as e:
+                logger.warning(f"PDF render process pool unavailable, using threads: {e}")
+                self.mode = "thread"
+        return ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="pdf-render")
+
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._create()
+        return self._executor
+
+    def _reset(self, broken: Executor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` off the event loop and await the result."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        executor = self.executor()
+        try:
+            return await loop.run_in_executor(executor, call)
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault in a C extension); rebuild once and retry.
+            logger.warning("PDF render pool broken; restarting workers")
+            self._reset(executor)
+            return await loop.run_in_executor(self.executor(), call)
+
+    def warm(self) -> None:
+        """Start workers now instead of on the first render."""
+        executor = self.executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            for _ in range(self.workers):
+                executor.submit(int)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.mode == "process" else self.thread_workers,
+            "started": self._executor is not None,
+        }
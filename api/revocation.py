@@ -0,0 +1,100 @@
+"""In-memory revocation set for the verify path.
+
+Revocations are rare and almost every verify answers "not revoked", so each
+instance keeps the revoked token hashes as a sorted ``array('Q')`` of their
+first 8 bytes (8 bytes per revoked certificate). A token whose prefix is not in
+the array is not revoked, with no database round trip. A prefix hit is only a
+candidate and is confirmed against the full hash in the database.
+
+``revoke_certificate`` (api/db.py) bumps the ``revocation_epoch`` counter in
+app_state and stamps the row with the new value (``revoked_seq``) in the same
+transaction. Revocations serialize on the app_state row, so sequence numbers
+follow commit order and a refresh only fetches ``revoked_seq > epoch``. The
+counter is checked at most once per ``refresh_interval`` seconds, which bounds
+how stale an instance can be; a revoke on this instance marks the set stale so
+it refreshes on the next request.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+
+def hash_prefix(token_hash: str) -> int:
+    """First 8 bytes of a hex SHA-256 token hash as an unsigned int."""
+    return int(token_hash[:16], 16)
+
+
+class RevocationSet:
+    def __init__(self, db_module, *, refresh_interval: float = 30.0) -> None:
+        self.db = db_module
+        self.refresh_interval = max(0.0, float(refresh_interval))
+        self._prefixes = array("Q")
+        self.epoch = 0
+        self.loaded = False
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.confirms = 0
+
+    def refresh_due(self) -> bool:
+        return time.monotonic() >= self._next_check
+
+    def mark_stale(self) -> None:
+        self._next_check = 0.0
+
+    def refresh(self) -> None:
+        """Pick up revocations newer than the known epoch. Never raises; keeps the old set on error."""
+        with self._lock:
+            if not self.refresh_due():
+                return
+            try:
+                # Epoch first: a revocation committed in between is fetched now and
+                # again next time, never skipped.
+                epoch = self.db.get_state_version(self.db.REVOCATION_EPOCH_KEY)
+                if self.loaded and epoch == self.epoch:
+                    self._next_check = time.monotonic() + self.refresh_interval
+                    return
+                since = self.epoch if self.loaded else -1
+                hashes = self.db.revoked_hashes_since(since)
+            except Exception as e:  # noqa: BLE001 - keep serving the last loaded set
+                logger.warning(f"Revocation set refresh failed (keeping epoch {self.epoch}): {e}")
+                self._next_check = time.monotonic() + min(self.refresh_interval, 5.0)
+                return
+            if hashes:
+                merged = set(self._prefixes)
+                merged.update(hash_prefix(h) for h in hashes)
+                self._prefixes = array("Q", sorted(merged))
+            self.epoch = epoch
+            self.loaded = True
+            self.refreshes += 1
+            self._next_check = time.monotonic() + self.refresh_interval
+
+    def candidates(self, token_hashes) -> list[str]:
+        """Hashes whose prefix is in the set; only these can be revoked."""
+        prefixes = self._prefixes
+        if not prefixes:
+            return []
+        out = []
+        for h in token_hashes:
+            p = hash_prefix(h)
+            i = bisect_left(prefixes, p)
+            if i < len(prefixes) and prefixes[i] == p:
+                out.append(h)
+        self.confirms += bool(out)
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "epoch": self.epoch,
+            "revoked": len(self._prefixes),
+            "refreshes": self.refreshes,
+            "confirms": self.confirms,
+        }
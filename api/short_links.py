@@ -0,0 +1,101 @@
+"""Short certificate links: ``/c/<certificate_id>`` → full signed token.
+
+Self-contained tokens make printed QR codes dense. With short links enabled the
+token is also stored in the ``certificate_links`` table (SQL in api/db.py),
+keyed by the certificate's display id (``CERT-`` + 12 hex digits, upper case).
+A short URL such as ``HTTPS://EXAMPLE.COM/C/CERT-1A2B3C4D5E6F`` only uses QR
+alphanumeric characters, so it encodes in a low QR version. The token stays
+the canonical proof: ``/c/<id>`` redirects to ``/certificate/<token>``, which
+verifies it as before.
+
+Links are immutable once written, so resolved ids are kept in an in-memory LRU
+and a viewer lookup is at most one primary-key read. Two payloads can share a
+display id (e.g. the same participant, course and date with a different
+instructor); the first one keeps the link and the other is served by its long
+URL only.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+CERTIFICATE_ID_RE = re.compile(r"^CERT-[0-9A-F]{12}$")
+
+
+def normalize_certificate_id(short_id: str) -> str | None:
+    """Upper-cased id if it looks like a certificate id (``CERT-`` + 12 hex), else None."""
+    short_id = short_id.strip().upper()
+    return short_id if CERTIFICATE_ID_RE.match(short_id) else None
+
+
+def short_url(base_url: str, short_id: str) -> str:
+    """``<BASE>/C/<id>`` with scheme and host upper-cased (both are case-insensitive)
+    so the whole URL stays in the QR alphanumeric set when the base has no path."""
+    parts = urlsplit(base_url.rstrip("/"))
+    base = urlunsplit((parts.scheme.upper(), parts.netloc.upper(), parts.path, "", ""))
+    return f"{base}/C/{short_id}"
+
+
+class ShortLinkStore:
+    def __init__(self, db_module, *, cache_size: int = 10000) -> None:
+        self.db = db_module
+        self.cache_size = max(1, int(cache_size))
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.conflicts = 0
+
+    def _remember(self, short_id: str, token: str) -> None:
+        with self._lock:
+            self._cache[short_id] = token
+            self._cache.move_to_end(short_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cached(self, short_id: str) -> str | None:
+        with self._lock:
+            token = self._cache.get(short_id)
+            if token is not None:
+                self._cache.move_to_end(short_id)
+            return token
+
+    def create(self, short_id: str, token: str) -> bool:
+        """Link ``short_id`` to ``token``. True if the link now points at this token."""
+        return (short_id, token) in self.create_many([(short_id, token)])
+
+    def create_many(self, links: list[tuple[str, str]]) -> set[tuple[str, str]]:
+        """Insert links in one statement; returns the (short_id, token) pairs that are linked."""
+        linked = {(s, t) for s, t in links if self._cached(s) == t}
+        pending = [link for link in links if link not in linked]
+        if not pending:
+            return linked
+        stored = self.db.store_short_links(pending)
+        for short_id, token in pending:
+            current = stored.get(short_id)
+            if current is None:
+                continue
+            self._remember(short_id, current)
+            if current == token:
+                linked.add((short_id, token))
+            else:
+                self.conflicts += 1
+        return linked
+
+    def resolve(self, short_id: str) -> str | None:
+        """Token for ``short_id``, or None if no link exists."""
+        token = self._cached(short_id)
+        if token is not None:
+            return token
+        token = self.db.get_short_link(short_id)
+        if token is not None:
+            self._remember(short_id, token)
+        return token
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"cached": len(self._cache), "max_cached": self.cache_size, "conflicts": self.conflicts}
@@ -0,0 +1,292 @@
+"""Signed certificate token codec.
+
+Three token layouts are accepted:
+
+- ``<payload>.<sig>``: the original format, signed with the legacy secret
+  (``CERT_SECRET_KEY``). Every certificate issued before key IDs existed.
+- ``<kid>.<payload>.<sig>``: signed with the key named ``kid``, so a verifier
+  goes straight to the right secret instead of trying each one.
+- ``<binary>`` (no dots): unpadded base64url of a versioned binary record,
+  described below. Used for certificate payloads when ``binary=True``.
+
+In the JSON layouts ``payload`` is unpadded base64url of sorted, compact JSON
+and ``sig`` the hex HMAC-SHA256 of everything before it. HMAC states are keyed
+once at start-up and copied per token, and successful decodes are kept in a
+small LRU so tokens that are viewed, downloaded and verified repeatedly are
+parsed once.
+
+Binary record (version 1)::
+
+    0x01 | kid length | kid | field* | MAC (first 16 bytes of HMAC-SHA256)
+
+The MAC covers the raw bytes before it, so it does not depend on the text
+encoding. Each field is a tag byte whose low five bits pick the key from
+BINARY_FIELDS, followed by either a varint index into INTERNED (tag bit 0x80),
+a varint day count since 2000-01-01 for ISO dates (bit 0x40), or a varint
+length and UTF-8 bytes. Payloads with other keys or non-string values (e.g.
+invoices) fall back to JSON.
+
+Rotation: add a new key at the front of the key list (it signs new tokens) and
+keep the old ones (and the legacy secret) for as long as their certificates
+must verify.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import date
+
+KID_RE = re.compile(r"^[A-Za-z0-9_-]{1,8}$")
+
+BINARY_VERSION = 1
+BINARY_MAC_BYTES = 16
+_TAG_INTERNED = 0x80
+_TAG_DATE = 0x40
+_FIELD_MASK = 0x1F
+_EPOCH = date(2000, 1, 1).toordinal()
+
+# Field ids are positions in this tuple (+1). Append only.
+BINARY_FIELDS = ("n", "c", "d", "i", "k", "u", "w", "h", "m", "s", "r", "e", "v", "p", "x")
+_FIELD_IDS = {key: i + 1 for i, key in enumerate(BINARY_FIELDS)}
+
+# Frequent course and issuer strings, stored as a one-byte index. Append only:
+# reordering or removing an entry changes the meaning of issued tokens.
+INTERNED = (
+    "AI Product Development Fundamentals",
+    "Building AI-Powered Applications",
+    "Prompt Engineering & LLM Integration",
+    "Full-Stack AI Development",
+    "AI Product Design & UX",
+    "Digital Profile Creation",
+    "Deploying AI Solutions",
+    "AI Code Reviewer Course",
+    "VTU Industry Internship – IntelliForge AI Programme",
+    "RAG Systems & Architecture Masterclass",
+    "IntelliForge AI Team",
+    "Certificate Team",
+    "Sports Event",
+)
+_INTERNED_IDS = {value: i for i, value in enumerate(INTERNED)}
+
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+        if shift > 35:
+            raise ValueError("varint too long")
+
+
+def _iso_day(value: str) -> int | None:
+    if len(value) != 10:
+        return None
+    try:
+        d = date.fromisoformat(value)
+    except ValueError:
+        return None
+    days = d.toordinal() - _EPOCH
+    return days if days >= 0 and d.isoformat() == value else None
+
+
+def _pack_fields(data: dict) -> bytes | None:
+    """Binary field section for ``data``, or None if it has keys/values the format can't hold."""
+    out = bytearray()
+    for key in sorted(data, key=lambda k: _FIELD_IDS.get(k, 0)):
+        field = _FIELD_IDS.get(key)
+        value = data[key]
+        if field is None or not isinstance(value, str):
+            return None
+        if value in _INTERNED_IDS:
+            out.append(field | _TAG_INTERNED)
+            _put_varint(out, _INTERNED_IDS[value])
+            continue
+        days = _iso_day(value) if key == "d" else None
+        if days is not None:
+            out.append(field | _TAG_DATE)
+            _put_varint(out, days)
+            continue
+        raw = value.encode()
+        out.append(field)
+        _put_varint(out, len(raw))
+        out += raw
+    return bytes(out)
+
+
+def _unpack_fields(buf: bytes, pos: int, end: int) -> dict:
+    data: dict[str, str] = {}
+    while pos < end:
+        tag = buf[pos]
+        pos += 1
+        field = tag & _FIELD_MASK
+        if not 1 <= field <= len(BINARY_FIELDS):
+            raise ValueError(f"unknown field id {field}")
+        key = BINARY_FIELDS[field - 1]
+        if tag & _TAG_INTERNED:
+            idx, pos = _get_varint(buf, pos)
+            data[key] = INTERNED[idx]
+        elif tag & _TAG_DATE:
+            days, pos = _get_varint(buf, pos)
+            data[key] = date.fromordinal(_EPOCH + days).isoformat()
+        else:
+            n, pos = _get_varint(buf, pos)
+            if pos + n > end:
+                raise ValueError("field overruns record")
+            data[key] = buf[pos:pos + n].decode()
+            pos += n
+    return data
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def parse_keys(raw: str) -> list[tuple[str, str]]:
+    """``"kid:secret,kid:secret"`` → [(kid, secret), ...]; the first pair signs new tokens."""
+    keys: list[tuple[str, str]] = []
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        kid, sep, secret = item.partition(":")
+        kid, secret = kid.strip(), secret.strip()
+        if not sep or not KID_RE.match(kid) or not secret:
+            raise ValueError(f"Invalid key entry {kid or item[:8]!r}: expected kid:secret, kid 1-8 of [A-Za-z0-9_-]")
+        if any(k == kid for k, _ in keys):
+            raise ValueError(f"Duplicate key id {kid!r}")
+        keys.append((kid, secret))
+    return keys
+
+
+class TokenCodec:
+    def __init__(
+        self,
+        *,
+        legacy_secret: str = "",
+        keys: list[tuple[str, str]] | None = None,
+        cache_size: int = 4096,
+        binary: bool = False,
+    ) -> None:
+        if not legacy_secret and not keys:
+            raise ValueError("TokenCodec needs a legacy secret or at least one keyed secret")
+        self._legacy = hmac.new(legacy_secret.encode(), digestmod=hashlib.sha256) if legacy_secret else None
+        self._keyed = {kid: hmac.new(secret.encode(), digestmod=hashlib.sha256) for kid, secret in keys or ()}
+        self.active_kid = keys[0][0] if keys else None
+        self.binary = binary
+        self.cache_size = max(0, int(cache_size))
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sign(self, base, message: str) -> str:
+        mac = base.copy()
+        mac.update(message.encode())
+        return mac.hexdigest()
+
+    def _mac(self, base, message: bytes) -> bytes:
+        mac = base.copy()
+        mac.update(message)
+        return mac.digest()[:BINARY_MAC_BYTES]
+
+    def encode(self, data: dict) -> str:
+        if self.binary:
+            fields = _pack_fields(data)
+            if fields is not None:
+                kid = (self.active_kid or "").encode()
+                base = self._keyed[self.active_kid] if self.active_kid else self._legacy
+                record = bytes((BINARY_VERSION, len(kid))) + kid + fields
+                return _b64encode(record + self._mac(base, record))
+        compact = json.dumps(data, separators=(",", ":"), sort_keys=True)
+        payload = _b64encode(compact.encode())
+        if self.active_kid is None:
+            return f"{payload}.{self._sign(self._legacy, payload)}"
+        signed = f"{self.active_kid}.{payload}"
+        return f"{signed}.{self._sign(self._keyed[self.active_kid], signed)}"
+
+    def verify(self, token: str) -> str | None:
+        """The payload part of ``token`` if its signature checks out, else None."""
+        signed, sep, sig = token.rpartition(".")
+        if not sep:
+            return None
+        kid, dot, payload = signed.partition(".")
+        if dot:
+            base = self._keyed.get(kid)
+        else:
+            base, payload = self._legacy, signed
+        if base is None:
+            return None
+        if not hmac.compare_digest(sig, self._sign(base, signed)):
+            return None
+        return payload
+
+    def _decode_binary(self, token: str) -> dict | None:
+        try:
+            record = _b64decode(token)
+            if len(record) < 2 + BINARY_MAC_BYTES or record[0] != BINARY_VERSION:
+                return None
+            body, mac = record[:-BINARY_MAC_BYTES], record[-BINARY_MAC_BYTES:]
+            kid_end = 2 + record[1]
+            kid = body[2:kid_end].decode()
+            base = self._keyed.get(kid) if kid else self._legacy
+            if base is None or not hmac.compare_digest(mac, self._mac(base, body)):
+                return None
+            return _unpack_fields(body, kid_end, len(body))
+        except (ValueError, IndexError, UnicodeDecodeError):
+            return None
+
+    def decode(self, token: str) -> dict | None:
+        """Verified certificate data, or None if the token is invalid or tampered."""
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached is not None:
+                self._cache.move_to_end(token)
+                return dict(cached)
+        if "." not in token:
+            data = self._decode_binary(token)
+        else:
+            payload = self.verify(token)
+            if payload is None:
+                return None
+            try:
+                data = json.loads(_b64decode(payload))
+            except (ValueError, TypeError):
+                return None
+        if not isinstance(data, dict):
+            return None
+        if self.cache_size:
+            with self._lock:
+                self._cache[token] = data
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return dict(data)
+
+    def kid_of(self, token: str) -> str | None:
+        """Key id a token was signed with (None for legacy tokens)."""
+        if "." not in token:
+            try:
+                record = _b64decode(token)
+                return record[2:2 + record[1]].decode() or None
+            except (ValueError, IndexError, UnicodeDecodeError):
+                return None
+        parts = token.split(".")
+        return parts[0] if len(parts) == 3 else None
@@ -0,0 +1,255 @@
+"""Webhook delivery for ``callback_url`` notifications.
+
+Deliveries are queued and sent by a few worker threads over one shared
+``httpx.Client``, so connections (and TLS sessions) are reused across
+callbacks. At most ``per_host`` requests are in flight to any one host; a
+delivery whose host is busy waits its turn without tying up a worker.
+Network errors, 408, 429 and 5xx responses are retried with jittered
+exponential backoff up to ``max_attempts``; anything else is final.
+
+Each request carries::
+
+    X-Webhook-Id:        delivery id (stable across retries; dedupe on it)
+    X-Webhook-Event:     event name
+    X-Webhook-Signature: t=<unix seconds>,v1=<hex HMAC-SHA256 of "<t>.<body>">
+
+The signature header is only sent when a signing secret is configured.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import hmac
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from datetime import UTC, datetime
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def sign_payload(secret: str, timestamp: int, body: bytes) -> str:
+    """Value for the X-Webhook-Signature header."""
+    mac = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256)
+    return f"t={timestamp},v1={mac.hexdigest()}"
+
+
+def verify_signature(secret: str, header: str, body: bytes, *, tolerance: float = 300.0) -> bool:
+    """Check an X-Webhook-Signature header (for receivers)."""
+    try:
+        parts = dict(item.split("=", 1) for item in header.split(","))
+        timestamp = int(parts["t"])
+    except (ValueError, KeyError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    expected = sign_payload(secret, timestamp, body)
+    return hmac.compare_digest(expected, header.strip())
+
+
+class _Delivery:
+    __slots__ = ("attempts", "body", "event", "host", "id", "url")
+
+    def __init__(self, url: str, event: str, body: bytes, delivery_id: str) -> None:
+        self.id = delivery_id
+        self.url = url
+        self.host = urlsplit(url).netloc.lower()
+        self.event = event
+        self.body = body
+        self.attempts = 0
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        *,
+        secret: str = "",
+        workers: int = 4,
+        per_host: int = 2,
+        max_attempts: int = 5,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        timeout: float = 10.0,
+        max_queue: int = 10000,
+    ) -> None:
+        self.secret = secret
+        self.workers = max(1, int(workers))
+        self.per_host = max(1, int(per_host))
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.max_queue = max(1, int(max_queue))
+        self._queue: list[tuple[float, int, _Delivery]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight: dict[str, int] = {}
+        self._threads: list[threading.Thread] = []
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._stop = False
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+        self.dropped = 0
+
+    # ── producer side ─────────────────────────────────────────────────
+
+    def send(self, url: str, event: str, data) -> str | None:
+        """Queue ``{"id", "event", "created_at", "data"}`` for ``url``. Returns the delivery id (None if dropped)."""
+        delivery_id = str(uuid.uuid4())
+        body = json.dumps(
+            {
+                "id": delivery_id,
+                "event": event,
+                "created_at": datetime.now(UTC).isoformat(),
+                "data": data,
+            },
+            default=str,
+            separators=(",", ":"),
+        ).encode()
+        delivery = _Delivery(url, event, body, delivery_id)
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                logger.warning(f"Webhook queue full; dropped {event} for {delivery.host}")
+                return None
+            self._push_locked(delivery, time.monotonic())
+        self.start()
+        return delivery_id
+
+    def _push_locked(self, delivery: _Delivery, due: float) -> None:
+        heapq.heappush(self._queue, (due, next(self._seq), delivery))
+        self._cond.notify()
+
+    # ── workers ───────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if len(self._threads) >= self.workers:
+            return
+        with self._cond:
+            while len(self._threads) < self.workers and not self._stop:
+                t = threading.Thread(target=self._run, daemon=True, name=f"webhook-{len(self._threads)}")
+                t.start()
+                self._threads.append(t)
+
+    def _http(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+
+                    self._client = httpx.Client(
+                        timeout=self.timeout,
+                        limits=httpx.Limits(
+                            max_connections=self.workers * 2,
+                            max_keepalive_connections=self.workers * 2,
+                        ),
+                        headers={"User-Agent": "pdfcert-webhooks/1.0"},
+                    )
+        return self._client
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _take(self) -> _Delivery | None:
+        """Next due delivery whose host has a free slot; blocks until one exists or stop()."""
+        with self._cond:
+            while not self._stop:
+                now = time.monotonic()
+                skipped = []
+                picked = None
+                while self._queue and self._queue[0][0] <= now:
+                    item = heapq.heappop(self._queue)
+                    if self._in_flight.get(item[2].host, 0) < self.per_host:
+                        picked = item[2]
+                        break
+                    skipped.append(item)
+                next_due = self._queue[0][0] if self._queue else None
+                for item in skipped:
+                    heapq.heappush(self._queue, item)
+                if picked is not None:
+                    self._in_flight[picked.host] = self._in_flight.get(picked.host, 0) + 1
+                    return picked
+                # Woken by a new delivery, a finished one (freeing a host slot) or the next due time.
+                self._cond.wait(None if next_due is None else max(0.0, next_due - now))
+        return None
+
+    def _post(self, delivery: _Delivery) -> tuple[bool, bool, str, float | None]:
+        """One attempt. Returns (ok, retryable, error, retry_after)."""
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Id": delivery.id,
+            "X-Webhook-Event": delivery.event,
+        }
+        if self.secret:
+            headers["X-Webhook-Signature"] = sign_payload(self.secret, int(time.time()), delivery.body)
+        try:
+            resp = self._http().post(delivery.url, content=delivery.body, headers=headers)
+        except Exception as e:  # noqa: BLE001 - any transport error is a retryable failure
+            return False, True, str(e) or e.__class__.__name__, None
+        if resp.status_code < 300:
+            return True, False, "", None
+        retry_after = None
+        if resp.status_code == 429:
+            try:
+                retry_after = float(resp.headers.get("Retry-After", ""))
+            except ValueError:
+                pass
+        return False, resp.status_code in RETRY_STATUSES, f"HTTP {resp.status_code}", retry_after
+
+    def _run(self) -> None:
+        while True:
+            delivery = self._take()
+            if delivery is None:
+                return
+            delivery.attempts += 1
+            ok, retryable, err, retry_after = self._post(delivery)
+            with self._cond:
+                self._in_flight[delivery.host] -= 1
+                if not self._in_flight[delivery.host]:
+                    del self._in_flight[delivery.host]
+                if ok:
+                    self.delivered += 1
+                elif retryable and delivery.attempts < self.max_attempts:
+                    self.retried += 1
+                    delay = max(self.backoff(delivery.attempts), min(retry_after or 0.0, self.max_delay))
+                    self._push_locked(delivery, time.monotonic() + delay)
+                else:
+                    self.failed += 1
+                    logger.warning(
+                        f"Webhook {delivery.event} to {delivery.host} failed after "
+                        f"{delivery.attempts} attempt(s): {err}"
+                    )
+                self._cond.notify_all()
+            if ok:
+                logger.info(f"Webhook {delivery.event} delivered to {delivery.host}")
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "in_flight": sum(self._in_flight.values()),
+                "delivered": self.delivered,
+                "retried": self.retried,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "signed": bool(self.secret),
+            }
@@ -6,13 +6,18 @@ CSV columns: name,email,course (header row required). Optional: completion_date
 Requires: pip install httpx
 Env: PDFCERT_URL, PDFCERT_ADMIN_KEY
 
-Note: POST /api/admin/certificates/bulk requires the server to have DATABASE_URL configured.
+Uses the bulk job API (POST /api/admin/jobs/bulk?stream=true): entries are processed in
+parallel on the server and per-entry results stream back as NDJSON, so large cohorts neither
+hit the 500-entry limit nor a request timeout. Results are written as they arrive.
+
+Note: bulk issuance requires the server to have DATABASE_URL configured.
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import json
 import os
 import sys
 from datetime import date
@@ -59,22 +64,37 @@ def main() -> None:
         sys.exit(1)
 
     headers = {"X-Admin-Key": ADMIN_KEY, "Content-Type": "application/json"}
-    with httpx.Client(base_url=BASE_URL, headers=headers, timeout=120.0) as client:
-        resp = client.post("/api/admin/certificates/bulk", json={"entries": entries})
-        resp.raise_for_status()
-        body = resp.json()
-
-    total, ok, fail = body["total"], body["succeeded"], body["failed"]
-    print(f"Bulk complete: total={total} succeeded={ok} failed={fail}")
-
-    fieldnames = ["index", "status", "participant_name", "course_name", "url", "download_url", "error"]
-    with open(args.output, "w", newline="", encoding="utf-8") as out:
+    fieldnames = [
+        "index", "status", "participant_name", "course_name", "url", "download_url", "email_status", "error",
+    ]
+    total, ok, fail = len(entries), 0, 0
+    timeout = httpx.Timeout(30.0, read=None)
+    with httpx.Client(base_url=BASE_URL, headers=headers, timeout=timeout) as client, \
+            open(args.output, "w", newline="", encoding="utf-8") as out:
         w = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
         w.writeheader()
-        for r in body.get("results", []):
-            row = {k: r.get(k, "") for k in fieldnames}
-            w.writerow(row)
-    print(f"Wrote {args.output}")
+        with client.stream(
+            "POST", "/api/admin/jobs/bulk", params={"stream": "true"}, json={"entries": entries}
+        ) as resp:
+            if resp.is_error:
+                resp.read()
+                resp.raise_for_status()
+            print(f"Job {resp.headers.get('X-Job-Id', '?')}: {total} entries")
+            for line in resp.iter_lines():
+                if not line.strip():
+                    continue  # keep-alive
+                r = json.loads(line)
+                if r.get("status") == "success":
+                    ok += 1
+                else:
+                    fail += 1
+                w.writerow({k: r.get(k, "") for k in fieldnames})
+                done = ok + fail
+                if done % 100 == 0 or done == total:
+                    print(f"  {done}/{total} processed")
+
+    print(f"Bulk complete: total={total} succeeded={ok} failed={fail}")
+    print(f"Wrote {args.output} (rows in completion order; sort by index if needed)")
 
 
 if __name__ == "__main__":
@@ -1,24 +1,65 @@
 #!/usr/bin/env python3
-"""Sample FastAPI receiver for PDF Cert Generator certificate.created webhook callbacks.
+"""Sample FastAPI receiver for PDF Cert Generator webhook callbacks.
+
+Handles ``certificate.created`` (single issuance) and ``certificates.created``
+(bulk jobs, one event per processed chunk). When WEBHOOK_SIGNING_SECRET is set
+to the API's secret, requests with a missing or bad X-Webhook-Signature are
+rejected with 401. Deliveries are deduplicated on X-Webhook-Id, since the API
+retries on errors and timeouts.
 
 Requires: pip install fastapi uvicorn
 Run: python webhook_receiver.py  (listens on port 9000)
 
 Point callback_url at http://<your-host>:9000/webhook when creating certificates.
 Downstream: forward payload to Slack, email, or CRM from handle_certificate_created().
+
+Load testing the dispatcher: start the receiver with failures and latency,
+issue a bulk job with ``callback_url``, then read the counters:
+
+    python webhook_receiver.py --fail-rate 0.2 --delay-ms 250
+    curl http://localhost:9000/stats
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import hashlib
+import hmac
 import logging
+import os
+import random
+import time
+from collections import Counter, OrderedDict
 from typing import Any
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("webhook_receiver")
 
-app = FastAPI(title="PDF Cert Generator Webhook Demo", version="1.0.0")
+app = FastAPI(title="PDF Cert Generator Webhook Demo", version="1.1.0")
+
+SIGNING_SECRET = os.environ.get("WEBHOOK_SIGNING_SECRET", "").strip()
+FAIL_RATE = 0.0
+DELAY_MS = 0
+
+_seen: OrderedDict[str, None] = OrderedDict()
+_stats: Counter = Counter()
+_started = time.time()
+
+
+def verify_signature(header: str, body: bytes, tolerance: float = 300.0) -> bool:
+    """Check ``t=<unix>,v1=<hex HMAC-SHA256 of "<t>.<body>">``."""
+    try:
+        parts = dict(item.split("=", 1) for item in header.split(","))
+        timestamp = int(parts["t"])
+    except (ValueError, KeyError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    expected = hmac.new(SIGNING_SECRET.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, parts.get("v1", ""))
 
 
 def handle_certificate_created(data: dict[str, Any]) -> None:
@@ -29,18 +70,59 @@ def handle_certificate_created(data: dict[str, Any]) -> None:
 
 @app.post("/webhook")
 async def webhook(request: Request) -> dict[str, str]:
+    body = await request.body()
+    if SIGNING_SECRET and not verify_signature(request.headers.get("X-Webhook-Signature", ""), body):
+        _stats["bad_signature"] += 1
+        raise HTTPException(status_code=401, detail="Bad signature")
+    if DELAY_MS:
+        await asyncio.sleep(DELAY_MS / 1000)
+    if FAIL_RATE and random.random() < FAIL_RATE:
+        _stats["simulated_failures"] += 1
+        raise HTTPException(status_code=503, detail="Simulated failure")
+
+    delivery_id = request.headers.get("X-Webhook-Id", "")
+    if delivery_id and delivery_id in _seen:
+        _stats["duplicates"] += 1
+        return {"status": "duplicate"}
+    if delivery_id:
+        _seen[delivery_id] = None
+        if len(_seen) > 100_000:
+            _seen.popitem(last=False)
+
     payload = await request.json()
     event = payload.get("event")
+    _stats["deliveries"] += 1
     if event == "certificate.created":
         data = payload.get("data") or {}
-        logger.info("certificate.created: %s", data)
+        logger.info("certificate.created: %s", data.get("certificate_id"))
+        _stats["certificates"] += 1
         handle_certificate_created(data)
+    elif event == "certificates.created":
+        data = payload.get("data") or {}
+        certs = data.get("certificates") or []
+        logger.info("certificates.created: job %s, %d certificates", data.get("job_id"), len(certs))
+        _stats["certificates"] += len(certs)
+        for cert in certs:
+            handle_certificate_created(cert)
     else:
         logger.info("Ignored event: %s", event)
     return {"status": "ok"}
 
 
+@app.get("/stats")
+async def stats() -> dict[str, Any]:
+    elapsed = max(time.time() - _started, 1e-9)
+    return {**_stats, "deliveries_per_sec": round(_stats["deliveries"] / elapsed, 2)}
+
+
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=9000)
+    parser = argparse.ArgumentParser(description="Webhook receiver for PDF Cert Generator callbacks")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--delay-ms", type=int, default=0, help="Artificial latency per request")
+    args = parser.parse_args()
+    FAIL_RATE = args.fail_rate
+    DELAY_MS = args.delay_ms
+    uvicorn.run(app, host="0.0.0.0", port=args.port, log_level="warning")
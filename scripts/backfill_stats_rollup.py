@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Rebuild the certificate_daily_stats rollup behind /api/admin/stats.
+
+Issuance and revocation keep the rollup current on their own; run this once
+after deploying the rollup onto a database that already has certificates (the
+stats endpoint scans the certificates table until then), or any time the
+counters need to be rebuilt from scratch. Safe to re-run.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/backfill_stats_rollup.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from api import db  # noqa: E402
+
+
+def main() -> None:
+    if not db.DATABASE_URL:
+        print("DATABASE_URL is not set")
+        sys.exit(1)
+    db.init_schema()
+    t0 = time.perf_counter()
+    rows = db.backfill_stats_rollup()
+    print(f"Rebuilt certificate_daily_stats: {rows} day/course rows in {time.perf_counter() - t0:.1f}s")
+    db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Cold-start budget for api/index.py.
+
+Each run starts a fresh interpreter with ``-X importtime``, imports the app and
+serves one ``/certificate/{token}/verify`` call, which is what a serverless cold
+start on the verify route pays. Prints the slowest top-level imports and the
+median import + first-verify time, then checks that:
+
+- the median stays under ``--budget-ms``, and
+- none of the render/email dependencies (xhtml2pdf, reportlab, qrcode, PIL,
+  httpx, agentmail) were imported on the way.
+
+Usage:
+    python scripts/bench_cold_start.py
+    python scripts/bench_cold_start.py --runs 10 --budget-ms 600 --top 25
+
+Exit status is non-zero if the budget is exceeded or a heavy module leaks in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("xhtml2pdf", "reportlab", "qrcode", "PIL", "httpx", "agentmail")
+
+CHILD = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import api.index as app_mod
+t1 = time.perf_counter()
+from starlette.requests import Request
+token = app_mod._encode_cert({"n": "Cold Start", "c": "Bench", "d": "2026-01-01", "i": "Bench"})
+scope = {
+    "type": "http", "method": "GET", "scheme": "http", "server": ("bench", 80),
+    "path": f"/certificate/{token}/verify", "root_path": "", "query_string": b"", "headers": [],
+}
+resp = asyncio.run(app_mod.verify_certificate(token, Request(scope)))
+t2 = time.perf_counter()
+heavy = sorted({m.split(".")[0] for m in sys.modules} & set(sys.argv[1].split(",")))
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "verify_ms": (t2 - t1) * 1000,
+    "status": resp.status_code,
+    "heavy": heavy,
+}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds per top-level import from ``-X importtime`` output."""
+    out: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue  # nested import (indented) or the header row
+        out[name.strip()] = out.get(name.strip(), 0) + int(cumulative)
+    return out
+
+
+def _run_once() -> tuple[dict, dict[str, int]]:
+    env = {k: v for k, v in os.environ.items() if k not in ("DATABASE_URL", "AGENTMAIL_API_KEY")}
+    env.setdefault("CERT_SECRET_KEY", "bench-cold-start-secret")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, ",".join(HEAVY_MODULES)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(ln for ln in proc.stderr.splitlines() if not ln.startswith("import time:"))
+        raise RuntimeError(f"child exited {proc.returncode}:\n{tail[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result, _parse_importtime(proc.stderr)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Measure api/index.py cold start on the verify path.")
+    p.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start (default: 5)")
+    p.add_argument("--budget-ms", type=float, default=800.0, help="Median import + first verify budget (default: 800)")
+    p.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list (default: 15)")
+    args = p.parse_args()
+
+    # One throwaway run so .pyc compilation is not counted.
+    _run_once()
+
+    totals: list[float] = []
+    imports: list[float] = []
+    per_module: dict[str, list[int]] = {}
+    heavy: set[str] = set()
+    for _ in range(max(1, args.runs)):
+        result, modules = _run_once()
+        if result["status"] != 200:
+            print(f"verify returned {result['status']}")
+            sys.exit(1)
+        imports.append(result["import_ms"])
+        totals.append(result["import_ms"] + result["verify_ms"])
+        heavy.update(result["heavy"])
+        for name, us in modules.items():
+            per_module.setdefault(name, []).append(us)
+
+    ranked = sorted(per_module.items(), key=lambda kv: statistics.median(kv[1]), reverse=True)
+    print(f"{'module':<40}{'median ms':>12}")
+    for name, samples in ranked[: args.top]:
+        print(f"{name:<40}{statistics.median(samples) / 1000:>12.1f}")
+
+    median_total = statistics.median(totals)
+    print(f"\nimport api.index       {statistics.median(imports):8.1f} ms (median of {len(totals)})")
+    print(f"import + first verify  {median_total:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: verify path imported {', '.join(sorted(heavy))}")
+        failed = True
+    if median_total > args.budget_ms:
+        print("FAIL: cold start over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Side-by-side comparison of the xhtml2pdf (pisa) and ReportLab canvas engines.
+
+Renders the same participation and internship payloads with both engines,
+prints a timing table and writes every PDF to an output directory so the
+layouts can be compared by eye (open the pisa/canvas files side by side).
+The canvas engine is also timed with its cached static layer turned off
+("direct": both layers drawn on one canvas) to show what the layer saves.
+
+Usage:
+    python scripts/compare_cert_engines.py
+    python scripts/compare_cert_engines.py --runs 20 --out /tmp/engine-compare
+
+Exit status is non-zero if either engine fails to render a sample.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from api import cert_canvas  # noqa: E402
+from api.index import CERT_PDF_ENGINES, _build_cert_pdf  # noqa: E402
+
+VERIFY_URL = "https://certs.intelliforge.tech/certificate/sample-token"
+
+SAMPLES: dict[str, dict] = {
+    "participation": {
+        "n": "Ada Lovelace",
+        "c": "AI Product Development Fundamentals",
+        "d": "2026-04-15",
+        "i": "Certificate Team",
+    },
+    "participation-founder": {
+        "n": "Srinivasa Ramanujan Iyengar",
+        "c": "RAG Systems & Architecture Masterclass",
+        "d": "2026-05-02",
+        "i": "Girish Hiremath",
+    },
+    "internship": {
+        "k": "i",
+        "n": "Internship Sample",
+        "c": "VTU Industry Internship – IntelliForge AI Programme",
+        "d": "2026-06-10",
+        "i": "Program Lead",
+        "u": "1RV22CS099",
+        "w": "Jan 2026 – Jun 2026",
+        "h": "120 hours",
+        "m": "Industry Mentor",
+        "s": "Sample Engineering College",
+    },
+}
+
+
+# Timed variants: (label, engine, static layer on)
+VARIANTS = [(engine, engine, True) for engine in CERT_PDF_ENGINES]
+if cert_canvas.STATIC_LAYERS:
+    VARIANTS.append(("direct", "canvas", False))
+
+
+def _time_engine(engine: str, data: dict, runs: int, static_layers: bool = True) -> tuple[list[float], bytes]:
+    timings: list[float] = []
+    pdf = b""
+    default = cert_canvas.STATIC_LAYERS
+    cert_canvas.STATIC_LAYERS = default and static_layers
+    try:
+        for run in range(runs):
+            # A fresh URL per run, as in production, so the QR code is never reused.
+            url = f"{VERIFY_URL}-{run}"
+            t0 = time.perf_counter()
+            pdf = _build_cert_pdf(data, verify_url=url, engine=engine)
+            timings.append((time.perf_counter() - t0) * 1000)
+    finally:
+        cert_canvas.STATIC_LAYERS = default
+    return timings, pdf
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compare pisa and canvas certificate engines.")
+    p.add_argument("--runs", type=int, default=10, help="Renders per engine per sample (default: 10)")
+    p.add_argument("--out", default=str(REPO_ROOT / "engine_compare"), help="Directory for rendered PDFs")
+    args = p.parse_args()
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Warm signature/QR/font and static-layer caches so the first engine is not penalised.
+    for data in SAMPLES.values():
+        for engine in CERT_PDF_ENGINES:
+            _build_cert_pdf(data, verify_url=VERIFY_URL, engine=engine)
+
+    failed = False
+    print(f"{'sample':<24}{'engine':<8}{'median ms':>11}{'p95 ms':>10}{'size KB':>10}")
+    for name, data in SAMPLES.items():
+        medians: dict[str, float] = {}
+        for label, engine, static_layers in VARIANTS:
+            try:
+                timings, pdf = _time_engine(engine, data, max(1, args.runs), static_layers)
+            except Exception as e:
+                print(f"{name:<24}{label:<8}  FAILED: {e}")
+                failed = True
+                continue
+            timings.sort()
+            medians[label] = statistics.median(timings)
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            (out_dir / f"{name}.{label}.pdf").write_bytes(pdf)
+            print(f"{name:<24}{label:<8}{medians[label]:>11.1f}{p95:>10.1f}{len(pdf) / 1024:>10.1f}")
+        if "pisa" in medians and medians.get("canvas"):
+            print(f"{'':<24}speedup {medians['pisa'] / medians['canvas']:.1f}x")
+        if medians.get("direct") and medians.get("canvas"):
+            saved = 1 - medians["canvas"] / medians["direct"]
+            print(f"{'':<24}static layer saves {saved:.0%} over direct drawing")
+    print(f"\nPDFs written to {out_dir}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
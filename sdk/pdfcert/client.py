@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Mapping
+from collections.abc import Iterator, Mapping
+from typing import Any
 
 import httpx
 
@@ -12,6 +13,17 @@ from pdfcert.exceptions import (
     ValidationError,
 )
 
+# ``json`` is also a keyword argument name on the request helpers.
+_json_loads = json.loads
+
+
+def _bulk_body(entries: list[dict[str, Any]], callback_url: str | None, callback_mode: str) -> dict[str, Any]:
+    body: dict[str, Any] = {"entries": entries}
+    if callback_url:
+        body["callback_url"] = callback_url
+        body["callback_mode"] = callback_mode
+    return body
+
 
 class Admin:
     """Admin API bound to a :class:`PdfCert` client (requires ``admin_key``)."""
@@ -27,10 +39,19 @@ class Admin:
         limit: int = 50,
         offset: int = 0,
         course: str | None = None,
+        *,
+        cursor: str | None = None,
+        count: str | None = None,
     ) -> dict[str, Any]:
+        """One page; pass the previous page's ``next_cursor`` as ``cursor`` to continue.
+        ``count`` is ``"exact"``, ``"estimate"`` (server default) or ``"none"``."""
         params: dict[str, Any] = {"limit": limit, "offset": offset}
         if course is not None:
             params["course"] = course
+        if cursor is not None:
+            params["cursor"] = cursor
+        if count is not None:
+            params["count"] = count
         return self._c._request_json(
             "GET",
             "/api/admin/certificates",
@@ -38,12 +59,88 @@ class Admin:
             params=params,
         )
 
-    def bulk_generate(self, entries: list[dict[str, Any]]) -> dict[str, Any]:
+    def iter_certificates(
+        self,
+        course: str | None = None,
+        *,
+        page_size: int = 100,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every certificate, newest first, following ``next_cursor`` page by page."""
+        cursor: str | None = None
+        while True:
+            page = self.list_certificates(page_size, course=course, cursor=cursor, count="none")
+            yield from page.get("certificates", [])
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
+    def bulk_generate(
+        self,
+        entries: list[dict[str, Any]],
+        *,
+        use_job: bool | None = None,
+    ) -> dict[str, Any]:
+        """Issue many certificates. Batches over 500 entries (or ``use_job=True``) go through the
+        job API and are streamed back; the return shape is the same either way."""
+        if use_job is None:
+            use_job = len(entries) > 500
+        if not use_job:
+            return self._c._request_json(
+                "POST",
+                "/api/admin/certificates/bulk",
+                admin=True,
+                json={"entries": entries},
+            )
+        results = sorted(self.stream_bulk_job(entries), key=lambda r: r.get("index", 0))
+        succeeded = sum(1 for r in results if r.get("status") == "success")
+        return {
+            "total": len(entries),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        }
+
+    def start_bulk_job(
+        self,
+        entries: list[dict[str, Any]],
+        *,
+        callback_url: str | None = None,
+        callback_mode: str = "batch",
+    ) -> dict[str, Any]:
+        """``callback_url`` receives ``certificates.created`` per processed chunk
+        (``callback_mode="each"``: ``certificate.created`` per certificate)."""
         return self._c._request_json(
             "POST",
-            "/api/admin/certificates/bulk",
+            "/api/admin/jobs/bulk",
             admin=True,
-            json={"entries": entries},
+            json=_bulk_body(entries, callback_url, callback_mode),
+        )
+
+    def job_status(self, job_id: str) -> dict[str, Any]:
+        return self._c._request_json("GET", f"/api/admin/jobs/{job_id}", admin=True)
+
+    def iter_job_results(self, job_id: str, after: int = 0) -> Iterator[dict[str, Any]]:
+        return self._c._iter_ndjson(
+            "GET",
+            f"/api/admin/jobs/{job_id}/results",
+            admin=True,
+            params={"after": after},
+        )
+
+    def stream_bulk_job(
+        self,
+        entries: list[dict[str, Any]],
+        *,
+        callback_url: str | None = None,
+        callback_mode: str = "batch",
+    ) -> Iterator[dict[str, Any]]:
+        """Start a job and yield per-entry results as the server completes them."""
+        return self._c._iter_ndjson(
+            "POST",
+            "/api/admin/jobs/bulk",
+            admin=True,
+            params={"stream": "true"},
+            json=_bulk_body(entries, callback_url, callback_mode),
         )
 
     def revoke(self, cert_db_id: str | int) -> dict[str, Any]:
@@ -223,6 +320,37 @@ class PdfCert:
             )
         return data
 
+    def _iter_ndjson(
+        self,
+        method: str,
+        path: str,
+        *,
+        api: bool = False,
+        admin: bool = False,
+        params: Mapping[str, Any] | None = None,
+        json: Any = None,
+    ) -> Iterator[dict[str, Any]]:
+        headers = self._headers(api=api, admin=admin)
+        # Results can take a while to arrive; only the connect phase keeps the client timeout.
+        timeout = httpx.Timeout(self._timeout, read=None)
+        try:
+            with self._http.stream(
+                method,
+                path,
+                params=params,
+                json=json,
+                headers=headers,
+                timeout=timeout,
+            ) as response:
+                if not response.is_success:
+                    response.read()
+                    self._raise_for_status(response)
+                for line in response.iter_lines():
+                    if line.strip():
+                        yield _json_loads(line)
+        except httpx.RequestError as exc:
+            raise PdfCertError(f"HTTP request failed: {exc}") from exc
+
     def _request_bytes(
         self,
         method: str,
@@ -311,9 +439,16 @@ class PdfCert:
             )
         return out
 
+    def email_status(self, email_id: str) -> dict[str, Any]:
+        return self._request_json("GET", f"/api/emails/{email_id}")
+
     def verify(self, token: str) -> dict[str, Any]:
         return self._request_json("GET", f"/certificate/{token}/verify")
 
+    def verify_by_id(self, certificate_id: str) -> dict[str, Any]:
+        """Verify by the printed ``CERT-XXXXXXXXXXXX`` ID (server needs a database)."""
+        return self._request_json("GET", f"/api/certificates/by-id/{certificate_id.strip()}")
+
     def batch_verify(self, tokens: list[str]) -> dict[str, Any]:
         return self._request_json(
             "POST",
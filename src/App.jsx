@@ -632,10 +632,13 @@ function PreviewQrBlock({ getApiUrl, url, title, subtitle }) {
   )
 }
 
-function DeliveryStatus({ success, successText, failureText, detail }) {
+function DeliveryStatus({ success, pending, successText, pendingText, failureText, detail }) {
   if (success) {
     return <div className="cert-delivery-success">{successText}</div>
   }
+  if (pending) {
+    return <div className="cert-delivery-pending" role="status">{pendingText}</div>
+  }
   return (
     <div className="cert-delivery-failed" role="alert">
       <strong>{failureText}</strong>
@@ -1006,7 +1009,7 @@ function AdminDashboard({ getApiUrl }) {
     if (successful.length === 0) return
     const lines = ['Certificate ID,Participant,Course,Email Sent,URL,Download URL']
     successful.forEach((r) => {
-      lines.push(`"${r.certificate_id}","${r.participant_name}","${r.course_name}","${r.email_sent ? 'Yes' : 'No'}","${r.url}","${r.download_url}"`)
+      lines.push(`"${r.certificate_id}","${r.participant_name}","${r.course_name}","${r.email_sent ? 'Yes' : r.email_status === 'pending' ? 'Queued' : 'No'}","${r.url}","${r.download_url}"`)
     })
     const blob = new Blob([lines.join('\n')], { type: 'text/csv' })
     const url = URL.createObjectURL(blob)
@@ -1342,6 +1345,41 @@ function App() {
   const [certError, setCertError] = useState(null)
   const [certResult, setCertResult] = useState(null)
 
+  // Certificate emails are queued server-side; poll until the outbox settles.
+  const emailId = certResult?.email_id
+  const emailPending = certResult?.email_status === 'pending' || certResult?.email_status === 'sending'
+  useEffect(() => {
+    if (!emailId || !emailPending) return undefined
+    let cancelled = false
+    let polls = 0
+    const timer = setInterval(async () => {
+      polls += 1
+      try {
+        const res = await fetch(getApiUrl(`/api/emails/${emailId}`))
+        if (!res.ok) return
+        const status = await res.json()
+        if (cancelled) return
+        if (status.status !== 'pending' && status.status !== 'sending') {
+          setCertResult((prev) => prev && prev.email_id === emailId
+            ? {
+                ...prev,
+                email_status: status.status,
+                email_sent: status.email_sent,
+                email_error: status.email_sent ? '' : status.last_error || 'Email delivery failed.',
+              }
+            : prev)
+        }
+      } catch {
+        // transient; keep polling
+      }
+      if (polls >= 30) clearInterval(timer)
+    }, 2000)
+    return () => {
+      cancelled = true
+      clearInterval(timer)
+    }
+  }, [emailId, emailPending])
+
   const [invoiceForm, setInvoiceForm] = useState({
     invoice_number: 'INV-2026-1',
     invoice_date: new Date().toISOString().split('T')[0],
@@ -1968,6 +2006,8 @@ function App() {
                 {certForm.participant_email && (
                   <DeliveryStatus
                     success={certResult.email_sent}
+                    pending={certResult.email_status === 'pending' || certResult.email_status === 'sending'}
+                    pendingText={`Sending certificate email to ${certForm.participant_email}…`}
                     successText={
                       <>
                         <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round"><path d="M4 4h16c1.1 0 2 .9 2 2v12c0 1.1-.9 2-2 2H4c-1.1 0-2-.9-2-2V6c0-1.1.9-2 2-2z"/><polyline points="22,6 12,13 2,6"/></svg>
@@ -4,14 +4,20 @@ Run with: python test_api.py
 Requires: pip install requests
 """
 
+import os
 import sys
 import io
+import json
+import time
+import uuid
 import requests
 
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
 BASE_URL = "http://localhost:8000"
+ADMIN_KEY = os.environ.get("ADMIN_KEY", "")
+RATE_WINDOW = int(os.environ.get("RATE_WINDOW", "60"))
 RESULTS: list[tuple[str, bool]] = []
 
 
@@ -204,6 +210,75 @@ def test_verify_valid(cert_data: dict):
     record("Verify participation kind", data.get("certificate_kind") == "participation")
 
 
+def test_verify_by_id(cert_data: dict):
+    r = requests.get(f"{BASE_URL}/api/certificates/by-id/not-a-cert-id")
+    record("GET /api/certificates/by-id rejects malformed ID with 400", r.status_code == 400)
+    cert_id = cert_data.get("certificate_id", "")
+    r = requests.get(f"{BASE_URL}/api/certificates/by-id/{cert_id.lower()}")
+    if r.status_code == 503:
+        record("Verify by ID — skipped (no database)", True)
+        return
+    data = r.json()
+    record("GET /api/certificates/by-id/{id} returns 200", r.status_code == 200)
+    record("Verify by ID returns correct participant", data.get("participant_name") == "Test User")
+
+
+def test_certificate_id_collision():
+    """Same name, course and date under two instructors: both certificates get their own ID."""
+    name = f"Collision {uuid.uuid4().hex[:8]}"
+    first = _create_cert(participant_name=name, instructor_name="Instructor One").json()
+    second = _create_cert(participant_name=name, instructor_name="Instructor Two").json()
+    record("Colliding certificates get distinct IDs",
+           first.get("certificate_id") != second.get("certificate_id"))
+    v = requests.get(f"{BASE_URL}/certificate/{second.get('token', '')}/verify").json()
+    record("Verify shows the disambiguated ID", v.get("certificate_id") == second.get("certificate_id"))
+    r = requests.get(f"{BASE_URL}/api/certificates/by-id/{second.get('certificate_id', '')}")
+    if r.status_code == 503:
+        record("Colliding verify by ID — skipped (no database)", True)
+        return
+    record("Verify by ID returns the second instructor",
+           r.status_code == 200 and r.json().get("instructor_name") == "Instructor Two")
+
+
+def test_email_outbox():
+    """A certificate email is queued; polling reaches a terminal status or a recorded retry."""
+    data = _create_cert(participant_email="outbox-test@example.com").json()
+    if data.get("email_status") == "not_configured":
+        record("Email not configured — no outbox entry", data.get("email_id") is None)
+        return
+    record("Certificate email is queued as pending", data.get("email_status") == "pending")
+    email_id = data.get("email_id") or ""
+    status = {}
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        status = requests.get(f"{BASE_URL}/api/emails/{email_id}").json()
+        if status.get("status") in ("sent", "dead") or (
+            status.get("status") == "pending" and status.get("attempts", 0) > 0
+        ):
+            break
+        time.sleep(0.5)
+    record("GET /api/emails/{id} reaches sent, dead or a recorded retry",
+           status.get("status") in ("sent", "dead") or status.get("attempts", 0) > 0)
+    record("Email status reports email_sent", status.get("email_sent") == (status.get("status") == "sent"))
+    r = requests.get(f"{BASE_URL}/api/emails/{uuid.uuid4()}")
+    record("Unknown email ID returns 404", r.status_code == 404)
+
+
+# ── Conditional GET ───────────────────────────────────────────────────
+
+def test_conditional_get(cert_data: dict):
+    token = cert_data.get("token", "")
+    for label, path in (("verify", "/verify"), ("PDF", "/download")):
+        r = requests.get(f"{BASE_URL}/certificate/{token}{path}")
+        etag = r.headers.get("ETag", "")
+        record(f"{label} response has ETag", etag.startswith('"'))
+        record(f"{label} response has Cache-Control", "max-age" in r.headers.get("Cache-Control", ""))
+        r2 = requests.get(f"{BASE_URL}/certificate/{token}{path}", headers={"If-None-Match": etag})
+        record(f"{label} If-None-Match returns 304", r2.status_code == 304 and not r2.content)
+    r = requests.get(f"{BASE_URL}/certificate/{token}/download")
+    record("PDF Cache-Control is immutable", "immutable" in r.headers.get("Cache-Control", ""))
+
+
 # ── Tamper detection ──────────────────────────────────────────────────
 
 def test_tamper_detection(cert_data: dict):
@@ -222,6 +297,93 @@ def test_tamper_detection(cert_data: dict):
     record("Tampered token viewer returns 404", r2.status_code == 404)
 
 
+# ── Admin bulk issuance ───────────────────────────────────────────────
+
+def _bulk_entry(**overrides) -> dict:
+    return {
+        "participant_name": "Bulk User",
+        "course_name": "AI Code Reviewer Course",
+        "completion_date": "2026-04-15",
+        "instructor_name": "Certificate Team",
+        **overrides,
+    }
+
+
+def _admin_post(path: str, entries: list[dict], **kwargs) -> requests.Response:
+    return requests.post(f"{BASE_URL}{path}", json={"entries": entries},
+                         headers={"X-Admin-Key": ADMIN_KEY}, **kwargs)
+
+
+def test_bulk_duplicates():
+    """An exact duplicate is reported as such; an entry whose ID collides is re-signed and stored."""
+    if not ADMIN_KEY:
+        record("Bulk duplicates — skipped (ADMIN_KEY not set)", True)
+        return
+    name = f"Bulk {uuid.uuid4().hex[:8]}"
+    first = _bulk_entry(participant_name=name, instructor_name="Instructor One")
+    second = _bulk_entry(participant_name=name, instructor_name="Instructor Two")
+    r = _admin_post("/api/admin/certificates/bulk", [first, first, second])
+    if r.status_code == 503:
+        record("Bulk duplicates — skipped (no database)", True)
+        return
+    results = r.json().get("results", [])
+    record("POST /api/admin/certificates/bulk returns 200", r.status_code == 200 and len(results) == 3)
+    if len(results) != 3:
+        return
+    record("Bulk first entry is stored", results[0].get("db_status") == "stored")
+    record("Bulk exact duplicate reports db_status=duplicate", results[1].get("db_status") == "duplicate")
+    record("Bulk colliding entry is re-signed and stored", results[2].get("db_status") == "stored")
+    record("Bulk colliding entry gets its own ID",
+           results[2].get("certificate_id") != results[0].get("certificate_id"))
+    token = results[2].get("url", "").rsplit("/", 1)[-1]
+    v = requests.get(f"{BASE_URL}/certificate/{token}/verify").json()
+    record("Re-signed bulk certificate verifies",
+           v.get("valid") is True and v.get("certificate_id") == results[2].get("certificate_id")
+           and v.get("instructor_name") == "Instructor Two")
+
+
+def _ndjson_indexes(r: requests.Response) -> list[int]:
+    return sorted(json.loads(line)["index"] for line in r.text.splitlines() if line.strip())
+
+
+def test_bulk_jobs():
+    """Start a job spanning several worker chunks, poll it to completion and read its NDJSON results."""
+    if not ADMIN_KEY:
+        record("Bulk jobs — skipped (ADMIN_KEY not set)", True)
+        return
+    headers = {"X-Admin-Key": ADMIN_KEY}
+    tag = uuid.uuid4().hex[:8]
+    entries = [_bulk_entry(participant_name=f"Job {tag} {i}") for i in range(30)]
+    r = _admin_post("/api/admin/jobs/bulk", entries)
+    if r.status_code == 503:
+        record("Bulk jobs — skipped (no database)", True)
+        return
+    data = r.json()
+    record("POST /api/admin/jobs/bulk returns 202", r.status_code == 202)
+    record("Job response has status_url and results_url",
+           bool(data.get("status_url")) and bool(data.get("results_url")))
+    if not data.get("status_url"):
+        return
+
+    status = {}
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        status = requests.get(data["status_url"], headers=headers).json()
+        if status.get("status") == "done":
+            break
+        time.sleep(0.5)
+    record("Bulk job reaches status done", status.get("status") == "done")
+    record("Bulk job counts every entry", status.get("processed") == len(entries) == status.get("succeeded"))
+
+    r = requests.get(data["results_url"], headers=headers, timeout=60)
+    record("Job results are NDJSON", r.headers.get("Content-Type", "").startswith("application/x-ndjson"))
+    record("Job results have one line per entry", _ndjson_indexes(r) == list(range(len(entries))))
+
+    r = _admin_post("/api/admin/jobs/bulk?stream=1", entries[:5], timeout=60)
+    record("Streamed job returns X-Job-Id", bool(r.headers.get("X-Job-Id")))
+    record("Streamed job results have one line per entry", _ndjson_indexes(r) == list(range(5)))
+
+
 # ── Rate limiting (basic) ────────────────────────────────────────────
 
 def test_rate_limiting():
@@ -235,6 +397,23 @@ def test_rate_limiting():
     record("Rate limiter triggers 429 within 15 requests", got_429)
 
 
+def test_rate_limit_recovery():
+    """Requests denied while limited are not counted: a client that keeps retrying
+    gets through again once its earlier requests slide out of the window."""
+    if RATE_WINDOW > 15:
+        record("Rate limit recovery — skipped (set RATE_WINDOW<=15 for server and tests)", True)
+        return
+    limited = any(_create_cert().status_code == 429 for _ in range(15))
+    record("Rate limit exceeded before recovery", limited)
+    # The sliding estimate can take up to two windows to clear a full budget.
+    deadline = time.monotonic() + 2 * RATE_WINDOW + 2
+    status = 429
+    while status == 429 and time.monotonic() < deadline:
+        time.sleep(0.2)
+        status = _create_cert().status_code
+    record("Client retrying while limited gets 200 again", status == 200)
+
+
 # ── Runner ────────────────────────────────────────────────────────────
 
 def run_all():
@@ -271,12 +450,25 @@ def run_all():
 
     print("\n[Verification API]")
     test_verify_valid(cert)
+    test_verify_by_id(cert)
+    test_certificate_id_collision()
+
+    print("\n[Email Outbox]")
+    test_email_outbox()
+
+    print("\n[Conditional GET]")
+    test_conditional_get(cert)
 
     print("\n[Tamper Detection]")
     test_tamper_detection(cert)
 
+    print("\n[Admin Bulk]")
+    test_bulk_duplicates()
+    test_bulk_jobs()
+
     print("\n[Rate Limiting]")
     test_rate_limiting()
+    test_rate_limit_recovery()
 
     # Summary
     total = len(RESULTS)
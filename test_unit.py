@@ -0,0 +1,206 @@
+"""
+In-process tests for token encoding and the canvas PDF engine. No server needed.
+Run with: python test_unit.py
+Requires: pip install -r requirements.txt
+"""
+
+import sys
+import io
+import base64
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+VERIFY_URL = "http://localhost:8000/certificate/sample"
+RESULTS: list[tuple[str, bool]] = []
+
+
+def record(name: str, passed: bool):
+    RESULTS.append((name, passed))
+    mark = "\u2705" if passed else "\u274c"
+    print(f"  {mark} {name}")
+
+
+# ── Token formats ─────────────────────────────────────────────────────
+
+def test_binary_tokens():
+    from api.tokens import TokenCodec
+
+    codec = TokenCodec(legacy_secret="test-secret", binary=True, cache_size=0)
+    payloads = [
+        {"n": "Zoë Ångström 李小龙", "c": "AI Code Reviewer Course", "d": "2026-04-15", "i": "Certificate Team"},
+        {"n": "Test User", "c": "Custom Course ✓", "d": "15 April 2026", "i": "Dr. Ōno"},
+        {"k": "i", "n": "Intern", "c": "VTU Industry Internship – IntelliForge AI Programme", "d": "1999-12-31",
+         "i": "Program Lead", "u": "1RV22CS099", "w": "Jan – Jun", "h": "120", "m": "Mentor", "s": "College"},
+    ]
+    for data in payloads:
+        token = codec.encode(data)
+        record(f"Binary token round-trips ({data['d']})", "." not in token and codec.decode(token) == data)
+
+    token = codec.encode(payloads[0])
+    mid = len(token) // 2
+    tampered = token[:mid] + ("A" if token[mid] != "A" else "B") + token[mid + 1:]
+    record("Tampered binary token rejected", codec.decode(tampered) is None)
+    record("Truncated binary tokens rejected",
+           all(codec.decode(token[:n]) is None for n in (0, 3, 10, len(token) - 1)))
+    record("Binary token from another key rejected",
+           TokenCodec(legacy_secret="other-secret", binary=True).decode(token) is None)
+
+    body = bytes((1, 0)) + b"\x00\x01x"  # tag 0 would alias the last field
+    forged = base64.urlsafe_b64encode(body + codec._mac(codec._legacy, body)).decode().rstrip("=")
+    record("Binary token with field tag 0 rejected", codec.decode(forged) is None)
+
+
+def test_legacy_tokens():
+    import hashlib
+    import hmac
+    import json
+    from api import index
+    from api.tokens import TokenCodec
+
+    data = {"n": "Legacy User", "c": "AI Code Reviewer Course", "d": "2025-01-01", "i": "Certificate Team"}
+    payload = base64.urlsafe_b64encode(
+        json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+    ).decode().rstrip("=")
+    legacy = f"{payload}.{hmac.new(index.CERT_SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()}"
+
+    # A deployment that has rotated to a keyed secret but still holds old tokens.
+    rotated = TokenCodec(legacy_secret=index.CERT_SECRET, keys=[("k2", "rotated-secret")], binary=True)
+    kid_json = TokenCodec(keys=[("k2", "rotated-secret")]).encode(data)
+    original = index._token_codec
+    index._token_codec = rotated
+    try:
+        record("Legacy JSON token decodes via _decode_cert", index._decode_cert(legacy) == data)
+        record("Key-id JSON token decodes via _decode_cert",
+               kid_json.startswith("k2.") and index._decode_cert(kid_json) == data)
+        binary = index._encode_cert(data)
+        record("Binary token carries the active key id", rotated.kid_of(binary) == "k2")
+        record("Binary token decodes via _decode_cert", index._decode_cert(binary) == data)
+    finally:
+        index._token_codec = original
+
+
+def test_token_format_switch():
+    import os
+    import subprocess
+    from api.index import _decode_cert
+
+    data = {"n": "Switch User", "c": "AI Code Reviewer Course", "d": "2026-04-15", "i": "Certificate Team"}
+    tokens = {}
+    for fmt in ("json", "binary"):
+        proc = subprocess.run(
+            [sys.executable, "-c",
+             f"from api.index import _encode_cert; print(_encode_cert({data!r}))"],
+            cwd=str(Path(__file__).resolve().parent),
+            env={**os.environ, "CERT_TOKEN_FORMAT": fmt},
+            capture_output=True, text=True, timeout=60,
+        )
+        tokens[fmt] = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else ""
+    record("CERT_TOKEN_FORMAT=json issues dotted JSON tokens", "." in tokens["json"])
+    record("CERT_TOKEN_FORMAT=binary issues binary tokens", bool(tokens["binary"]) and "." not in tokens["binary"])
+    record("Both token formats verify", all(_decode_cert(t) == data for t in tokens.values()))
+
+
+# ── Canvas engine text layout ─────────────────────────────────────────
+
+def _rendered_text_widths(pdf: bytes) -> list[tuple[str, float]]:
+    """(text, advance width) of every Tj, honouring Tc, q/Q nesting and form XObjects."""
+    from pypdf import PdfReader
+    from pypdf.generic import ContentStream
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    out: list[tuple[str, float]] = []
+
+    def walk(stream, resources, state):
+        fonts = {name: str(ref.get_object()["/BaseFont"]).lstrip("/")
+                 for name, ref in resources.get("/Font", {}).items()}
+        xobjects = resources.get("/XObject", {})
+        stack = []
+        for operands, op in ContentStream(stream, reader).operations:
+            if op == b"q":
+                stack.append(dict(state))
+            elif op == b"Q" and stack:
+                state = stack.pop()
+            elif op == b"Tc":
+                state["tc"] = float(operands[0])
+            elif op == b"Tf":
+                state["font"], state["size"] = fonts.get(operands[0], "Helvetica"), float(operands[1])
+            elif op == b"Tj" and "+" not in state["font"]:  # skip embedded TTF subsets
+                text = str(operands[0])
+                width = stringWidth(text, state["font"], state["size"]) + state["tc"] * len(text)
+                out.append((text, round(width, 2)))
+            elif op == b"Do":
+                xobj = xobjects[operands[0]].get_object()
+                if xobj.get("/Subtype") == "/Form":
+                    walk(xobj, xobj.get("/Resources", resources), dict(state))
+
+    reader = PdfReader(io.BytesIO(pdf))
+    page = reader.pages[0]
+    walk(page.get_contents(), page["/Resources"], {"tc": 0.0, "font": "Helvetica", "size": 10.0})
+    return out
+
+
+def test_canvas_text_widths():
+    from api.cert_canvas import BOLD, REGULAR, _text_width
+    from api.index import _build_cert_pdf
+
+    participation = {"n": "Ada Lovelace", "c": "AI Product Development Fundamentals",
+                     "d": "2026-04-15", "i": "Certificate Team"}
+    internship = {"k": "i", "n": "Intern Sample", "c": "VTU Industry Internship", "d": "2026-06-10",
+                  "i": "Program Lead", "u": "1RV22CS099", "w": "Jan 2026 - Jun 2026",
+                  "h": "120 hours", "m": "Industry Mentor", "s": "Sample Engineering College"}
+    cases = (
+        (participation, "Verified & Authentic", BOLD, 8),
+        (participation, "Scan to Verify", BOLD, 9),
+        (internship, "Verify this certificate", BOLD, 8),
+        (internship, "Program Lead", BOLD, 7.5),
+    )
+    for data, text, font, size in cases:
+        pdf = _build_cert_pdf(data, verify_url=VERIFY_URL, engine="canvas")
+        widths = [w for t, w in _rendered_text_widths(pdf) if t == text]
+        expected = round(_text_width(text, font, size), 2)
+        record(f"Canvas '{text}' renders at its measured width", expected in widths)
+    pdf = _build_cert_pdf(internship, verify_url=VERIFY_URL, engine="canvas")
+    widths = dict(_rendered_text_widths(pdf))
+    record("Canvas 'Forge' keeps its 1pt letter spacing",
+           widths.get("Forge") == round(_text_width("Forge", BOLD, 22, 1), 2))
+    footer = "Intelliforge Digital Services · Forge credentialing · learning.intelliforge.tech"
+    record("Canvas footer draws without letter spacing",
+           widths.get(footer) == round(_text_width(footer, REGULAR, 6.5), 2))
+
+
+# ── Runner ────────────────────────────────────────────────────────────
+
+def run_all():
+    print("=" * 60)
+    print("  PDF Cert Generator — Unit Tests")
+    print("=" * 60)
+
+    print("\n[Token Formats]")
+    test_binary_tokens()
+    test_legacy_tokens()
+    test_token_format_switch()
+
+    print("\n[Canvas Engine]")
+    test_canvas_text_widths()
+
+    total = len(RESULTS)
+    passed = sum(1 for _, ok in RESULTS if ok)
+    print("\n" + "=" * 60)
+    print(f"  Results: {passed}/{total} passed")
+    print("=" * 60)
+    if passed == total:
+        print("\n\u2705 All tests passed!")
+    else:
+        failed = [(n, ok) for n, ok in RESULTS if not ok]
+        print(f"\n\u274c {len(failed)} test(s) failed:")
+        for name, _ in failed:
+            print(f"   - {name}")
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all() else 1)